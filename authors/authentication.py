@@ -0,0 +1,135 @@
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+CLAIMS = ('username', 'is_staff', 'is_superuser')
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Signs the user fields ``ClaimsUser`` exposes into the tokens."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+
+        for claim in CLAIMS:
+            token[claim] = getattr(user, claim)
+
+        return token
+
+
+class ClaimsUser(TokenUser):
+    """
+    User built from token claims, compared with users by id. Reading an
+    attribute the token does not carry loads the real user once.
+    """
+
+    @cached_property
+    def user(self):
+        return get_user_model().objects.get(
+            **{api_settings.USER_ID_FIELD: self.id}
+        )
+
+    def __getattr__(self, attr):
+        if attr.startswith('_') or attr in ('token', 'user'):
+            raise AttributeError(attr)
+
+        if attr in self.token:
+            return self.token[attr]
+
+        return getattr(self.user, attr)
+
+    def __eq__(self, other):
+        return str(self.pk) == str(getattr(other, 'pk', None))
+
+    def __hash__(self):
+        return hash(str(self.pk))
+
+
+class ActiveUserCache:
+    """
+    Per process memory of which users are still active, so claim users
+    need at most one query per user every ``timeout`` seconds.
+    """
+    max_entries = 10000
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def is_active(self, user_id):
+        now = time.monotonic()
+        entry = self._entries.get(user_id)
+
+        if entry is not None and entry[1] > now:
+            return entry[0]
+
+        is_active = get_user_model().objects\
+            .filter(**{api_settings.USER_ID_FIELD: user_id})\
+            .values_list('is_active', flat=True)\
+            .first()
+        is_active = bool(is_active)
+
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+
+            self._entries[user_id] = (
+                is_active, now + settings.JWT_CLAIMS_USER_CACHE_TIMEOUT
+            )
+
+        return is_active
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+active_users = ActiveUserCache()
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Safe requests get a ``ClaimsUser`` read from the token; writes and
+    tokens issued without the claims load the user from the database.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+
+        if request.method in SAFE_METHODS and all(
+            claim in validated_token for claim in CLAIMS
+        ):
+            return self.get_claims_user(validated_token), validated_token
+
+        return self.get_user(validated_token), validated_token
+
+    def get_claims_user(self, validated_token):
+        user = ClaimsUser(validated_token)
+
+        if not active_users.is_active(user.id):
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+
+        return user
@@ -0,0 +1,71 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import test
+
+from authors.authentication import ClaimsUser, active_users
+
+
+class ClaimsJWTAuthenticationTest(test.APITestCase):
+    def setUp(self):
+        active_users.clear()
+        self.user = User.objects.create_user(
+            username='johndoe',
+            password='P@ssword1',
+            first_name='John',
+        )
+        response = self.client.post(
+            reverse('recipes:token_obtain_pair'),
+            data={'username': 'johndoe', 'password': 'P@ssword1'},
+        )
+        self.auth = {
+            'HTTP_AUTHORIZATION': f'Bearer {response.data["access"]}'
+        }
+        return super().setUp()
+
+    def get_user_queries(self, queries):
+        return [
+            query['sql'] for query in queries.captured_queries
+            if 'FROM "auth_user"' in query['sql']
+        ]
+
+    def test_safe_requests_read_the_user_from_the_token(self):
+        url = reverse('recipes:recipe-api-list')
+        self.client.get(url, **self.auth)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, **self.auth)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.wsgi_request.user, ClaimsUser)
+        self.assertEqual(self.get_user_queries(queries), [])
+
+    def test_writes_load_the_user_from_the_database(self):
+        response = self.client.post(
+            reverse('recipes:recipe-api-list'), data={}, **self.auth
+        )
+
+        self.assertIsInstance(response.wsgi_request.user, User)
+
+    def test_inactive_user_is_rejected_once_the_cache_expires(self):
+        url = reverse('recipes:recipe-api-list')
+        self.client.get(url, **self.auth)
+
+        self.user.is_active = False
+        self.user.save()
+        active_users.clear()
+
+        response = self.client.get(url, **self.auth)
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_claims_user_loads_missing_fields_and_matches_its_model(self):
+        response = self.client.get(
+            reverse('recipes:recipe-api-list'), **self.auth
+        )
+        user = response.wsgi_request.user
+
+        self.assertEqual(user.username, 'johndoe')
+        self.assertEqual(user.first_name, 'John')
+        self.assertEqual(user, self.user)
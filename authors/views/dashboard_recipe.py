@@ -1,5 +1,6 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ValidationError
 from django.http.response import Http404
 from django.shortcuts import redirect, render
 from django.urls import reverse
@@ -65,7 +66,12 @@ class DashboardRecipe(View):
             recipe.preparation_steps_is_html = False
             recipe.is_published = False
 
-            recipe.save()
+            try:
+                recipe.save()
+            except ValidationError as error:
+                # Another recipe took the title since the form was cleaned
+                form.add_error(None, error)
+                return self.render_recipe(form)
 
             messages.success(request, 'Your recipe was saved successfully!')
             return redirect(
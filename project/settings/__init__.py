@@ -4,12 +4,16 @@ from .installed_apps import * # isort:skip
 from .middlewares import * # isort:skip
 
 from .assets import *
+from .caches import *
+from .covers import *
 from .databases import *
 from .i18n import *
 from .messages import *
 from .middlewares import *
+from .search import *
 from .security import *
 from .templates import *
+from .throttling import *
 
 from .debug_toolbar import * # isort:skip
 from .rest_framework import * # isort:skip
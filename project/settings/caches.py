@@ -0,0 +1,27 @@
+import os
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    }
+}
+
+# Paginator counts are cached until a recipe, category or tag changes
+COUNT_CACHE_TIMEOUT = int(os.environ.get('COUNT_CACHE_TIMEOUT', 300))
+
+# Above this planner estimate, paginators show an approximate total instead
+# of running an exact COUNT(*) (PostgreSQL only)
+COUNT_ESTIMATE_THRESHOLD = int(
+    os.environ.get('COUNT_ESTIMATE_THRESHOLD', 10000)
+)
+
+# Seconds a rendered public page may stay in the cache. Pages are expired
+# as soon as the recipes they show change; this only bounds memory use.
+PAGE_CACHE_TIMEOUT = int(os.environ.get('PAGE_CACHE_TIMEOUT', 86400))
@@ -0,0 +1,24 @@
+import os
+
+from utils.environment import get_env_variable, parse_comma_sep_str_to_list
+
+# Threads resizing uploaded covers in the background. With 0, jobs wait in
+# the table for the process_cover_jobs command.
+COVER_WORKERS = int(os.environ.get('COVER_WORKERS', 2))
+
+# A failing cover job is retried until it reaches this many attempts
+COVER_JOB_MAX_ATTEMPTS = int(os.environ.get('COVER_JOB_MAX_ATTEMPTS', 3))
+# Seconds before the worker pool retries a failed job, doubled per attempt
+COVER_JOB_RETRY_DELAY = int(os.environ.get('COVER_JOB_RETRY_DELAY', 30))
+# Seconds after which a running job is considered abandoned by its worker
+COVER_JOB_STALE_TIMEOUT = int(
+    os.environ.get('COVER_JOB_STALE_TIMEOUT', 600)
+)
+
+# Widths (px) of the generated cover variants, on top of the cover's own
+# width. Comma separated values.
+COVER_VARIANT_WIDTHS = [
+    int(width) for width in parse_comma_sep_str_to_list(
+        get_env_variable('COVER_VARIANT_WIDTHS', '320,480,640')
+    )
+]
@@ -1,5 +1,7 @@
 import os
 
+from utils.environment import get_env_variable, parse_comma_sep_str_to_list
+
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
@@ -11,5 +13,82 @@ DATABASES = {
         'PASSWORD': os.environ.get('DATABASE_PASSWORD'),
         'HOST': os.environ.get('DATABASE_HOST'),
         'PORT': os.environ.get('DATABASE_PORT'),
+        # Seconds a connection is reused by the following requests of the
+        # same worker (0 closes it after each request)
+        'CONN_MAX_AGE': int(os.environ.get('DATABASE_CONN_MAX_AGE', 0)),
+        'CONN_HEALTH_CHECKS': (
+            os.environ.get('DATABASE_CONN_HEALTH_CHECKS') == '1'
+        ),
+        'OPTIONS': {},
     }
 }
+
+if 'postgresql' in (DATABASES['default']['ENGINE'] or ''):
+    # psycopg 3 connection pool (pip install "psycopg[pool]"), shared by
+    # the threads of a worker. It replaces persistent connections.
+    if os.environ.get('DATABASE_POOL') == '1':
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get('DATABASE_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.environ.get('DATABASE_POOL_MAX_SIZE', 10)),
+            'timeout': int(os.environ.get('DATABASE_POOL_TIMEOUT', 10)),
+        }
+
+    # Server side parameter binding lets psycopg prepare the queries a
+    # connection ran DATABASE_PREPARE_THRESHOLD times, such as the recipe
+    # listings. Not usable behind PgBouncer in transaction mode.
+    if os.environ.get('DATABASE_SERVER_SIDE_BINDING') == '1':
+        DATABASES['default']['OPTIONS'].update({
+            'server_side_binding': True,
+            'prepare_threshold': int(
+                os.environ.get('DATABASE_PREPARE_THRESHOLD', 5)
+            ),
+        })
+
+# Read replicas, one per comma separated host (or name, for SQLite). Missing
+# values are taken from the primary. Tests run them as mirrors of default.
+DATABASE_REPLICA_HOSTS = parse_comma_sep_str_to_list(
+    get_env_variable('DATABASE_REPLICA_HOSTS')
+)
+DATABASE_REPLICA_NAMES = parse_comma_sep_str_to_list(
+    get_env_variable('DATABASE_REPLICA_NAMES')
+)
+
+
+def _make_replica(index):
+    primary = DATABASES['default']
+    hosts = DATABASE_REPLICA_HOSTS[index:index + 1]
+    names = DATABASE_REPLICA_NAMES[index:index + 1]
+
+    return {
+        **primary,
+        'HOST': hosts[0] if hosts else primary['HOST'],
+        'NAME': names[0] if names else primary['NAME'],
+        'USER': os.environ.get('DATABASE_REPLICA_USER', primary['USER']),
+        'PASSWORD': os.environ.get(
+            'DATABASE_REPLICA_PASSWORD', primary['PASSWORD']
+        ),
+        'OPTIONS': {**primary['OPTIONS']},
+        'TEST': {'MIRROR': 'default'},
+    }
+
+
+DATABASE_REPLICAS = [
+    f'replica_{index + 1}' for index in range(
+        max(len(DATABASE_REPLICA_HOSTS), len(DATABASE_REPLICA_NAMES))
+    )
+]
+DATABASES.update(
+    (alias, _make_replica(index))
+    for index, alias in enumerate(DATABASE_REPLICAS)
+)
+
+DATABASE_ROUTERS = ['utils.db_routing.ReplicaRouter']
+
+# Seconds a client keeps reading from the primary after one of its requests
+# wrote, so it sees its own changes despite the replication lag. Page and
+# count cache misses also read from the primary that long after a change
+DATABASE_REPLICA_STICKY_SECONDS = int(
+    os.environ.get('DATABASE_REPLICA_STICKY_SECONDS', 10)
+)
+DATABASE_REPLICA_STICKY_COOKIE = 'use_primary'
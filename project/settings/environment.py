@@ -24,6 +24,9 @@ ROOT_URLCONF = 'project.urls'
 
 WSGI_APPLICATION = 'project.wsgi.application'
 
+# Serve the recipe pages and the v1 API with async views (under ASGI)
+ASYNC_VIEWS = True if os.environ.get('ASYNC_VIEWS') == '1' else False
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -1,5 +1,6 @@
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'utils.db_routing.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
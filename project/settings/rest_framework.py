@@ -5,7 +5,12 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination', # noqa
     'PAGE_SIZE': 10,
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'authors.authentication.ClaimsJWTAuthentication',
+    ),
+    'DEFAULT_THROTTLE_CLASSES': (
+        'utils.throttling.AnonBucketThrottle',
+        'utils.throttling.UserBucketThrottle',
+        'utils.throttling.ScopedBucketThrottle',
     ),
 }
 
@@ -16,5 +21,19 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": False,
     "SIGNING_KEY": os.environ.get('JWT_SECRET_KEY', 'INSECURE'),
 
-    "AUTH_HEADER_TYPES": ("Bearer",)
+    "AUTH_HEADER_TYPES": ("Bearer",),
+    "TOKEN_OBTAIN_SERIALIZER":
+        "authors.authentication.ClaimsTokenObtainPairSerializer",
 }
+
+# Seconds a worker trusts that a token's user is still active before
+# checking the database again (safe API requests use the token claims)
+JWT_CLAIMS_USER_CACHE_TIMEOUT = int(
+    os.environ.get('JWT_CLAIMS_USER_CACHE_TIMEOUT', 60)
+)
+
+# Seconds the recipe changes feed lags behind, so rows written by
+# transactions that commit late are still picked up by the next sync
+RECIPE_CHANGES_SETTLE_SECONDS = int(
+    os.environ.get('RECIPE_CHANGES_SETTLE_SECONDS', 5)
+)
@@ -0,0 +1,5 @@
+import os
+
+# PostgreSQL text search configuration used to build and query the recipe
+# search documents (ignored by the SQLite FTS5 backend)
+SEARCH_CONFIG = os.environ.get('SEARCH_CONFIG', 'simple')
@@ -0,0 +1,22 @@
+import os
+
+# Token bucket rates ('<requests>/<period>') shared by the API throttles and
+# the throttled site views, per client. An empty value disables a scope.
+THROTTLE_RATES = {
+    'anon': os.environ.get('THROTTLE_RATE_ANON', '300/min') or None,
+    'user': os.environ.get('THROTTLE_RATE_USER', '600/min') or None,
+    'search': os.environ.get('THROTTLE_RATE_SEARCH', '60/min') or None,
+    'token': os.environ.get('THROTTLE_RATE_TOKEN', '20/min') or None,
+}
+
+# Requests of a scope allowed in flight across all workers before the rest
+# are answered with a 503 (0 disables the limit)
+LOAD_SHED_LIMITS = {
+    'search': int(os.environ.get('LOAD_SHED_LIMIT_SEARCH', 16)),
+    'token': int(os.environ.get('LOAD_SHED_LIMIT_TOKEN', 8)),
+}
+
+# Seconds after which an in-flight counter is dropped; keep it above the
+# slowest request so crashed workers cannot hold their slots forever
+LOAD_SHED_TIMEOUT = int(os.environ.get('LOAD_SHED_TIMEOUT', 60))
+LOAD_SHED_RETRY_AFTER = int(os.environ.get('LOAD_SHED_RETRY_AFTER', 5))
@@ -13,7 +13,7 @@ class RecipeAdmin(admin.ModelAdmin):
     list_display = ['id', 'title', 'author', 'created_at', 'is_published']
     list_display_links = 'title', 'created_at',
     search_fields = 'id', 'title', 'description', 'slug', 'preparation_step',
-    list_filter = 'category', 'author', 'is_published', \
+    list_filter = 'category', 'author', 'is_published', 'cover_status', \
         'preparation_step_is_html',
     list_per_page = 10
     list_editable = 'is_published',
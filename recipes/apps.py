@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.core import checks
 
 
 class RecipesConfig(AppConfig):
@@ -7,5 +8,8 @@ class RecipesConfig(AppConfig):
 
     def ready(self, *args, **kwargs):
         import recipes.signals  # noqa
+        from utils.throttling import check_shared_cache
+
+        checks.register(check_shared_cache)
         super_ready = super().ready(*args, **kwargs)
         return super_ready
@@ -0,0 +1,175 @@
+from django.db import transaction
+from django.utils import timezone
+
+from recipes.models import (TITLE_TAKEN_MESSAGE, Recipe, allocate_slugs,
+                            get_author_fields)
+from recipes.page_cache import invalidate_recipe_pages
+from recipes.search import get_search_backend
+from recipes.serializers import RecipeBulkSerializer, get_tag_link_pks
+from tag.models import Tag
+from utils.counting import invalidate_counts
+
+
+def get_item_tag_links(items):
+    for item in items:
+        tag_links = item.get('tag_links') if isinstance(item, dict) else None
+
+        if isinstance(tag_links, list):
+            yield from tag_links
+
+
+def validate_recipe_batch(items, user, context):
+    """
+    Validates every item and returns ``(serializers, errors)``; errors
+    holds one dict per item, empty for valid ones.
+    """
+    tags_by_pk = Tag.objects.in_bulk(
+        get_tag_link_pks(get_item_tag_links(items))
+    )
+    context = {**context, 'tags_by_pk': tags_by_pk}
+    ids = [
+        item['id'] for item in items
+        if isinstance(item, dict) and isinstance(item.get('id'), int)
+    ]
+    owned = Recipe.objects.filter(pk__in=ids, author=user).in_bulk()
+    serializers = []
+    errors = []
+
+    for item in items:
+        serializer = None
+        item_errors = {}
+
+        if not isinstance(item, dict):
+            item_errors = {'non_field_errors': ['Expected an object.']}
+        elif 'id' in item and owned.get(item['id']) is None:
+            item_errors = {'id': ['Recipe not found.']}
+        else:
+            instance = owned.get(item.get('id'))
+            serializer = RecipeBulkSerializer(
+                instance=instance,
+                data=item,
+                partial=instance is not None,
+                context=context,
+            )
+
+            if not serializer.is_valid():
+                item_errors = serializer.errors
+
+        serializers.append(serializer)
+        errors.append(item_errors)
+
+    check_titles(serializers, errors)
+    return serializers, errors
+
+
+def check_titles(serializers, errors):
+    """
+    Flags titles repeated in the batch or taken, with two queries. Titles
+    are lowered by the database, like its unique index compares them.
+    """
+    candidates = {
+        index: serializer.validated_data['title']
+        for index, serializer in enumerate(serializers)
+        if not errors[index] and 'title' in serializer.validated_data
+    }
+    lowered = Recipe.objects.lower_titles(list(candidates.values()))
+    titles = {}
+
+    for index, title in zip(candidates, lowered):
+        if title in titles.values():
+            errors[index] = {'title': ['Repeated title in this batch.']}
+        else:
+            titles[index] = title
+
+    conflicts = Recipe.objects.get_title_conflicts(
+        [candidates[index] for index in titles]
+    )
+
+    for index, title in titles.items():
+        instance = serializers[index].instance
+        pk = None if instance is None else instance.pk
+
+        if any(
+            conflict_title == title and conflict_pk != pk
+            for conflict_pk, conflict_title in conflicts
+        ):
+            errors[index] = {'title': [TITLE_TAKEN_MESSAGE]}
+
+
+def write_recipe_batch(serializers, user):
+    """
+    Creates and updates the validated recipes with one bulk query per
+    kind of write, then indexes and expires them like the save signals.
+    Returns the recipe ids in item order.
+    """
+    now = timezone.now()
+    recipes = []
+    new_recipes = []
+    updated_recipes = []
+    update_fields = {'updated_at'}
+    tags_by_recipe = []
+    old_category_ids = set()
+    author_fields = None
+    slugs = iter(allocate_slugs([
+        serializer.validated_data['title'] for serializer in serializers
+        if serializer.instance is None
+    ]))
+
+    for serializer in serializers:
+        data = dict(serializer.validated_data)
+        data.pop('id', None)
+        tags = data.pop('tags', None)
+        recipe = serializer.instance
+
+        if recipe is None:
+            if author_fields is None:
+                author_fields = get_author_fields(user)
+
+            recipe = Recipe(
+                **data,
+                **author_fields,
+                author=user,
+                slug=next(slugs),
+            )
+            new_recipes.append(recipe)
+        else:
+            old_category_ids.add(recipe.category_id)
+
+            for field_name, value in data.items():
+                setattr(recipe, field_name, value)
+
+            recipe.updated_at = now
+            update_fields.update(data)
+            updated_recipes.append(recipe)
+
+        if tags is not None:
+            tags_by_recipe.append((recipe, tags))
+
+        recipes.append(recipe)
+
+    through = Recipe.tags.through
+    retagged_ids = [
+        recipe.pk for recipe, _ in tags_by_recipe if recipe.pk is not None
+    ]
+
+    with transaction.atomic():
+        Recipe.objects.bulk_create(new_recipes)
+
+        if updated_recipes:
+            Recipe.objects.bulk_update(updated_recipes, sorted(update_fields))
+
+        if retagged_ids:
+            through.objects.filter(recipe_id__in=retagged_ids).delete()
+
+        through.objects.bulk_create([
+            through(recipe_id=recipe.pk, tag_id=tag.pk)
+            for recipe, tags in tags_by_recipe
+            for tag in tags
+        ])
+
+        recipe_ids = [recipe.pk for recipe in recipes]
+        get_search_backend().index(recipe_ids)
+        invalidate_counts()
+        invalidate_recipe_pages(recipe_ids, category_ids=old_category_ids)
+
+    return recipe_ids
@@ -0,0 +1,95 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timedelta, timezone
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Q
+
+from recipes.models import Recipe, RecipeTombstone
+from utils.strings import MAX_ID
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def encode_change_token(changed_at, pk):
+    micros = (changed_at - EPOCH) // MICROSECOND
+    token = f'{micros}:{pk}'.encode('ascii')
+    return urlsafe_b64encode(token).decode('ascii').rstrip('=')
+
+
+def decode_change_token(token):
+    """``(changed_at, pk)`` of ``token``, None when it is invalid."""
+    try:
+        padding = '=' * (-len(token) % 4)
+        decoded = urlsafe_b64decode(token + padding).decode('ascii')
+        micros, pk = (int(part) for part in decoded.split(':'))
+        changed_at = EPOCH + micros * MICROSECOND
+    except (TypeError, ValueError, UnicodeDecodeError, OverflowError):
+        return None
+
+    # pk 0 marks a position before any recipe of that instant
+    if not 0 <= pk <= MAX_ID:
+        return None
+
+    return changed_at, pk
+
+
+def write_tombstone(recipe_id, reason, changed_at, using=DEFAULT_DB_ALIAS):
+    RecipeTombstone.objects.using(using).update_or_create(
+        recipe_id=recipe_id,
+        defaults={'reason': reason, 'changed_at': changed_at},
+    )
+
+
+def clear_tombstone(recipe_id, using=DEFAULT_DB_ALIAS):
+    RecipeTombstone.objects.using(using).filter(recipe_id=recipe_id).delete()
+
+
+def after_position(queryset, time_field, id_field, position):
+    changed_at, pk = position
+    return queryset.filter(
+        Q(**{f'{time_field}__gt': changed_at}) |
+        Q(**{time_field: changed_at, f'{id_field}__gt': pk})
+    )
+
+
+def get_changes(queryset, since=None, until=None, limit=100):
+    """
+    Published recipes of ``queryset`` and tombstones changed after the
+    ``since`` position, merged in ``(changed_at, id)`` order.
+
+    Returns ``(changes, has_more)``; each change is ``(changed_at, id,
+    recipe_or_tombstone)``. Without ``since`` only recipes are listed.
+    Each side reads at most ``limit + 1`` rows from its index.
+    """
+    recipes = queryset.filter(is_published=True).order_by('updated_at', 'id')
+    tombstones = RecipeTombstone.objects.using(queryset.db)\
+        .order_by('changed_at', 'recipe_id')
+
+    if until is not None:
+        recipes = recipes.filter(updated_at__lte=until)
+        tombstones = tombstones.filter(changed_at__lte=until)
+
+    changes = []
+
+    if since is not None:
+        recipes = after_position(recipes, 'updated_at', 'id', since)
+        tombstones = after_position(
+            tombstones, 'changed_at', 'recipe_id', since
+        )
+        changes.extend(
+            (tombstone.changed_at, tombstone.recipe_id, tombstone)
+            for tombstone in tombstones[:limit + 1]
+        )
+
+    changes.extend(
+        (recipe.updated_at, recipe.pk, recipe)
+        for recipe in recipes[:limit + 1]
+    )
+    changes.sort(key=lambda change: change[:2])
+
+    return changes[:limit], len(changes) > limit
+
+
+def is_recipe(change):
+    return isinstance(change[2], Recipe)
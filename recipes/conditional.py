@@ -0,0 +1,123 @@
+from hashlib import md5
+
+from django.db.models import Max
+from django.utils import translation
+from django.views.decorators.http import condition
+
+from recipes.models import Recipe, RecipeTombstone
+
+
+def make_etag(*parts):
+    value = ':'.join(str(part) for part in parts)
+    return md5(value.encode('utf-8'), usedforsecurity=False).hexdigest()
+
+
+def get_updated_at_queryset(pk):
+    return Recipe.objects.filter(
+        pk=pk,
+        is_published=True,
+    ).values_list('updated_at', flat=True)
+
+
+def get_recipe_updated_at(request, pk):
+    # ETag and Last-Modified are computed separately, share one query
+    updated_at_by_pk = request.__dict__.setdefault('_recipe_updated_at', {})
+
+    if pk not in updated_at_by_pk:
+        updated_at_by_pk[pk] = get_updated_at_queryset(pk).first()
+
+    return updated_at_by_pk[pk]
+
+
+async def aload_recipe_condition(request, pk):
+    """
+    Loads what ``recipe_condition`` reads with the async ORM, so it can
+    wrap async views without querying.
+    """
+    request.user = await request.auser()
+    updated_at_by_pk = request.__dict__.setdefault('_recipe_updated_at', {})
+    pk = str(pk)
+
+    if pk not in updated_at_by_pk:
+        updated_at_by_pk[pk] = await get_updated_at_queryset(pk).afirst()
+
+
+def recipe_last_modified(request, pk, *args, **kwargs):
+    return get_recipe_updated_at(request, str(pk))
+
+
+def recipe_etag(request, pk, *args, **kwargs):
+    updated_at = get_recipe_updated_at(request, str(pk))
+
+    if updated_at is None:
+        return None
+
+    # The same recipe renders differently per language, menu state and
+    # API field selection
+    return make_etag(
+        updated_at.isoformat(),
+        translation.get_language(),
+        request.user.pk,
+        request.META.get('QUERY_STRING', ''),
+    )
+
+
+recipe_condition = condition(
+    etag_func=recipe_etag,
+    last_modified_func=recipe_last_modified,
+)
+
+
+def get_change_querysets(queryset):
+    # Saving any recipe may move it in or out of a list and deleting one
+    # only leaves a tombstone, so every list is dated by the newest of both
+    return (
+        Recipe.objects.using(queryset.db).order_by(),
+        RecipeTombstone.objects.using(queryset.db).order_by(),
+    )
+
+
+def make_list_validators(request, *changed_at):
+    last_modified = max(filter(None, changed_at), default=None)
+    etag = make_etag(
+        request.get_full_path(),
+        last_modified.isoformat() if last_modified else '',
+    )
+    return etag, last_modified
+
+
+def get_list_validators(request, queryset):
+    recipes, tombstones = get_change_querysets(queryset)
+    return make_list_validators(
+        request,
+        recipes.aggregate(changed_at=Max('updated_at'))['changed_at'],
+        tombstones.aggregate(changed_at=Max('changed_at'))['changed_at'],
+    )
+
+
+async def aget_list_validators(request, queryset):
+    recipes, tombstones = get_change_querysets(queryset)
+    recipes = await recipes.aaggregate(changed_at=Max('updated_at'))
+    tombstones = await tombstones.aaggregate(changed_at=Max('changed_at'))
+    return make_list_validators(
+        request, recipes['changed_at'], tombstones['changed_at']
+    )
+
+
+def make_list_condition(etag, last_modified):
+    return condition(
+        etag_func=lambda *args, **kwargs: etag,
+        last_modified_func=lambda *args, **kwargs: last_modified,
+    )
+
+
+def list_condition(request, queryset):
+    """
+    Decorates a list view with the ETag and Last-Modified of ``queryset``:
+    the newest recipe ``updated_at`` or tombstone, whichever is later.
+    """
+    return make_list_condition(*get_list_validators(request, queryset))
+
+
+async def alist_condition(request, queryset):
+    return make_list_condition(*await aget_list_validators(request, queryset))
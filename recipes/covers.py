@@ -0,0 +1,273 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from threading import Timer
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+from PIL import Image, features
+
+from recipes.models import CoverJob, Recipe
+from recipes.page_cache import invalidate_recipe_pages
+
+logger = logging.getLogger(__name__)
+
+# extension: (content type, Pillow format, quality)
+VARIANT_FORMATS = {
+    'avif': ('image/avif', 'AVIF', 50),
+    'webp': ('image/webp', 'WEBP', 70),
+    'jpg': ('image/jpeg', 'JPEG', 70),
+}
+
+_executor = None
+
+
+def get_cover_executor():
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.COVER_WORKERS,
+            thread_name_prefix='covers',
+        )
+
+    return _executor
+
+
+def get_variant_formats():
+    # Browsers pick the first <source> they support; the img keeps the
+    # resized original as the last resort
+    if features.check('avif'):
+        return ['avif', 'webp']
+
+    return ['webp', 'jpg']
+
+
+def get_variant_widths(original_width):
+    widths = [
+        width for width in settings.COVER_VARIANT_WIDTHS
+        if width < original_width
+    ]
+    return widths + [original_width]
+
+
+def make_variant_name(cover_name, width, extension):
+    root, _ = os.path.splitext(cover_name)
+    return f'{root}.{width}w.{extension}'
+
+
+def make_cover_variants(cover):
+    """
+    Writes every width and format of ``cover`` next to it and returns the
+    description stored in ``Recipe.cover_variants``.
+    """
+    storage = cover.storage
+
+    with Image.open(storage.path(cover.name)) as image:
+        image.load()
+
+    width, height = image.size
+    sources = []
+
+    for extension in get_variant_formats():
+        content_type, image_format, quality = VARIANT_FORMATS[extension]
+        files = []
+
+        for variant_width in get_variant_widths(width):
+            variant_height = round(variant_width * height / width)
+            variant = image.resize(
+                (variant_width, variant_height), Image.LANCZOS
+            )
+
+            if image_format == 'JPEG' and variant.mode != 'RGB':
+                variant = variant.convert('RGB')
+
+            name = make_variant_name(cover.name, variant_width, extension)
+            path = storage.path(name)
+            tmp_path = f'{path}.tmp'
+            variant.save(
+                tmp_path, format=image_format, quality=quality, optimize=True
+            )
+            os.replace(tmp_path, path)
+            files.append([variant_width, name])
+
+        sources.append({'type': content_type, 'files': files})
+
+    return {'width': width, 'height': height, 'sources': sources}
+
+
+def get_variant_names(variants):
+    return [
+        name
+        for source in variants.get('sources', [])
+        for _, name in source['files']
+    ]
+
+
+def enqueue_cover_job(recipe, using=DEFAULT_DB_ALIAS):
+    """
+    Records a job for the recipe's current cover. It is handed to the
+    worker pool once the transaction commits; ``drain_cover_jobs`` and the
+    ``process_cover_jobs`` command pick up anything left in the table.
+    """
+    job = CoverJob.objects.using(using).create(
+        recipe=recipe,
+        cover=recipe.cover.name,
+    )
+
+    if settings.COVER_WORKERS > 0:
+        transaction.on_commit(
+            lambda: get_cover_executor().submit(run_cover_job, job.pk, using),
+            using=using,
+        )
+
+    return job
+
+
+def run_cover_job(job_id, using=DEFAULT_DB_ALIAS):
+    job = None
+
+    try:
+        job = process_cover_job(job_id, using)
+    except Exception:
+        logger.exception('Cover job %s crashed', job_id)
+    finally:
+        # Worker threads get their own connection, do not leak it
+        connections[using].close()
+
+    if job is not None and job.status == CoverJob.PENDING:
+        schedule_cover_job_retry(job, using)
+
+
+def schedule_cover_job_retry(job, using=DEFAULT_DB_ALIAS):
+    """
+    Hands a failed job back to the worker pool after a delay doubling
+    with each attempt.
+    """
+    delay = settings.COVER_JOB_RETRY_DELAY * 2 ** max(job.attempts - 1, 0)
+    timer = Timer(
+        delay,
+        lambda: get_cover_executor().submit(run_cover_job, job.pk, using),
+    )
+    # Jobs still pending at shutdown wait for process_cover_jobs
+    timer.daemon = True
+    timer.start()
+    return timer
+
+
+def claim_cover_job(job_id, using=DEFAULT_DB_ALIAS):
+    claimed = CoverJob.objects.using(using).filter(
+        pk=job_id,
+        status=CoverJob.PENDING,
+    ).update(status=CoverJob.RUNNING, updated_at=timezone.now())
+
+    if not claimed:
+        return None
+
+    return CoverJob.objects.using(using).get(pk=job_id)
+
+
+def set_cover_status(job, status, using=DEFAULT_DB_ALIAS, **fields):
+    # update() leaves the save signals alone; a newer upload owns the row
+    updated = Recipe.objects.using(using).filter(
+        pk=job.recipe_id,
+        cover=job.cover,
+    ).update(cover_status=status, updated_at=timezone.now(), **fields)
+
+    if updated:
+        invalidate_recipe_pages([job.recipe_id])
+
+
+def process_cover_job(job_id, using=DEFAULT_DB_ALIAS):
+    job = claim_cover_job(job_id, using)
+
+    if job is None:
+        return None
+
+    recipe = Recipe.objects.using(using).filter(pk=job.recipe_id)\
+        .only('cover').first()
+
+    if recipe is None or recipe.cover.name != job.cover:
+        job.status = CoverJob.DONE
+        job.save(update_fields=['status', 'updated_at'])
+        return job
+
+    job.attempts += 1
+
+    try:
+        Recipe.resize_image(recipe.cover)
+        variants = make_cover_variants(recipe.cover)
+    except Exception as e:
+        logger.warning('Cover job %s failed: %s', job.pk, e)
+        job.error = str(e)
+        job.status = (
+            CoverJob.PENDING
+            if job.attempts < settings.COVER_JOB_MAX_ATTEMPTS
+            else CoverJob.FAILED
+        )
+    else:
+        job.error = ''
+        job.status = CoverJob.DONE
+
+    job.save(update_fields=['status', 'attempts', 'error', 'updated_at'])
+
+    if job.status == CoverJob.DONE:
+        set_cover_status(
+            job, Recipe.COVER_READY, using, cover_variants=variants
+        )
+    elif job.status == CoverJob.FAILED:
+        set_cover_status(job, Recipe.COVER_FAILED, using)
+
+    return job
+
+
+def requeue_stale_cover_jobs(using=DEFAULT_DB_ALIAS):
+    """
+    Jobs left running by a worker that died go back to the queue. Jobs
+    claimed in the last ``COVER_JOB_STALE_TIMEOUT`` seconds may still be
+    processed by a live worker and are left alone.
+    """
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=settings.COVER_JOB_STALE_TIMEOUT)
+
+    return CoverJob.objects.using(using).filter(
+        status=CoverJob.RUNNING,
+        updated_at__lt=stale_before,
+    ).update(status=CoverJob.PENDING, updated_at=now)
+
+
+def enqueue_missing_cover_variants(using=DEFAULT_DB_ALIAS):
+    """Queues covers processed before variants were generated."""
+    recipes = Recipe.objects.using(using)\
+        .exclude(cover='')\
+        .filter(cover_status=Recipe.COVER_READY, cover_variants={})\
+        .only('id', 'cover')
+    queued = 0
+
+    for recipe in recipes.iterator():
+        enqueue_cover_job(recipe, using)
+        queued += 1
+
+    return queued
+
+
+def drain_cover_jobs(using=DEFAULT_DB_ALIAS):
+    """Processes every pending job in this thread, retries included."""
+    processed = 0
+
+    while True:
+        job_ids = list(
+            CoverJob.objects.using(using)
+            .filter(status=CoverJob.PENDING)
+            .order_by('id')
+            .values_list('id', flat=True)
+        )
+
+        if not job_ids:
+            return processed
+
+        for job_id in job_ids:
+            if process_cover_job(job_id, using) is not None:
+                processed += 1
@@ -0,0 +1,124 @@
+import csv
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from recipes.models import Recipe
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+EXPORT_FIELDS = [
+    'id', 'title', 'description', 'slug', 'preparation_time',
+    'preparation_time_unit', 'servings', 'servings_unit', 'preparation_step',
+    'preparation_step_is_html', 'created_at', 'updated_at', 'author',
+    'author_name', 'category', 'tags',
+]
+
+
+def get_export_queryset(after_id=None):
+    qs = Recipe.objects.filter(is_published=True).order_by('id').values(
+        'id', 'title', 'description', 'slug', 'preparation_time',
+        'preparation_time_unit', 'servings', 'servings_unit',
+        'preparation_step', 'preparation_step_is_html', 'created_at',
+        'updated_at', 'author__username', 'author_name', 'category__name',
+    )
+
+    if after_id is not None:
+        qs = qs.filter(id__gt=after_id)
+
+    return qs
+
+
+def get_tag_names(recipe_ids):
+    tag_names = {recipe_id: [] for recipe_id in recipe_ids}
+    rows = Recipe.tags.through.objects\
+        .filter(recipe_id__in=recipe_ids)\
+        .order_by('recipe_id', 'tag__name')\
+        .values_list('recipe_id', 'tag__name')
+
+    for recipe_id, name in rows:
+        tag_names[recipe_id].append(name)
+
+    return tag_names
+
+
+def make_export_row(row, tags):
+    row['author'] = row.pop('author__username')
+    row['category'] = row.pop('category__name')
+    row['tags'] = tags
+    return {field: row[field] for field in EXPORT_FIELDS}
+
+
+def iter_export_rows(after_id=None, chunk_size=1000):
+    """
+    Yields every published recipe by ascending id, reading ``chunk_size``
+    rows and their tag names at a time. ``after_id`` resumes an export.
+    """
+    chunk = []
+    rows = get_export_queryset(after_id).iterator(chunk_size=chunk_size)
+
+    def flush():
+        tag_names = get_tag_names([row['id'] for row in chunk])
+        return [make_export_row(row, tag_names[row['id']]) for row in chunk]
+
+    for row in rows:
+        chunk.append(row)
+
+        if len(chunk) >= chunk_size:
+            yield from flush()
+            chunk = []
+
+    if chunk:
+        yield from flush()
+
+
+def iter_ndjson(rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+
+    for row in rows:
+        yield f'{encoder.encode(row)}\n'
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+
+    for row in rows:
+        row['tags'] = '|'.join(row['tags'])
+        yield writer.writerow(row[field] for field in EXPORT_FIELDS)
+
+
+def iter_export(export_format, after_id=None, chunk_size=1000):
+    rows = iter_export_rows(after_id, chunk_size)
+
+    if export_format == 'csv':
+        return iter_csv(rows)
+
+    return iter_ndjson(rows)
+
+
+def iter_gzip(chunks, flush_size=64 * 1024):
+    """Compresses text chunks on the fly into a gzip stream."""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    pending = 0
+
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        pending += len(chunk)
+
+        # Flush now and then so clients keep receiving bytes
+        if pending >= flush_size:
+            data += compressor.flush(zlib.Z_SYNC_FLUSH)
+            pending = 0
+
+        if data:
+            yield data
+
+    yield compressor.flush()
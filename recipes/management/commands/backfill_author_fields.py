@@ -0,0 +1,47 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from recipes.models import Recipe, get_author_fields
+from recipes.signals import touch_recipes
+
+
+def get_stale_recipes(recipes, fields):
+    return recipes.exclude(
+        author_name=fields['author_name'],
+        author_profile_id=fields['author_profile_id'],
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        'Copies the display name and profile of each author again on the '
+        'recipes where they differ. Migration 0009 fills them and signals '
+        'keep them in sync, this repairs rows changed behind their back'
+    )
+
+    def handle(self, *args, **options):
+        authors = User.objects.filter(recipe__isnull=False).distinct()
+        total = 0
+
+        with transaction.atomic():
+            for author in authors.iterator():
+                fields = get_author_fields(author)
+                total += touch_recipes(
+                    get_stale_recipes(
+                        Recipe.objects.filter(author=author), fields
+                    ),
+                    **fields,
+                )
+
+            fields = get_author_fields(None)
+            total += touch_recipes(
+                get_stale_recipes(
+                    Recipe.objects.filter(author__isnull=True), fields
+                ),
+                **fields,
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f'{total} recipes updated')
+        )
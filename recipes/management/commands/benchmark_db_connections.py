@@ -0,0 +1,91 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import request_finished, request_started
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+
+from recipes.models import Recipe
+from recipes.views.site import PER_PAGE
+from utils.benchmarks import format_latencies
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs the home page listing query in concurrent simulated requests '
+        'and reports the connections opened and the latencies, connection '
+        'setup included. Compare runs with DATABASE_CONN_MAX_AGE, '
+        'DATABASE_POOL and DATABASE_SERVER_SIDE_BINDING against PostgreSQL'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--requests', type=int, default=2000)
+
+    def simulate_request(self, using):
+        # Request signals close or recycle connections as in the handlers
+        started = time.perf_counter()
+        request_started.send(sender=self.__class__)
+
+        try:
+            recipes = Recipe.objects.get_published().using(using)
+            list(recipes[:int(PER_PAGE)])
+        finally:
+            request_finished.send(sender=self.__class__)
+
+        return time.perf_counter() - started
+
+    def handle(self, *args, **options):
+        using = options['database']
+        concurrency = options['concurrency']
+        per_worker = options['requests'] // max(concurrency, 1)
+
+        if per_worker < 1:
+            raise CommandError('--requests must be >= --concurrency >= 1')
+
+        def worker():
+            try:
+                return [
+                    self.simulate_request(using) for _ in range(per_worker)
+                ]
+            finally:
+                connections.close_all()
+
+        opened = set()
+        created = count()
+
+        def connection_opened(sender, connection, **kwargs):
+            # Pooled connections are "created" on each checkout, psycopg
+            # tells them apart by server process
+            info = getattr(connection.connection, 'info', None)
+            opened.add(getattr(info, 'backend_pid', None) or next(created))
+
+        connection_created.connect(connection_opened)
+        started = time.perf_counter()
+
+        try:
+            with ThreadPoolExecutor(concurrency) as executor:
+                futures = [
+                    executor.submit(worker) for _ in range(concurrency)
+                ]
+                latencies = sorted(
+                    latency for future in futures
+                    for latency in future.result()
+                )
+        finally:
+            connection_created.disconnect(connection_opened)
+
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f'{len(latencies)} requests in {elapsed:.2f}s with '
+            f'{concurrency} threads: {len(latencies) / elapsed:.1f} req/s'
+        )
+        self.stdout.write(
+            f'connections opened: {len(opened)} '
+            f'({len(opened) / elapsed:.1f}/s)'
+        )
+        self.stdout.write(format_latencies(latencies))
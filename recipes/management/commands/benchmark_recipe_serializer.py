@@ -0,0 +1,126 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from recipes.models import Category, Recipe
+from recipes.serializers import RecipeReadSerializer, RecipeSerializer
+from tag.models import Tag
+
+
+class Rollback(Exception):
+    ...
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares RecipeReadSerializer with RecipeSerializer on generated '
+        'recipes: checks both render the same JSON and times them'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipes', type=int, default=100)
+        parser.add_argument('--tags', type=int, default=3)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument(
+            '--host',
+            default='localhost',
+            help='Host used to build absolute URLs (must be allowed)',
+        )
+
+    def make_recipes(self, qty, tags_per_recipe):
+        category = Category.objects.create(name='Benchmark')
+        author = User.objects.create(username='benchmark-serializer')
+        tags = Tag.objects.bulk_create([
+            Tag(name=f'Tag {i}', slug=f'benchmark-tag-{i}')
+            for i in range(tags_per_recipe)
+        ])
+        recipes = Recipe.objects.bulk_create([
+            Recipe(
+                title=f'Benchmark recipe {i}',
+                description='Benchmark description',
+                slug=f'benchmark-recipe-{i}',
+                preparation_time=10,
+                preparation_time_unit='Minutes',
+                servings=4,
+                servings_unit='Portions',
+                preparation_step='Benchmark preparation steps',
+                is_published=True,
+                category=category,
+                author=author,
+            )
+            for i in range(qty)
+        ])
+        Recipe.tags.through.objects.bulk_create([
+            Recipe.tags.through(recipe_id=recipe.pk, tag_id=tag.pk)
+            for recipe in recipes
+            for tag in tags
+        ])
+        return [recipe.pk for recipe in recipes]
+
+    def render(self, serializer_class, recipes, request):
+        serializer = serializer_class(
+            recipes, many=True, context={'request': request}
+        )
+        return JSONRenderer().render(serializer.data)
+
+    def measure(self, serializer_class, recipes, request, repeat):
+        timings = []
+
+        for _ in range(repeat):
+            start = time.perf_counter()
+            self.render(serializer_class, recipes, request)
+            timings.append(time.perf_counter() - start)
+
+        return min(timings), sum(timings) / len(timings)
+
+    def handle(self, *args, **options):
+        request = Request(
+            APIRequestFactory().get(
+                '/recipes/api/v2/', HTTP_HOST=options['host']
+            )
+        )
+
+        try:
+            with transaction.atomic():
+                ids = self.make_recipes(options['recipes'], options['tags'])
+                recipes = list(
+                    Recipe.objects.get_published().filter(pk__in=ids)
+                )
+                self.report(recipes, request, options['repeat'])
+                raise Rollback
+        except Rollback:
+            ...
+
+    def report(self, recipes, request, repeat):
+        current = self.render(RecipeSerializer, recipes, request)
+        fast = self.render(RecipeReadSerializer, recipes, request)
+
+        if current != fast:
+            raise CommandError('The serializers rendered different JSON')
+
+        self.stdout.write(
+            f'{len(recipes)} recipes, {len(current)} bytes, same output'
+        )
+
+        results = {
+            serializer_class.__name__: self.measure(
+                serializer_class, recipes, request, repeat
+            )
+            for serializer_class in (RecipeSerializer, RecipeReadSerializer)
+        }
+
+        for name, (best, mean) in results.items():
+            self.stdout.write(
+                f'{name}: best {best * 1000:.2f}ms, mean {mean * 1000:.2f}ms'
+            )
+
+        speedup = (
+            results['RecipeSerializer'][0] /
+            results['RecipeReadSerializer'][0]
+        )
+        self.stdout.write(self.style.SUCCESS(f'speedup: {speedup:.1f}x'))
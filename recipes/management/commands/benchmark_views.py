@@ -0,0 +1,106 @@
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.benchmarks import format_latencies
+
+DEFAULT_PATHS = ('/', '/recipes/search/?q=recipe', '/recipes/api/v1/')
+
+
+class Command(BaseCommand):
+    help = (
+        'Loads a running server with concurrent GET requests and reports '
+        'its throughput and latencies. Run it once against the WSGI server '
+        '(gunicorn project.wsgi) and once against the ASGI one with '
+        'ASYNC_VIEWS=1 (uvicorn project.asgi:application) to compare them'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000')
+        parser.add_argument(
+            '--path',
+            action='append',
+            dest='paths',
+            help=f'Path to request, repeatable (default: {DEFAULT_PATHS})',
+        )
+        parser.add_argument('--concurrency', type=int, default=32)
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--timeout', type=float, default=30)
+        parser.add_argument(
+            '--page-cache',
+            action='store_true',
+            help='Let anonymous pages be served from the page cache',
+        )
+
+    def fetch(self, url, headers, timeout):
+        started = time.perf_counter()
+
+        try:
+            with urlopen(Request(url, headers=headers), timeout=timeout) as r:
+                r.read()
+                status = r.status
+        except HTTPError as e:
+            status = e.code
+        except (URLError, OSError) as e:
+            status = type(e).__name__
+
+        return status, time.perf_counter() - started
+
+    def handle(self, *args, **options):
+        base_url = options['url'].rstrip('/')
+        paths = options['paths'] or DEFAULT_PATHS
+        total = options['requests']
+        headers = {}
+
+        if not options['page_cache']:
+            # Requests with a session cookie skip the page cache
+            headers['Cookie'] = 'sessionid=benchmark'
+
+        if total < 1 or options['concurrency'] < 1:
+            raise CommandError('--requests and --concurrency must be >= 1')
+
+        counter = count()
+
+        def worker():
+            results = []
+
+            while (index := next(counter)) < total:
+                url = base_url + paths[index % len(paths)]
+                results.append(
+                    self.fetch(url, headers, options['timeout'])
+                )
+
+            return results
+
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(options['concurrency']) as executor:
+            futures = [
+                executor.submit(worker)
+                for _ in range(options['concurrency'])
+            ]
+            results = [
+                result for future in futures for result in future.result()
+            ]
+
+        elapsed = time.perf_counter() - started
+        statuses = Counter(status for status, _ in results)
+        latencies = sorted(latency for _, latency in results)
+
+        self.stdout.write(
+            f'{len(results)} requests in {elapsed:.2f}s with '
+            f'{options["concurrency"]} clients: '
+            f'{len(results) / elapsed:.1f} req/s'
+        )
+        self.stdout.write(format_latencies(latencies))
+        self.stdout.write(
+            'statuses: ' + ', '.join(
+                f'{status}: {qty}' for status, qty in
+                sorted(statuses.items(), key=lambda item: str(item[0]))
+            )
+        )
@@ -0,0 +1,87 @@
+from django.core.management.base import BaseCommand
+
+from authors.models import Profile
+from recipes.covers import get_variant_names
+from recipes.models import Recipe
+from utils.files import delete_files, iter_orphan_files
+
+
+def get_upload_root(model, field_name):
+    field = model._meta.get_field(field_name)
+    return field.storage, field.upload_to.split('%')[0].rstrip('/')
+
+
+def get_cover_names(prefix):
+    names = set()
+    rows = Recipe.objects.filter(cover__startswith=prefix)\
+        .values_list('cover', 'cover_variants')
+
+    for cover, variants in rows.iterator():
+        names.add(cover)
+        names.update(get_variant_names(variants))
+
+    return names
+
+
+def get_photo_names(prefix):
+    return set(
+        Profile.objects.filter(photo__startswith=prefix)
+        .values_list('photo', flat=True)
+    )
+
+
+class Command(BaseCommand):
+    help = 'Deletes recipe covers and profile photos no row references'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Lists the orphan files without deleting them',
+        )
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=3600,
+            help='Seconds a file must be untouched before it is collected',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+        )
+
+    def handle(self, *args, **options):
+        sources = (
+            (*get_upload_root(Recipe, 'cover'), get_cover_names),
+            (*get_upload_root(Profile, 'photo'), get_photo_names),
+        )
+        found = deleted = 0
+
+        for storage, root, get_referenced_names in sources:
+            batch = []
+            orphans = iter_orphan_files(
+                storage,
+                root,
+                get_referenced_names,
+                min_age=options['min_age'],
+            )
+
+            for name in orphans:
+                found += 1
+
+                if options['dry_run']:
+                    self.stdout.write(name)
+                    continue
+
+                batch.append(name)
+
+                if len(batch) >= options['batch_size']:
+                    deleted += delete_files(storage, batch)
+                    batch = []
+
+            deleted += delete_files(storage, batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{found} orphan files found, {deleted} deleted'
+        ))
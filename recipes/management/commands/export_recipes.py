@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes.export import EXPORT_FORMATS, iter_export, iter_gzip
+
+
+class Command(BaseCommand):
+    help = 'Exports every published recipe as NDJSON or CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=list(EXPORT_FORMATS),
+            default='ndjson',
+            dest='export_format',
+        )
+        parser.add_argument(
+            '--output',
+            help='File to write to, the default is stdout',
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Compresses the output file',
+        )
+        parser.add_argument(
+            '--after',
+            type=int,
+            help='Resumes after this recipe id',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+        )
+
+    def handle(self, *args, **options):
+        content = iter_export(
+            options['export_format'],
+            after_id=options['after'],
+            chunk_size=options['chunk_size'],
+        )
+
+        if options['output'] is None:
+            if options['gzip']:
+                raise CommandError('--gzip needs an --output file')
+
+            for chunk in content:
+                self.stdout.write(chunk, ending='')
+
+            return
+
+        if options['gzip']:
+            with open(options['output'], 'wb') as file:
+                for chunk in iter_gzip(content):
+                    file.write(chunk)
+        else:
+            with open(
+                options['output'], 'w', encoding='utf-8', newline=''
+            ) as file:
+                for chunk in content:
+                    file.write(chunk)
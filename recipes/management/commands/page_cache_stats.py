@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from utils.page_cache import get_page_cache_stats, reset_page_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Shows the public page cache hit/miss counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Resets the counters after showing them',
+        )
+
+    def handle(self, *args, **options):
+        stats = get_page_cache_stats()
+        total = stats['hits'] + stats['misses']
+        ratio = stats['hits'] / total if total else 0
+
+        self.stdout.write(
+            f'hits: {stats["hits"]}\n'
+            f'misses: {stats["misses"]}\n'
+            f'hit ratio: {ratio:.2%}'
+        )
+
+        if options['reset']:
+            reset_page_cache_stats()
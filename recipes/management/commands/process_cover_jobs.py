@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from recipes.covers import (drain_cover_jobs, enqueue_missing_cover_variants,
+                            requeue_stale_cover_jobs)
+
+
+class Command(BaseCommand):
+    help = 'Resizes every recipe cover still waiting in the job table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Database alias holding the jobs',
+        )
+        parser.add_argument(
+            '--requeue-running',
+            action='store_true',
+            help=(
+                'Retries jobs left running for COVER_JOB_STALE_TIMEOUT '
+                'seconds by a worker that stopped'
+            ),
+        )
+        parser.add_argument(
+            '--missing-variants',
+            action='store_true',
+            help='Queues covers that have no responsive variants yet',
+        )
+
+    def handle(self, *args, **options):
+        using = options['database']
+
+        if options['requeue_running']:
+            requeued = requeue_stale_cover_jobs(using)
+            self.stdout.write(f'{requeued} running jobs requeued')
+
+        if options['missing_variants']:
+            queued = enqueue_missing_cover_variants(using)
+            self.stdout.write(f'{queued} covers queued for variants')
+
+        processed = drain_cover_jobs(using)
+        self.stdout.write(self.style.SUCCESS(f'{processed} jobs processed'))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from recipes.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Drops and rebuilds the recipe full-text search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Database alias whose search index will be rebuilt',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Number of recipes indexed per batch',
+        )
+
+    def handle(self, *args, **options):
+        backend = get_search_backend(options['database'])
+
+        with transaction.atomic(using=options['database']):
+            total = backend.rebuild(chunk_size=options['chunk_size'])
+
+        self.stdout.write(
+            self.style.SUCCESS(f'{total} recipes indexed')
+        )
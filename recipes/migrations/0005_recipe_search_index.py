@@ -0,0 +1,29 @@
+from django.db import migrations
+
+from recipes.search import get_search_backend, make_document_rows
+
+
+def create_search_index(apps, schema_editor):
+    Recipe = apps.get_model('recipes', 'Recipe')
+    backend = get_search_backend(schema_editor.connection.alias)
+    backend.install()
+
+    recipes = Recipe.objects.using(schema_editor.connection.alias)\
+        .prefetch_related('tags')\
+        .order_by('id')
+    backend.write_rows(make_document_rows(recipes))
+
+
+def drop_search_index(apps, schema_editor):
+    get_search_backend(schema_editor.connection.alias).uninstall()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0004_alter_category_options_alter_recipe_tags'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
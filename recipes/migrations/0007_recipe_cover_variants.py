@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0006_cover_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='cover_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.4 on 2026-10-18 21:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_author_fields(apps, schema_editor):
+    Recipe = apps.get_model('recipes', 'Recipe')
+    Profile = apps.get_model('authors', 'Profile')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    profiles = dict(Profile.objects.values_list('author_id', 'id'))
+    authors = User.objects.filter(
+        pk__in=Recipe.objects.values('author_id')
+    )
+    # A new updated_at expires the cached recipe cards
+    now = timezone.now()
+
+    for author in authors.iterator():
+        if author.first_name:
+            name = f'{author.first_name} {author.last_name}'.strip()
+        else:
+            name = author.username
+
+        Recipe.objects.filter(author_id=author.pk).update(
+            author_name=name,
+            author_profile_id=profiles.get(author.pk),
+            updated_at=now,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authors', '0001_initial'),
+        ('recipes', '0008_recipe_tombstones'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='author_name',
+            field=models.CharField(blank=True, default='', editable=False, max_length=301),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='author_profile',
+            field=models.ForeignKey(blank=True, default=None, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='authors.profile'),
+        ),
+        migrations.RunPython(
+            backfill_author_fields, migrations.RunPython.noop
+        ),
+    ]
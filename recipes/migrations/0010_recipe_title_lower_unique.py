@@ -0,0 +1,47 @@
+# Generated by Django 5.2.4 on 2026-10-18 21:25
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+def rename_duplicate_titles(apps, schema_editor):
+    # Recipes sharing a title would keep the constraint from being created
+    Recipe = apps.get_model('recipes', 'Recipe')
+    titles = set()
+
+    for recipe in Recipe.objects.order_by('id').only('title').iterator():
+        title = recipe.title
+        counter = recipe.pk
+
+        # A suffixed title may already be taken too
+        while title.lower() in titles:
+            suffix = f' ({counter})'
+            title = recipe.title[:65 - len(suffix)] + suffix
+            counter += 1
+
+        if title != recipe.title:
+            recipe.title = title
+            recipe.save(update_fields=['title'])
+
+        titles.add(title.lower())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authors', '0001_initial'),
+        ('recipes', '0009_recipe_author_fields'),
+        ('tag', '0002_remove_tag_content_type_remove_tag_object_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            rename_duplicate_titles, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='recipe',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('title'), name='recipe_title_lower_unique', violation_error_message='Found recipes with this title'),
+        ),
+    ]
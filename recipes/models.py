@@ -4,15 +4,18 @@ from collections import defaultdict
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
-from django.db import models
-from django.db.models import F, Value
-from django.db.models.functions import Concat
+from django.db import IntegrityError, connections, models, transaction
+from django.db.models import Q, Value
+from django.db.models.functions import Lower
+from django.db.models.lookups import Exact
 from django.urls import reverse
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 from PIL import Image
 
+from authors.models import Profile
 from tag.models import Tag
+from utils.django_models import DirtyFieldsMixin
 
 
 class Category(models.Model):
@@ -25,23 +28,168 @@ class Category(models.Model):
         return self.name
 
 
+def get_author_name(user):
+    """Name recipe cards show for ``user``."""
+    if user.first_name:
+        return f'{user.first_name} {user.last_name}'.strip()
+
+    return user.username
+
+
+def get_author_fields(user):
+    """Values of the author columns copied on the recipes of ``user``."""
+    if user is None:
+        return {'author_name': '', 'author_profile_id': None}
+
+    return {
+        'author_name': get_author_name(user),
+        'author_profile_id': Profile.objects.filter(author_id=user.pk)
+        .values_list('id', flat=True)
+        .first(),
+    }
+
+
+TITLE_TAKEN_MESSAGE = 'Found recipes with this title'
+# Slug candidates looked up per query when a slug is taken
+SLUG_PROBE_SIZE = 10
+
+
+def get_title_lookup(title):
+    # Same expression as the recipe_title_lower_unique index
+    return Exact(Lower('title'), Lower(Value(title)))
+
+
+def make_slug_candidate(base, number, max_length):
+    if number == 1:
+        return base[:max_length]
+
+    suffix = f'-{number}'
+    return base[:max_length - len(suffix)].rstrip('-') + suffix
+
+
+def allocate_slugs(titles):
+    """
+    Free slugs for ``titles``, ``slugify(title)`` or the first of its
+    ``-2``, ``-3``... variants not taken by a recipe or a previous title.
+    """
+    max_length = Recipe._meta.get_field('slug').max_length
+    bases = [slugify(title) or 'recipe' for title in titles]
+    probed = {}
+    taken = set()
+
+    def probe(bases_to_probe):
+        candidates = []
+
+        for base in bases_to_probe:
+            start = probed.get(base, 0) + 1
+            probed[base] = start + SLUG_PROBE_SIZE - 1
+            candidates.extend(
+                make_slug_candidate(base, number, max_length)
+                for number in range(start, probed[base] + 1)
+            )
+
+        taken.update(
+            Recipe.objects.filter(slug__in=candidates)
+            .values_list('slug', flat=True)
+        )
+
+    probe(set(bases))
+    slugs = []
+
+    for base in bases:
+        number = 1
+
+        while True:
+            if number > probed[base]:
+                probe([base])
+
+            slug = make_slug_candidate(base, number, max_length)
+
+            if slug not in taken:
+                break
+
+            number += 1
+
+        taken.add(slug)
+        slugs.append(slug)
+
+    return slugs
+
+
 class RecipeManager(models.Manager):
-    def get_published(self):
-        return self.filter(
-            is_published=True
-        ).annotate(
-            author_full_Name=Concat(
-                F('author__first_name'), Value(' '),
-                F('author__last_name'), Value(' ('),
-                F('author__username'), Value(')'),
+    def get_published(
+        self,
+        author=True,
+        category=True,
+        tags=True,
+        preparation_step=True,
+    ):
+        """
+        Published recipes, newest first. The flags let callers that do
+        not show a relation or the preparation step skip its query cost.
+        """
+        qs = self.filter(is_published=True).order_by('-id')
+
+        if not author:
+            qs = qs.defer('author_name', 'author_profile')
+
+        if category:
+            qs = qs.select_related('category')
+
+        if tags:
+            qs = qs.prefetch_related('tags')
+
+        if not preparation_step:
+            qs = qs.defer('preparation_step')
+
+        return qs
+
+    def title_is_taken(self, title, exclude_pk=None):
+        """Whether another recipe has ``title``, ignoring case."""
+        return self.filter(get_title_lookup(title))\
+            .exclude(pk=exclude_pk)\
+            .exists()
+
+    def get_title_conflicts(self, titles):
+        """
+        ``(id, lowered title)`` of the recipes having one of ``titles``,
+        lowered by the database like ``lower_titles``.
+        """
+        if not titles:
+            return []
+
+        lookups = Q()
+
+        for title in set(titles):
+            lookups |= Q(get_title_lookup(title))
+
+        return list(self.filter(lookups).values_list('id', Lower('title')))
+
+    def lower_titles(self, titles):
+        """
+        ``titles`` lowercased by the database, as the unique title index
+        compares them. Python folds case differently outside ASCII.
+        """
+        if not titles:
+            return []
+
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(
+                'SELECT ' + ', '.join(['LOWER(%s)'] * len(titles)), titles
             )
-        )\
-            .order_by('-id')\
-            .select_related('category', 'author')\
-            .prefetch_related('tags')
+            return list(cursor.fetchone())
 
 
-class Recipe(models.Model):
+class Recipe(DirtyFieldsMixin, models.Model):
+    COVER_PENDING = 'pending'
+    COVER_READY = 'ready'
+    COVER_FAILED = 'failed'
+    COVER_STATUSES = (
+        (COVER_PENDING, _('Pending')),
+        (COVER_READY, _('Ready')),
+        (COVER_FAILED, _('Failed')),
+    )
+
     objects = RecipeManager()
     title = models.CharField(max_length=65, verbose_name=_('Title'))
     description = models.CharField(max_length=165)
@@ -60,6 +208,12 @@ class Recipe(models.Model):
         blank=True,
         default=''
     )
+    cover_status = models.CharField(
+        max_length=16,
+        choices=COVER_STATUSES,
+        default=COVER_READY,
+    )
+    cover_variants = models.JSONField(default=dict, blank=True)
     category = models.ForeignKey(
         Category,
         on_delete=models.SET_NULL,
@@ -74,6 +228,23 @@ class Recipe(models.Model):
         blank=True,
         default=None
     )
+    # Copies of the author's display name and profile, kept by signals,
+    # so listings do not join auth_user and authors_profile
+    author_name = models.CharField(
+        max_length=301,
+        blank=True,
+        default='',
+        editable=False
+    )
+    author_profile = models.ForeignKey(
+        Profile,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        default=None,
+        editable=False,
+        related_name='+'
+    )
     tags = models.ManyToManyField(Tag, blank=True, default='')
 
     def __str__(self):
@@ -82,6 +253,21 @@ class Recipe(models.Model):
     def get_absolute_url(self):
         return reverse("recipes:recipe", args=(self.id,))
 
+    @property
+    def cover_sources(self):
+        """``<source>`` attributes for each generated format, best first."""
+        storage = self.cover.storage
+        return [
+            {
+                'type': source['type'],
+                'srcset': ', '.join(
+                    f'{storage.url(name)} {width}w'
+                    for width, name in source['files']
+                ),
+            }
+            for source in self.cover_variants.get('sources', [])
+        ]
+
     @staticmethod
     def resize_image(image, new_width=840):
         image_full_path = os.path.join(settings.MEDIA_ROOT, image.name)
@@ -95,43 +281,177 @@ class Recipe(models.Model):
         new_height = round(new_width * original_height / original_with)
         new_image = image_pillow.resize((new_width, new_height), Image.LANCZOS)
 
+        # Pages keep serving the original until the resized file replaces it
+        root, ext = os.path.splitext(image_full_path)
+        tmp_path = f'{root}.resizing{ext}'
         new_image.save(
-            image_full_path,
+            tmp_path,
+            format=image_pillow.format,
             optimize=True,
             quality=50
         )
+        image_pillow.close()
+        os.replace(tmp_path, image_full_path)
+
+    def cover_has_changed(self):
+        if self.is_tracked('cover'):
+            return self.has_changed('cover')
+
+        saved_cover = None
+
+        if self.pk is not None:
+            saved_cover = Recipe.objects.filter(pk=self.pk)\
+                .values_list('cover', flat=True)\
+                .first()
+
+        if saved_cover is None:
+            return bool(self.cover)
+
+        return saved_cover != self.cover.name
+
+    def author_has_changed(self):
+        return not self.is_tracked('author') or self.has_changed('author')
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            slug = f'{slugify(self.title)}'
-            self.slug = slug
+        allocate_slug = not self.slug
+        update_fields = kwargs.get('update_fields')
+
+        if (
+            (update_fields is None or 'author' in update_fields) and
+            self.author_has_changed()
+        ):
+            for field_name, value in get_author_fields(self.author).items():
+                setattr(self, field_name, value)
+
+            if update_fields is not None:
+                update_fields = kwargs['update_fields'] = {
+                    *update_fields, 'author_name', 'author_profile'
+                }
+        self._cover_changed = (
+            (update_fields is None or 'cover' in update_fields) and
+            self.cover_has_changed()
+        )
+
+        if self._cover_changed:
+            self.cover_status = (
+                self.COVER_PENDING if self.cover else self.COVER_READY
+            )
+            self.cover_variants = {}
 
-        saved = super().save(*args, **kwargs)
+            if update_fields is not None:
+                kwargs['update_fields'] = {
+                    *update_fields, 'cover_status', 'cover_variants'
+                }
+
+        while True:
+            if allocate_slug:
+                self.slug, = allocate_slugs([self.title])
 
-        if self.cover:
             try:
-                self.resize_image(self.cover)
-            except FileNotFoundError:
-                ...
+                with transaction.atomic(using=kwargs.get('using')):
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                # Lost a race with a concurrent save
+                if Recipe.objects.title_is_taken(self.title, self.pk):
+                    raise ValidationError({'title': [TITLE_TAKEN_MESSAGE]})
+
+                slug_taken = Recipe.objects.filter(slug=self.slug)\
+                    .exclude(pk=self.pk)\
+                    .exists()
 
-        return saved
+                if not (allocate_slug and slug_taken):
+                    raise
 
     def clean(self, *args, **kwargs):
         error_messages = defaultdict(list)
 
-        recipe_from_db = Recipe.objects.filter(
-            title__iexact=self.title
-        ).first()
-
-        if recipe_from_db:
-            if recipe_from_db.pk != self.pk:
-                error_messages['title'].append(
-                    "Found recipes with this title"
-                )
+        if Recipe.objects.title_is_taken(self.title, self.pk):
+            error_messages['title'].append(TITLE_TAKEN_MESSAGE)
 
         if error_messages:
             raise ValidationError(error_messages)
 
+    def validate_constraints(self, exclude=None):
+        # clean() reports the title constraint on the title field
+        return super().validate_constraints(
+            exclude={*(exclude or ()), 'title'}
+        )
+
     class Meta:
         verbose_name = _('Recipe')
         verbose_name_plural = _('Recipes')
+        indexes = [
+            # Delta syncs walk recipes by (updated_at, id)
+            models.Index(
+                fields=['updated_at', 'id'],
+                name='recipe_updated_at_id_idx',
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                Lower('title'),
+                name='recipe_title_lower_unique',
+                violation_error_message=TITLE_TAKEN_MESSAGE,
+            ),
+        ]
+
+
+class CoverJob(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    )
+
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name='cover_jobs'
+    )
+    cover = models.CharField(max_length=255)
+    status = models.CharField(
+        max_length=16,
+        choices=STATUSES,
+        default=PENDING,
+        db_index=True
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.cover} ({self.status})'
+
+
+class RecipeTombstone(models.Model):
+    """
+    Recipe that synced clients must drop. Kept after the recipe is gone,
+    so it is not a foreign key.
+    """
+    DELETED = 'deleted'
+    UNPUBLISHED = 'unpublished'
+    REASONS = (
+        (DELETED, 'Deleted'),
+        (UNPUBLISHED, 'Unpublished'),
+    )
+
+    recipe_id = models.BigIntegerField(unique=True)
+    reason = models.CharField(max_length=16, choices=REASONS)
+    changed_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['changed_at', 'recipe_id'],
+                name='tombstone_changed_at_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipe_id} ({self.reason})'
@@ -0,0 +1,38 @@
+from utils.page_cache import invalidate_page_tags
+
+LIST_PAGE_TAG = 'recipes:list'
+
+
+def recipe_page_tag(recipe_id):
+    return f'recipes:recipe:{recipe_id}'
+
+
+def category_page_tag(category_id):
+    return f'recipes:category:{category_id}'
+
+
+def tag_page_tag(slug):
+    return f'recipes:tag:{slug}'
+
+
+def invalidate_recipe_pages(recipe_ids=(), category_ids=(), tag_slugs=()):
+    from recipes.models import Recipe
+
+    recipe_ids = set(recipe_ids)
+    category_ids = set(category_ids)
+    tag_slugs = set(tag_slugs)
+
+    if recipe_ids:
+        related = Recipe.objects.filter(pk__in=recipe_ids)\
+            .values_list('category_id', 'tags__slug')
+
+        for category_id, slug in related:
+            category_ids.add(category_id)
+            tag_slugs.add(slug)
+
+    invalidate_page_tags(
+        {LIST_PAGE_TAG} |
+        {recipe_page_tag(pk) for pk in recipe_ids} |
+        {category_page_tag(pk) for pk in category_ids if pk is not None} |
+        {tag_page_tag(slug) for slug in tag_slugs if slug is not None}
+    )
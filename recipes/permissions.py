@@ -3,7 +3,8 @@ from rest_framework import permissions
 
 class IsOwner(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
-        return obj.author == request.user
+        # Compare ids, request.user may be built from token claims
+        return obj.author_id is not None and obj.author_id == request.user.pk
 
     def has_permission(self, request, view):
         return super().has_permission(request, view)
\ No newline at end of file
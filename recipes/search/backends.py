@@ -0,0 +1,306 @@
+import re
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+SEARCH_TABLE = 'recipes_recipe_fts'
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_STOP = '\x03'
+
+_backends = {}
+
+
+def get_search_backend(using=DEFAULT_DB_ALIAS):
+    connection = connections[using]
+
+    if using not in _backends:
+        backend_class = BACKENDS.get(connection.vendor, SimpleSearchBackend)
+        _backends[using] = backend_class(using)
+
+    return _backends[using]
+
+
+def render_highlight(snippet):
+    if not snippet:
+        return ''
+
+    html = escape(snippet)
+    html = html.replace(HIGHLIGHT_START, '<mark>')
+    html = html.replace(HIGHLIGHT_STOP, '</mark>')
+    return mark_safe(html)
+
+
+def get_search_terms(search_term):
+    return re.findall(r'\w+', search_term.lower())[:16]
+
+
+def make_document_rows(recipes):
+    return [
+        (
+            recipe.pk,
+            recipe.title,
+            recipe.description,
+            ' '.join(tag.name for tag in recipe.tags.all()),
+        )
+        for recipe in recipes
+    ]
+
+
+class BaseSearchBackend:
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    def install(self):
+        ...
+
+    def uninstall(self):
+        ...
+
+    def write_rows(self, rows):
+        ...
+
+    def remove(self, ids):
+        ...
+
+    def search(self, queryset, search_term):
+        raise NotImplementedError
+
+    def get_recipes_for_index(self, ids=None):
+        from recipes.models import Recipe
+
+        qs = Recipe.objects.using(self.using)\
+            .only('id', 'title', 'description')\
+            .prefetch_related('tags')\
+            .order_by('id')
+
+        if ids is not None:
+            qs = qs.filter(id__in=ids)
+
+        return qs
+
+    def index(self, ids):
+        ids = list(ids)
+
+        if not ids:
+            return
+
+        rows = make_document_rows(self.get_recipes_for_index(ids))
+        self.remove(ids)
+        self.write_rows(rows)
+
+    def rebuild(self, chunk_size=500):
+        self.uninstall()
+        self.install()
+
+        total = 0
+        chunk = []
+        recipes = self.get_recipes_for_index().iterator(chunk_size=chunk_size)
+
+        for recipe in recipes:
+            chunk.append(recipe)
+
+            if len(chunk) >= chunk_size:
+                self.write_rows(make_document_rows(chunk))
+                total += len(chunk)
+                chunk = []
+
+        self.write_rows(make_document_rows(chunk))
+        return total + len(chunk)
+
+
+class SimpleSearchBackend(BaseSearchBackend):
+    """Unindexed fallback for database engines without full-text search."""
+
+    def search(self, queryset, search_term):
+        terms = get_search_terms(search_term)
+
+        if not terms:
+            return queryset.none()
+
+        for term in terms:
+            queryset = queryset.filter(
+                Q(title__icontains=term) |
+                Q(description__icontains=term) |
+                Q(tags__name__icontains=term)
+            )
+
+        return queryset.distinct().order_by('-id')
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """FTS5 virtual table whose rowid is the recipe id."""
+
+    weights = '10.0, 4.0, 2.0'
+
+    def install(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} '
+                'USING fts5(title, description, tags, '
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            )
+
+    def uninstall(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+    def write_rows(self, rows):
+        if not rows:
+            return
+
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {SEARCH_TABLE} '
+                '(rowid, title, description, tags) VALUES (%s, %s, %s, %s)',
+                rows
+            )
+
+    def remove(self, ids):
+        ids = list(ids)
+
+        if not ids:
+            return
+
+        placeholders = ', '.join(['%s'] * len(ids))
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({placeholders})',
+                ids
+            )
+
+    def search(self, queryset, search_term):
+        terms = get_search_terms(search_term)
+
+        if not terms:
+            return queryset.none()
+
+        match = ' '.join(f'"{term}"*' for term in terms)
+        table = queryset.model._meta.db_table
+        matching_row = (
+            f'FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s '
+            f'AND {SEARCH_TABLE}.rowid = {table}.id'
+        )
+
+        return queryset.filter(
+            id__in=RawSQL(
+                f'SELECT rowid FROM {SEARCH_TABLE} '
+                f'WHERE {SEARCH_TABLE} MATCH %s',
+                (match,)
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f'SELECT bm25({SEARCH_TABLE}, {self.weights}) '
+                f'{matching_row}',
+                (match,)
+            ),
+            search_snippet=RawSQL(
+                f'SELECT snippet({SEARCH_TABLE}, -1, %s, %s, %s, 24) '
+                f'{matching_row}',
+                (HIGHLIGHT_START, HIGHLIGHT_STOP, '…', match)
+            ),
+        ).order_by('search_rank', '-id')
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """Weighted tsvector documents in a side table with a GIN index."""
+
+    def install(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ('
+                'recipe_id bigint PRIMARY KEY '
+                'REFERENCES recipes_recipe (id) ON DELETE CASCADE '
+                'DEFERRABLE INITIALLY DEFERRED, '
+                'document tsvector NOT NULL)'
+            )
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document_idx '
+                f'ON {SEARCH_TABLE} USING GIN (document)'
+            )
+
+    def uninstall(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+    @property
+    def config(self):
+        return settings.SEARCH_CONFIG
+
+    def write_rows(self, rows):
+        if not rows:
+            return
+
+        config = self.config
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {SEARCH_TABLE} (recipe_id, document) VALUES ('
+                '%s, '
+                "setweight(to_tsvector(%s::regconfig, %s), 'A') || "
+                "setweight(to_tsvector(%s::regconfig, %s), 'B') || "
+                "setweight(to_tsvector(%s::regconfig, %s), 'C')) "
+                'ON CONFLICT (recipe_id) '
+                'DO UPDATE SET document = EXCLUDED.document',
+                [
+                    (pk, config, title, config, description, config, tags)
+                    for pk, title, description, tags in rows
+                ]
+            )
+
+    def remove(self, ids):
+        ids = list(ids)
+
+        if not ids:
+            return
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {SEARCH_TABLE} WHERE recipe_id = ANY(%s)',
+                (ids,)
+            )
+
+    def search(self, queryset, search_term):
+        terms = get_search_terms(search_term)
+
+        if not terms:
+            return queryset.none()
+
+        config = self.config
+        query = ' & '.join(f'{term}:*' for term in terms)
+        table = queryset.model._meta.db_table
+        highlight_options = (
+            f'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, '
+            'MaxWords=24, MinWords=12'
+        )
+
+        return queryset.filter(
+            id__in=RawSQL(
+                f'SELECT recipe_id FROM {SEARCH_TABLE} '
+                'WHERE document @@ to_tsquery(%s::regconfig, %s)',
+                (config, query)
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                'SELECT -ts_rank_cd(document, to_tsquery(%s::regconfig, %s)) '
+                f'FROM {SEARCH_TABLE} WHERE recipe_id = {table}.id',
+                (config, query)
+            ),
+            search_snippet=RawSQL(
+                f'ts_headline(%s::regconfig, {table}.description, '
+                'to_tsquery(%s::regconfig, %s), %s)',
+                (config, config, query, highlight_options)
+            ),
+        ).order_by('search_rank', '-id')
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
@@ -1,7 +1,13 @@
+from urllib.parse import urlparse
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.urls import Resolver404, get_script_prefix, resolve, reverse
+from django.utils.functional import cached_property
 from rest_framework import serializers
 
 from authors.validators import AuthorRecipeValidator
-from recipes.models import Recipe
+from recipes.models import TITLE_TAKEN_MESSAGE, Recipe
 from tag.models import Tag
 
 
@@ -11,22 +17,46 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'slug']
 
 
+def make_cover_variants_data(recipe, make_url):
+    if not recipe.cover_variants:
+        return None
+
+    storage = recipe.cover.storage
+    return {
+        'width': recipe.cover_variants['width'],
+        'height': recipe.cover_variants['height'],
+        'sources': [
+            {
+                'type': source['type'],
+                'files': [
+                    {'width': width, 'url': make_url(storage.url(name))}
+                    for width, name in source['files']
+                ],
+            }
+            for source in recipe.cover_variants['sources']
+        ],
+    }
+
+
 class RecipeSerializer(serializers.ModelSerializer):
     class Meta:
         model = Recipe
         fields = [
-            'id', 'title', 'description', 'author',
+            'id', 'title', 'description', 'author', 'author_name',
             'category', 'tags', 'public', 'preparation',
             'tag_objects', 'tag_links', 'preparation_time',
             'preparation_time_unit', 'servings', 'servings_unit',
-            'preparation_step', 'cover'
+            'preparation_step', 'cover', 'cover_status', 'cover_variants'
         ]
 
     public = serializers.BooleanField(
         source="is_published",
         read_only=True,
     )
+    author_name = serializers.CharField(read_only=True)
     preparation = serializers.SerializerMethodField()
+    cover_status = serializers.CharField(read_only=True)
+    cover_variants = serializers.SerializerMethodField()
     category = serializers.StringRelatedField(
         read_only=True,
     )
@@ -44,6 +74,22 @@ class RecipeSerializer(serializers.ModelSerializer):
     def get_preparation(self, recipe):
         return f'{recipe.preparation_time} {recipe.preparation_time_unit}'
 
+    def get_cover_variants(self, recipe):
+        request = self.context.get('request')
+
+        def make_url(url):
+            return request.build_absolute_uri(url) if request else url
+
+        return make_cover_variants_data(recipe, make_url)
+
+    def validate_title(self, title):
+        pk = None if self.instance is None else self.instance.pk
+
+        if Recipe.objects.title_is_taken(title, pk):
+            raise serializers.ValidationError(TITLE_TAKEN_MESSAGE)
+
+        return title
+
     def validate(self, attrs):
         if self.instance is not None and attrs.get('servings') is None:
             attrs['servings'] = self.instance.servings
@@ -56,3 +102,175 @@ class RecipeSerializer(serializers.ModelSerializer):
             ErrorClass=serializers.ValidationError
         )
         return super_validate
+
+    def save(self, **kwargs):
+        try:
+            return super().save(**kwargs)
+        except DjangoValidationError as error:
+            # Recipe.save lost the title to a concurrent save
+            raise serializers.ValidationError(
+                serializers.as_serializer_error(error)
+            )
+
+
+def get_tag_link_pks(urls):
+    """Tag ids named by tag link URLs, resolved without queries."""
+    prefix = get_script_prefix()
+    pks = set()
+
+    for url in urls:
+        if not isinstance(url, str):
+            continue
+
+        path = urlparse(url).path
+
+        if path.startswith(prefix):
+            path = '/' + path[len(prefix):]
+
+        try:
+            match = resolve(path)
+        except Resolver404:
+            continue
+
+        if match.view_name == 'recipes:recipes_api_v2_tag':
+            pks.add(match.kwargs['pk'])
+
+    return pks
+
+
+class PrefetchedTagLinkField(serializers.HyperlinkedRelatedField):
+    """Looks tags up in ``context['tags_by_pk']`` instead of querying."""
+
+    def get_object(self, view_name, view_args, view_kwargs):
+        tags_by_pk = self.context.get('tags_by_pk')
+
+        if tags_by_pk is None:
+            return super().get_object(view_name, view_args, view_kwargs)
+
+        try:
+            return tags_by_pk[int(view_kwargs[self.lookup_url_kwarg])]
+        except (KeyError, TypeError, ValueError):
+            raise ObjectDoesNotExist
+
+
+class RecipeBulkSerializer(RecipeSerializer):
+    """
+    One item of a bulk write. Items with an ``id`` update that recipe,
+    and are validated as a partial update.
+    """
+    id = serializers.IntegerField(required=False)
+    tag_links = PrefetchedTagLinkField(
+        many=True,
+        source='tags',
+        queryset=Tag.objects.all(),
+        view_name='recipes:recipes_api_v2_tag',
+        required=False,
+    )
+
+    def validate_title(self, title):
+        # validate_recipe_batch looks up the titles of the whole batch
+        return title
+
+    def validate(self, attrs):
+        if self.instance is not None:
+            for field_name in ('title', 'description'):
+                attrs.setdefault(
+                    field_name, getattr(self.instance, field_name)
+                )
+
+        return super().validate(attrs)
+
+
+class RecipeReadSerializer(serializers.BaseSerializer):
+    """
+    Read-only twin of ``RecipeSerializer`` for list and retrieve.
+
+    Builds the same JSON with plain dicts from recipes fetched with
+    ``select_related('category')`` and ``prefetch_related('tags')``.
+    A ``fields`` list in the context limits the output to those keys.
+    """
+    tag_link_pk = 987654321
+    tag_fields = {'tags', 'tag_objects', 'tag_links'}
+
+    @cached_property
+    def request(self):
+        return self.context.get('request')
+
+    @cached_property
+    def field_names(self):
+        fields = self.context.get('fields')
+        return [
+            name for name in RecipeSerializer.Meta.fields
+            if fields is None or name in fields
+        ]
+
+    @cached_property
+    def absolute_prefix(self):
+        if self.request is None:
+            return ''
+
+        return self.request.build_absolute_uri('/')[:-1]
+
+    @cached_property
+    def tag_link_parts(self):
+        # One reverse() per response instead of one per tag
+        url = reverse(
+            'recipes:recipes_api_v2_tag', kwargs={'pk': self.tag_link_pk}
+        )
+        prefix, _, suffix = self.make_url(url).rpartition(
+            str(self.tag_link_pk)
+        )
+        return prefix, suffix
+
+    def make_url(self, url):
+        if (
+            self.request is None or
+            not url.startswith('/') or
+            url.startswith('//')
+        ):
+            return url
+
+        return f'{self.absolute_prefix}{url}'
+
+    def to_representation(self, recipe):
+        tags = None
+
+        if self.tag_fields.intersection(self.field_names):
+            tags = recipe.tags.all()
+
+        data = {}
+
+        for name in self.field_names:
+            if name == 'author':
+                data[name] = recipe.author_id
+            elif name == 'category':
+                category = recipe.category
+                data[name] = str(category) if category is not None else None
+            elif name == 'tags':
+                data[name] = [tag.id for tag in tags]
+            elif name == 'public':
+                data[name] = recipe.is_published
+            elif name == 'preparation':
+                data[name] = (
+                    f'{recipe.preparation_time} {recipe.preparation_time_unit}'
+                )
+            elif name == 'tag_objects':
+                data[name] = [
+                    {'id': tag.id, 'name': tag.name, 'slug': tag.slug}
+                    for tag in tags
+                ]
+            elif name == 'tag_links':
+                tag_prefix, tag_suffix = self.tag_link_parts
+                data[name] = [
+                    f'{tag_prefix}{tag.id}{tag_suffix}' for tag in tags
+                ]
+            elif name == 'cover':
+                data[name] = (
+                    self.make_url(recipe.cover.url) if recipe.cover else None
+                )
+            elif name == 'cover_variants':
+                data[name] = make_cover_variants_data(recipe, self.make_url)
+            else:
+                data[name] = getattr(recipe, name)
+
+        return data
@@ -1,30 +1,321 @@
-import os
-
-from django.db.models.signals import pre_delete, pre_save
+from django.contrib.auth.models import User
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete, pre_save)
 from django.dispatch import receiver
+from django.utils import timezone
+
+from authors.models import Profile
+from recipes.changes import clear_tombstone, write_tombstone
+from recipes.covers import enqueue_cover_job, get_variant_names
+from recipes.models import (Category, Recipe, RecipeTombstone,
+                            get_author_name)
+from recipes.page_cache import invalidate_recipe_pages
+from recipes.search import get_search_backend
+from tag.models import Tag
+from utils.counting import invalidate_counts
+from utils.files import delete_files_on_commit
+
+
+def touch_recipes(recipes, tag_slugs=(), **fields):
+    # Bumping updated_at changes the recipe card cache key
+    recipe_ids = list(recipes.values_list('id', flat=True).distinct())
+
+    if recipe_ids:
+        Recipe.objects.filter(pk__in=recipe_ids)\
+            .update(updated_at=timezone.now(), **fields)
+
+    invalidate_recipe_pages(recipe_ids, tag_slugs=tag_slugs)
+    return len(recipe_ids)
+
+
+def delete_cover(cover, variants, using):
+    delete_files_on_commit(
+        cover.storage,
+        [cover.name, *get_variant_names(variants)],
+        using,
+    )
+
+
+def get_saved_cover(instance):
+    # Loaded instances remember their cover, the rest read it again
+    if instance.is_tracked('cover', 'cover_variants'):
+        name = instance.get_loaded_value('cover')
+        variants = instance.get_loaded_value('cover_variants')
+    else:
+        saved = Recipe.objects.filter(pk=instance.pk)\
+            .values('cover', 'cover_variants')\
+            .first()
 
-from recipes.models import Recipe
+        if not saved:
+            return None, {}
 
+        name, variants = saved['cover'], saved['cover_variants']
 
-def delete_cover(instance):
-    try:
-        os.remove(instance.cover.path)
-    except (ValueError, FileNotFoundError) as e:
-        print(e)
+    field = Recipe._meta.get_field('cover')
+    return field.attr_class(instance, field, name), variants
 
 
 @receiver(pre_delete, sender=Recipe)
-def recipe_cover_delete(sender, instance, *args, **kwargs):
-    old_instance = Recipe.objects.filter(pk=instance.pk).first()
+def recipe_cover_delete(sender, instance, using, *args, **kwargs):
+    cover, variants = get_saved_cover(instance)
+
+    if cover:
+        delete_cover(cover, variants, using)
+
+
+@receiver(pre_save, sender=Recipe)
+def recipe_cover_update(sender, instance, raw, using, *args, **kwargs):
+    if not hasattr(instance, '_cover_changed'):
+        # Fixtures call save_base() directly
+        instance._cover_changed = instance.cover_has_changed()
+
+    if instance._cover_changed and instance.pk:
+        cover, variants = get_saved_cover(instance)
+
+        if cover:
+            delete_cover(cover, variants, using)
+
+
+@receiver(post_save, sender=Recipe)
+def recipe_cover_enqueue(sender, instance, raw, using, *args, **kwargs):
+    cover_changed = instance.__dict__.pop('_cover_changed', False)
+
+    if not raw and cover_changed and instance.cover:
+        enqueue_cover_job(instance, using)
+
+
+@receiver(post_save, sender=Recipe)
+def recipe_tombstone_update(
+    sender, instance, created, raw, using, update_fields, *args, **kwargs
+):
+    if created or raw or (
+        update_fields is not None and 'is_published' not in update_fields
+    ):
+        return
+
+    if instance.is_tracked('is_published') and not \
+            instance.has_changed('is_published'):
+        return
+
+    if instance.is_published:
+        clear_tombstone(instance.pk, using)
+    else:
+        write_tombstone(
+            instance.pk,
+            RecipeTombstone.UNPUBLISHED,
+            instance.updated_at,
+            using,
+        )
+
+
+@receiver(post_delete, sender=Recipe)
+def recipe_tombstone_delete(sender, instance, using, *args, **kwargs):
+    # Drafts were never synced, unpublished ones already have a tombstone
+    if instance.is_published:
+        write_tombstone(
+            instance.pk, RecipeTombstone.DELETED, timezone.now(), using
+        )
+
+
+@receiver(post_save, sender=Recipe)
+def recipe_search_index_update(
+    sender, instance, using, update_fields, *args, **kwargs
+):
+    if update_fields is not None and \
+            not {'title', 'description'} & set(update_fields):
+        return
+
+    get_search_backend(using).index([instance.pk])
+
+
+@receiver(post_delete, sender=Recipe)
+def recipe_search_index_delete(sender, instance, using, *args, **kwargs):
+    get_search_backend(using).remove([instance.pk])
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def recipe_tags_search_index_update(
+    sender, instance, action, reverse, pk_set, using, *args, **kwargs
+):
+    if action == 'pre_clear' and reverse:
+        instance._search_recipe_ids = list(
+            instance.recipe_set.values_list('id', flat=True)
+        )
+
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        recipe_ids = [instance.pk]
+    elif action == 'post_clear':
+        recipe_ids = instance._search_recipe_ids
+    else:
+        recipe_ids = pk_set
+
+    get_search_backend(using).index(recipe_ids)
+
+
+@receiver(post_save, sender=Tag)
+def tag_search_index_update(sender, instance, created, using, *args, **kwargs):
+    if created:
+        return
+
+    get_search_backend(using).index(
+        instance.recipe_set.values_list('id', flat=True)
+    )
+
 
-    if old_instance:
-        delete_cover(old_instance)
+@receiver(pre_delete, sender=Tag)
+def tag_search_index_collect(sender, instance, *args, **kwargs):
+    instance._search_recipe_ids = list(
+        instance.recipe_set.values_list('id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Tag)
+def tag_search_index_delete(sender, instance, using, *args, **kwargs):
+    get_search_backend(using).index(instance._search_recipe_ids)
+
+
+@receiver([post_save, post_delete], sender=Recipe)
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Tag)
+def recipe_counts_invalidate(sender, using, *args, **kwargs):
+    invalidate_counts(using)
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def recipe_tags_counts_invalidate(sender, action, using, *args, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_counts(using)
+
+
+@receiver(pre_save, sender=User)
+def author_card_fields_changed(sender, instance, update_fields, **kwargs):
+    card_fields = {'first_name', 'last_name', 'username'}
+    instance._recipe_card_changed = False
+
+    if not instance.pk:
+        return
+
+    if update_fields is not None and not card_fields & set(update_fields):
+        return
+
+    old_instance = User.objects.filter(pk=instance.pk)\
+        .values(*card_fields)\
+        .first()
+
+    instance._recipe_card_changed = old_instance is not None and any(
+        old_instance[field] != getattr(instance, field)
+        for field in card_fields
+    )
+
+
+@receiver(post_save, sender=User)
+def author_recipe_cards_touch(sender, instance, created, **kwargs):
+    if not created and getattr(instance, '_recipe_card_changed', False):
+        touch_recipes(
+            Recipe.objects.filter(author=instance),
+            author_name=get_author_name(instance),
+        )
+
+
+@receiver(pre_delete, sender=User)
+def author_delete_recipe_cards_touch(sender, instance, **kwargs):
+    touch_recipes(Recipe.objects.filter(author=instance), author_name='')
+
+
+@receiver(post_save, sender=Profile)
+def profile_recipe_cards_touch(sender, instance, created, **kwargs):
+    if created:
+        touch_recipes(
+            Recipe.objects.filter(author_id=instance.author_id),
+            author_profile=instance,
+        )
+
+
+@receiver(post_delete, sender=Profile)
+def profile_delete_recipe_cards_touch(sender, instance, **kwargs):
+    touch_recipes(Recipe.objects.filter(author_id=instance.author_id))
+
+
+@receiver(post_save, sender=Category)
+def category_recipe_cards_touch(sender, instance, created, **kwargs):
+    if not created:
+        touch_recipes(Recipe.objects.filter(category=instance))
+
+
+@receiver(pre_delete, sender=Category)
+def category_delete_recipe_cards_touch(sender, instance, **kwargs):
+    touch_recipes(Recipe.objects.filter(category=instance))
+
+
+@receiver(pre_save, sender=Tag)
+def tag_old_slug_collect(sender, instance, *args, **kwargs):
+    instance._old_slug = None
+
+    if instance.pk:
+        instance._old_slug = Tag.objects.filter(pk=instance.pk)\
+            .values_list('slug', flat=True)\
+            .first()
+
+
+@receiver(post_save, sender=Tag)
+def tag_recipe_cards_touch(sender, instance, created, **kwargs):
+    if not created:
+        touch_recipes(
+            instance.recipe_set.all(),
+            tag_slugs=[instance.slug, instance._old_slug],
+        )
+
+
+@receiver(pre_delete, sender=Tag)
+def tag_delete_recipe_cards_touch(sender, instance, **kwargs):
+    touch_recipes(instance.recipe_set.all(), tag_slugs=[instance.slug])
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def recipe_tags_cards_touch(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ('pre_add', 'pre_remove', 'pre_clear'):
+        return
+
+    if not reverse:
+        touch_recipes(
+            Recipe.objects.filter(pk=instance.pk),
+            tag_slugs=Tag.objects.filter(pk__in=pk_set or [])
+            .values_list('slug', flat=True),
+        )
+    elif action == 'pre_clear':
+        touch_recipes(instance.recipe_set.all(), tag_slugs=[instance.slug])
+    else:
+        touch_recipes(
+            Recipe.objects.filter(pk__in=pk_set),
+            tag_slugs=[instance.slug],
+        )
 
 
 @receiver(pre_save, sender=Recipe)
-def recipe_cover_update(sender, instance, raw, *args, **kwargs):
-    if (instance.pk):
-        old_instance = Recipe.objects.filter(pk=instance.pk).first()
+def recipe_pages_collect(sender, instance, *args, **kwargs):
+    instance._old_category_id = None
+
+    if instance.is_tracked('category'):
+        instance._old_category_id = instance.get_loaded_value('category')
+    elif instance.pk:
+        instance._old_category_id = Recipe.objects.filter(pk=instance.pk)\
+            .values_list('category_id', flat=True)\
+            .first()
 
-        if old_instance.cover != instance.cover:
-            delete_cover(old_instance)
+
+@receiver(post_save, sender=Recipe)
+def recipe_pages_invalidate(sender, instance, *args, **kwargs):
+    invalidate_recipe_pages(
+        [instance.pk],
+        category_ids=[getattr(instance, '_old_category_id', None)],
+    )
+
+
+@receiver(pre_delete, sender=Recipe)
+def recipe_delete_pages_invalidate(sender, instance, *args, **kwargs):
+    invalidate_recipe_pages([instance.pk])
@@ -1,8 +1,12 @@
 from unittest.mock import patch
 
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import test
 
+from recipes.serializers import RecipeSerializer
 from recipes.tests.test_recipe_base import RecipeMixin
 
 
@@ -45,6 +49,10 @@ class RecipeAPIv2TestMixin(RecipeMixin):
 
 
 class RecipeAPIv2Test(test.APITestCase, RecipeAPIv2TestMixin):
+    def setUp(self):
+        cache.clear()
+        return super().setUp()
+
     def test_recipe_api_list_returns_status_code_200(self):
         api_url = reverse('recipes:recipe-api-list')
         response = self.client.get(api_url)
@@ -54,7 +62,7 @@ class RecipeAPIv2Test(test.APITestCase, RecipeAPIv2TestMixin):
             200
         )
 
-    @patch('recipes.views.api.RecipeApiV2Pagination.page_size', new=7)
+    @patch('recipes.views.api.RecipeApiV2CursorPagination.page_size', new=7)
     def test_recipe_api_list_loads_correct_number_of_recipes(self):
         wanted_number_of_recipes = 7
         self.make_recipe_in_batch(qty=wanted_number_of_recipes)
@@ -80,7 +88,7 @@ class RecipeAPIv2Test(test.APITestCase, RecipeAPIv2TestMixin):
             1
         )
 
-    @patch('recipes.views.api.RecipeApiV2Pagination.page_size', new=10)
+    @patch('recipes.views.api.RecipeApiV2CursorPagination.page_size', new=10)
     def test_recipe_api_list_can_load_recipes_by_category_id(self):
         category_wanted = self.make_category(name="WANTED_CATEGORY")
         category_not_wanted = self.make_category(name="NOT_WANTED_CATEGORY")
@@ -102,6 +110,108 @@ class RecipeAPIv2Test(test.APITestCase, RecipeAPIv2TestMixin):
             5
         )
 
+    @patch('recipes.views.api.RecipeApiV2CursorPagination.page_size', new=2)
+    def test_recipe_api_list_cursor_is_stable_when_recipes_are_inserted(self):
+        recipes = self.make_recipe_in_batch(qty=4)
+        api_url = reverse('recipes:recipe-api-list')
+
+        first_page = self.client.get(api_url).data
+        self.make_recipe(slug='new', author_data={'username': 'new'})
+        second_page = self.client.get(first_page.get('next')).data
+
+        self.assertNotIn('count', first_page)
+        self.assertEqual(
+            [recipes[1].id, recipes[0].id],
+            [recipe['id'] for recipe in second_page.get('results')]
+        )
+        self.assertIsNone(second_page.get('next'))
+
+    def test_recipe_api_list_page_size_is_bounded_and_count_is_opt_in(self):
+        self.make_recipe_in_batch(qty=3)
+        api_url = reverse('recipes:recipe-api-list')
+
+        with patch(
+            'recipes.views.api.RecipeApiV2CursorPagination.max_page_size',
+            new=2
+        ):
+            response = self.client.get(api_url + '?page_size=50&count=1')
+
+        self.assertEqual(len(response.data.get('results')), 2)
+        self.assertEqual(response.data.get('count'), 3)
+
+    def test_recipe_api_list_cursor_keeps_category_id_filter(self):
+        category = self.make_category(name='WANTED_CATEGORY')
+        for recipe in self.make_recipe_in_batch(qty=4)[:3]:
+            recipe.category = category
+            recipe.save()
+
+        api_url = reverse('recipes:recipe-api-list') + \
+            f'?category_id={category.id}&page_size=2'
+        first_page = self.client.get(api_url).data
+        second_page = self.client.get(first_page.get('next')).data
+
+        self.assertIn(f'category_id={category.id}', first_page.get('next'))
+        self.assertEqual(len(second_page.get('results')), 1)
+
+    def test_recipe_api_list_numbered_pages_are_still_served(self):
+        self.make_recipe_in_batch(qty=2)
+
+        response = self.client.get(
+            reverse('recipes:recipe-api-list') + '?page=1'
+        )
+
+        self.assertEqual(response.data.get('count'), 2)
+
+    def test_recipe_api_list_sparse_fields_trim_output_and_sql(self):
+        self.make_recipe_in_batch(qty=2)
+        api_url = reverse('recipes:recipe-api-list') + '?fields=id,title'
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(api_url)
+
+        sql = ' '.join(query['sql'] for query in queries.captured_queries)
+        self.assertEqual(
+            set(response.data.get('results')[0]), {'id', 'title'}
+        )
+        self.assertNotIn('"tag_tag"', sql)
+        self.assertNotIn('"preparation_step"', sql)
+        self.assertNotIn('"auth_user"', sql)
+
+    def test_recipe_api_list_omit_removes_fields(self):
+        self.make_recipe()
+
+        response = self.client.get(
+            reverse('recipes:recipe-api-list') +
+            '?omit=preparation_step,tag_links'
+        )
+        recipe = response.data.get('results')[0]
+
+        self.assertNotIn('preparation_step', recipe)
+        self.assertNotIn('tag_links', recipe)
+        self.assertIn('tag_objects', recipe)
+
+    def test_recipe_api_sparse_fields_reject_unknown_names(self):
+        recipe = self.make_recipe()
+
+        response = self.client.get(
+            reverse('recipes:recipe-api-detail', args=(recipe.id,)) +
+            '?fields=id,secret'
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_recipe_api_detail_etag_follows_sparse_fields(self):
+        recipe = self.make_recipe()
+        api_url = reverse('recipes:recipe-api-detail', args=(recipe.id,))
+        etag = self.client.get(api_url)['ETag']
+
+        response = self.client.get(
+            api_url + '?fields=title', HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'title': recipe.title})
+
     def test_recipe_api_list_user_must_send_jwt_token_to_create_recipe(self):
         api_url = reverse('recipes:recipe-api-list')
         response = self.client.post(api_url)
@@ -125,6 +235,39 @@ class RecipeAPIv2Test(test.APITestCase, RecipeAPIv2TestMixin):
             201
         )
 
+    def test_recipe_api_rejects_a_taken_title_ignoring_case(self):
+        self.make_recipe()
+        auth_data = self.get_auth_data()
+        response = self.client.post(
+            reverse('recipes:recipe-api-list'),
+            data={**self.get_recipe_raw_data(), 'title': 'RECIPE TITLE'},
+            HTTP_AUTHORIZATION=f'Bearer {auth_data.get('jwt_access_token')}'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data['title'], ['Found recipes with this title']
+        )
+
+    def test_recipe_api_answers_400_when_losing_a_title_race(self):
+        self.make_recipe()
+        auth_data = self.get_auth_data()
+
+        # The other recipe is saved between validation and save
+        with patch.object(
+            RecipeSerializer, 'validate_title', lambda self, title: title
+        ):
+            response = self.client.post(
+                reverse('recipes:recipe-api-list'),
+                data={**self.get_recipe_raw_data(), 'title': 'Recipe title'},
+                HTTP_AUTHORIZATION=(
+                    f'Bearer {auth_data.get('jwt_access_token')}'
+                )
+            )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('title', response.data)
+
     def test_recipe_api_list_logged_user_can_update_a_recipe(self):
         # Arrange (config test)
         recipe = self.make_recipe()
@@ -172,3 +315,72 @@ class RecipeAPIv2Test(test.APITestCase, RecipeAPIv2TestMixin):
             response.status_code,
             403
         )
+
+
+class RecipeAPIv2MultiGetTest(test.APITestCase, RecipeAPIv2TestMixin):
+    def setUp(self):
+        cache.clear()
+        self.recipes = self.make_recipe_in_batch(qty=3)
+        return super().setUp()
+
+    def get_recipes(self, ids, **kwargs):
+        return self.client.get(
+            reverse('recipes:recipe-api-list') + f'?ids={ids}', **kwargs
+        )
+
+    def test_multi_get_keeps_the_requested_order(self):
+        ids = [self.recipes[2].pk, self.recipes[0].pk, self.recipes[1].pk]
+
+        response = self.get_recipes(','.join(map(str, ids)))
+
+        self.assertEqual(
+            [recipe['id'] for recipe in response.data['results']], ids
+        )
+        self.assertEqual(response.data['missing'], [])
+
+    def test_multi_get_reports_missing_and_unpublished_ids(self):
+        unpublished = self.recipes[1]
+        unpublished.is_published = False
+        unpublished.save()
+
+        response = self.get_recipes(
+            f'{self.recipes[0].pk},{unpublished.pk},999'
+        )
+
+        self.assertEqual(
+            [recipe['id'] for recipe in response.data['results']],
+            [self.recipes[0].pk],
+        )
+        self.assertEqual(response.data['missing'], [unpublished.pk, 999])
+
+    def test_multi_get_reads_recipes_and_tags_once(self):
+        ids = ','.join(str(recipe.pk) for recipe in self.recipes)
+
+        with self.assertNumQueries(2):
+            self.get_recipes(ids)
+
+    def test_multi_get_answers_304_while_the_recipes_are_unchanged(self):
+        ids = ','.join(str(recipe.pk) for recipe in self.recipes)
+        etag = self.get_recipes(ids)['ETag']
+
+        response = self.get_recipes(ids, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+        self.recipes[0].title = 'Changed'
+        self.recipes[0].save()
+        response = self.get_recipes(ids, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_multi_get_rejects_invalid_or_too_many_ids(self):
+        self.assertEqual(self.get_recipes('1,abc').status_code, 400)
+        self.assertEqual(self.get_recipes('%C2%B2').status_code, 400)
+        self.assertEqual(self.get_recipes(str(2 ** 63)).status_code, 400)
+
+        with patch(
+            'recipes.views.api.RecipeApiV2ViewSet.multi_get_max_ids', new=2
+        ):
+            response = self.get_recipes('1,2,3')
+
+        self.assertEqual(response.status_code, 400)
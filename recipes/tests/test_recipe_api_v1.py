@@ -0,0 +1,69 @@
+import json
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from recipes.views.site import API_V1_FIELDS
+
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipeListApiV1Test(RecipeTestBase):
+    def get_recipes(self, query=''):
+        response = self.client.get(reverse('recipes:home_api_v1') + query)
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content)
+        return response, json.loads(content)['recipes']
+
+    def test_recipe_list_api_v1_streams_the_current_page(self):
+        self.make_recipe_in_batch(qty=3)
+
+        response, recipes = self.get_recipes()
+
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(
+            [recipe['title'] for recipe in recipes],
+            ['Recipe Title 2', 'Recipe Title 1', 'Recipe Title 0'],
+        )
+        self.assertIn('created_at', recipes[0])
+
+    def test_recipe_list_api_v1_keeps_its_fields(self):
+        self.make_recipe()
+
+        _, recipes = self.get_recipes()
+
+        self.assertEqual(set(recipes[0]), set(API_V1_FIELDS))
+        self.assertNotIn('cover_variants', recipes[0])
+        self.assertNotIn('author_name', recipes[0])
+
+    def test_recipe_list_api_v1_reads_the_recipes_once(self):
+        self.make_recipe_in_batch(qty=3)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.get_recipes()
+
+        recipe_reads = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT "recipes_recipe"."id"')
+        ]
+        self.assertEqual(len(recipe_reads), 1)
+
+    def test_recipe_list_api_v1_per_page_is_bounded(self):
+        self.make_recipe_in_batch(qty=5)
+
+        _, recipes = self.get_recipes('?per_page=4')
+        self.assertEqual(len(recipes), 4)
+
+        with patch('recipes.views.site.API_V1_MAX_PER_PAGE', new=2):
+            _, recipes = self.get_recipes('?per_page=4')
+        self.assertEqual(len(recipes), 2)
+
+        _, recipes = self.get_recipes('?per_page=4&page=2')
+        self.assertEqual(len(recipes), 1)
+
+    def test_recipe_list_api_v1_with_no_recipes_is_an_empty_list(self):
+        _, recipes = self.get_recipes()
+
+        self.assertEqual(recipes, [])
@@ -0,0 +1,143 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404
+from django.test import AsyncRequestFactory, override_settings
+
+from recipes import views
+from recipes.urls import site_view
+from tag.models import Tag
+
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipeAsyncViewsTest(RecipeTestBase):
+    def setUp(self):
+        super().setUp()
+        self.recipes = self.make_recipe_in_batch(qty=2)
+        self.unpublished = self.make_recipe(
+            title='Unpublished',
+            slug='unpublished',
+            is_published=False,
+            author_data={'username': 'unpublished'},
+        )
+        self.tag = Tag.objects.create(name='Tasty', slug='tasty')
+        self.recipes[0].tags.add(self.tag)
+
+    async def get(self, view_class, path='/', data=None, headers=None,
+                  **kwargs):
+        request = AsyncRequestFactory().get(path, data, headers=headers)
+        request.user = AnonymousUser()
+
+        async def auser():
+            return request.user
+
+        request.auser = auser
+        response = await view_class.as_view()(request, **kwargs)
+
+        if hasattr(response, 'render'):
+            # As the ASGI handler does, outside of the event loop
+            await sync_to_async(response.render)()
+
+        return response
+
+    def test_site_view_picks_the_async_views(self):
+        with override_settings(ASYNC_VIEWS=True):
+            view = site_view(views.RecipeDetail)
+
+        self.assertIs(view.view_class, views.RecipeDetailAsync)
+        self.assertIs(
+            site_view(views.RecipeDetail).view_class, views.RecipeDetail
+        )
+
+    async def test_home_lists_the_published_recipes(self):
+        response = await self.get(views.RecipeListViewHomeAsync)
+        content = response.content.decode('utf-8')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Recipe Title 1', content)
+        self.assertNotIn('Unpublished', content)
+
+    async def test_home_paginates_with_cursors(self):
+        response = await self.get(
+            views.RecipeListViewHomeAsync, data={'cursor': ''}
+        )
+
+        pagination_range = response.context_data['pagination_range']
+
+        self.assertTrue(pagination_range['cursor_mode'])
+        self.assertEqual(len(response.context_data['recipes']), 2)
+
+    async def test_category_returns_404_without_recipes(self):
+        response = await self.get(
+            views.RecipeListViewCategoryAsync,
+            category_id=self.recipes[0].category_id,
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertRaises(Http404):
+            await self.get(
+                views.RecipeListViewCategoryAsync, category_id=1000
+            )
+
+    async def test_tag_page_is_titled_after_the_tag(self):
+        response = await self.get(views.RecipeListViewTagAsync, slug='tasty')
+
+        self.assertIn('Tasty - Tag', response.content.decode('utf-8'))
+        self.assertEqual(len(response.context_data['recipes']), 1)
+
+    async def test_search_finds_recipes(self):
+        response = await self.get(
+            views.RecipeListViewSearchAsync, data={'q': 'Title 1'}
+        )
+
+        self.assertEqual(
+            [recipe.title for recipe in response.context_data['recipes']],
+            ['Recipe Title 1'],
+        )
+
+    async def test_detail_shows_published_recipes_only(self):
+        response = await self.get(
+            views.RecipeDetailAsync, pk=self.recipes[0].pk
+        )
+
+        self.assertIn('Recipe Title 0', response.content.decode('utf-8'))
+
+        with self.assertRaises(Http404):
+            await self.get(views.RecipeDetailAsync, pk=self.unpublished.pk)
+
+    async def test_detail_answers_304_to_a_matching_etag(self):
+        response = await self.get(
+            views.RecipeDetailAsync, pk=self.recipes[0].pk
+        )
+
+        response = await self.get(
+            views.RecipeDetailAsync,
+            headers={'If-None-Match': response['ETag']},
+            pk=self.recipes[0].pk,
+        )
+
+        self.assertEqual(response.status_code, 304)
+
+    async def test_api_v1_streams_the_recipes(self):
+        response = await self.get(views.RecipeListViewHomeApiAsync)
+        content = b''.join([
+            chunk async for chunk in response.streaming_content
+        ])
+
+        self.assertEqual(
+            [recipe['title'] for recipe in json.loads(content)['recipes']],
+            ['Recipe Title 1', 'Recipe Title 0'],
+        )
+        self.assertIn('ETag', response)
+
+    async def test_api_v1_detail_returns_the_recipe(self):
+        response = await self.get(
+            views.RecipeDetailAPIAsync, pk=self.recipes[1].pk
+        )
+        recipe = json.loads(response.content)
+
+        self.assertEqual(recipe['title'], 'Recipe Title 1')
+        self.assertEqual(recipe['tags'], [])
@@ -0,0 +1,115 @@
+from importlib import import_module
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from recipes.models import Recipe
+
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipeAuthorFieldsTest(RecipeTestBase):
+    def test_new_recipe_copies_the_author_fields(self):
+        recipe = self.make_recipe(
+            author_data={'first_name': 'Jane', 'last_name': 'Roe'}
+        )
+
+        self.assertEqual(recipe.author_name, 'Jane Roe')
+        self.assertEqual(
+            recipe.author_profile_id, recipe.author.profile.pk
+        )
+
+    def test_author_without_name_is_shown_by_username(self):
+        recipe = self.make_recipe(
+            author_data={'first_name': '', 'last_name': ''}
+        )
+
+        self.assertEqual(recipe.author_name, 'johndoe')
+
+    def test_author_rename_updates_their_recipes(self):
+        recipe = self.make_recipe()
+
+        recipe.author.first_name = 'Renamed'
+        recipe.author.save()
+        recipe.refresh_from_db()
+
+        self.assertEqual(recipe.author_name, 'Renamed Doe')
+
+    def test_changing_the_author_updates_the_fields(self):
+        recipe = self.make_recipe()
+        author = self.make_author(first_name='Other', username='other')
+
+        recipe.author = author
+        recipe.save(update_fields=['author'])
+        recipe.refresh_from_db()
+
+        self.assertEqual(recipe.author_name, 'Other Doe')
+        self.assertEqual(recipe.author_profile_id, author.profile.pk)
+
+    def test_deleting_the_author_clears_the_fields(self):
+        recipe = self.make_recipe()
+
+        recipe.author.delete()
+        recipe.refresh_from_db()
+
+        self.assertEqual(recipe.author_name, '')
+        self.assertIsNone(recipe.author_profile_id)
+
+    def test_backfill_command_fills_the_fields(self):
+        recipe = self.make_recipe()
+        Recipe.objects.update(author_name='', author_profile=None)
+
+        call_command('backfill_author_fields', stdout=StringIO())
+        recipe.refresh_from_db()
+
+        self.assertEqual(recipe.author_name, 'Jon Doe')
+        self.assertEqual(recipe.author_profile_id, recipe.author.profile.pk)
+
+    def test_backfill_command_bumps_updated_at(self):
+        recipe = self.make_recipe()
+        Recipe.objects.update(author_name='')
+        updated_at = Recipe.objects.get(pk=recipe.pk).updated_at
+
+        call_command('backfill_author_fields', stdout=StringIO())
+        recipe.refresh_from_db()
+
+        self.assertGreater(recipe.updated_at, updated_at)
+
+    def test_backfill_command_skips_recipes_in_sync(self):
+        self.make_recipe()
+        stdout = StringIO()
+
+        call_command('backfill_author_fields', stdout=stdout)
+
+        self.assertIn('0 recipes updated', stdout.getvalue())
+
+    def test_migration_fills_the_fields(self):
+        migration = import_module(
+            'recipes.migrations.0009_recipe_author_fields'
+        )
+        recipe = self.make_recipe()
+        Recipe.objects.update(author_name='', author_profile=None)
+        updated_at = Recipe.objects.get(pk=recipe.pk).updated_at
+
+        migration.backfill_author_fields(apps, None)
+        recipe.refresh_from_db()
+
+        self.assertEqual(recipe.author_name, 'Jon Doe')
+        self.assertEqual(recipe.author_profile_id, recipe.author.profile.pk)
+        self.assertGreater(recipe.updated_at, updated_at)
+
+    def test_home_does_not_query_the_authors(self):
+        self.make_recipe_in_batch(qty=3)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('recipes:home'))
+
+        sql = ' '.join(query['sql'] for query in queries)
+
+        self.assertIn('Jon Doe', response.content.decode())
+        self.assertNotIn('auth_user', sql)
+        self.assertNotIn('authors_profile', sql)
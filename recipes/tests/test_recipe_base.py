@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase
 
 from recipes.models import Category, Recipe, User
@@ -78,6 +79,7 @@ class RecipeMixin:
 
 class RecipeTestBase(TestCase, RecipeMixin):
     def setUp(self):
+        cache.clear()
         return super().setUp()
 
     def tearDown(self):
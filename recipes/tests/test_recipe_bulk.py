@@ -0,0 +1,157 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import test
+
+from recipes.models import Recipe
+from recipes.search import get_search_backend
+from tag.models import Tag
+
+from .test_recipe_api import RecipeAPIv2TestMixin
+
+
+class RecipeBulkAPITest(test.APITestCase, RecipeAPIv2TestMixin):
+    def setUp(self):
+        cache.clear()
+        self.auth_data = self.get_auth_data()
+        return super().setUp()
+
+    def post_bulk(self, items):
+        return self.client.post(
+            reverse('recipes:recipe-api-bulk'),
+            data=items,
+            format='json',
+            HTTP_AUTHORIZATION=f'Bearer {self.auth_data["jwt_access_token"]}',
+        )
+
+    def make_item(self, title, tags=()):
+        return {
+            **self.get_recipe_raw_data(),
+            'title': title,
+            'tag_links': [
+                'http://testserver' +
+                reverse('recipes:recipes_api_v2_tag', args=(tag.pk,))
+                for tag in tags
+            ],
+        }
+
+    def test_bulk_needs_an_authenticated_user(self):
+        response = self.client.post(
+            reverse('recipes:recipe-api-bulk'), data=[], format='json'
+        )
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_bulk_creates_recipes_with_tags_in_few_queries(self):
+        tags = [Tag.objects.create(name=f'Tag {i}') for i in range(3)]
+        items = [
+            self.make_item(f'Bulk recipe {i}', tags) for i in range(5)
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post_bulk(items)
+
+        tag_queries = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT') and
+            'FROM "tag_tag"' in query['sql']
+        ]
+        self.assertEqual(response.status_code, 201)
+        # Link lookup, search index rows and the response prefetch
+        self.assertEqual(len(tag_queries), 3)
+        self.assertEqual(Recipe.objects.count(), 5)
+
+        recipe = Recipe.objects.get(pk=response.data['results'][0]['id'])
+        self.assertEqual(recipe.author, self.auth_data['user'])
+        self.assertEqual(recipe.slug, 'bulk-recipe-0')
+        self.assertEqual(recipe.tags.count(), 3)
+        self.assertEqual(
+            list(get_search_backend().search(Recipe.objects.all(), 'tag')),
+            list(Recipe.objects.order_by('-id')),
+        )
+
+    def test_bulk_updates_owned_recipes(self):
+        recipe = self.make_recipe()
+        recipe.author = self.auth_data['user']
+        recipe.save()
+        recipe.tags.add(Tag.objects.create(name='Old'))
+        new_tag = Tag.objects.create(name='New')
+
+        response = self.post_bulk([{
+            'id': recipe.pk,
+            'title': 'Updated in bulk',
+            'tag_links': self.make_item('x', [new_tag])['tag_links'],
+        }])
+
+        recipe.refresh_from_db()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(recipe.title, 'Updated in bulk')
+        self.assertEqual(list(recipe.tags.all()), [new_tag])
+
+    def test_bulk_reports_errors_per_item_and_writes_nothing(self):
+        other = self.make_recipe(author_data={'username': 'other'})
+        items = [
+            self.make_item('Valid recipe'),
+            {**self.make_item('Bad tag'), 'tag_links': [
+                'http://testserver' +
+                reverse('recipes:recipes_api_v2_tag', args=(999,))
+            ]},
+            {'id': other.pk, 'title': 'Not mine'},
+            self.make_item('Valid recipe'),
+        ]
+
+        response = self.post_bulk(items)
+        errors = response.data['errors']
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(errors[0], {})
+        self.assertIn('tag_links', errors[1])
+        self.assertIn('id', errors[2])
+        self.assertIn('title', errors[3])
+        self.assertEqual(Recipe.objects.count(), 1)
+
+    def test_bulk_rejects_titles_taken_or_repeated_ignoring_case(self):
+        self.make_recipe()
+
+        response = self.post_bulk([
+            self.make_item('RECIPE TITLE'),
+            self.make_item('Bulk soup'),
+            self.make_item('BULK SOUP'),
+        ])
+        errors = response.data['errors']
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(errors[0]['title'], ['Found recipes with this title'])
+        self.assertEqual(errors[1], {})
+        self.assertEqual(errors[2]['title'], ['Repeated title in this batch.'])
+
+    def test_bulk_compares_titles_like_the_database(self):
+        response = self.post_bulk([
+            self.make_item('Água'),
+            self.make_item('ÁGUA'),
+        ])
+        lowered = Recipe.objects.lower_titles(['Água', 'ÁGUA'])
+
+        # SQLite only folds ASCII, PostgreSQL folds both to the same title
+        if lowered[0] == lowered[1]:
+            self.assertEqual(response.status_code, 400)
+        else:
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(Recipe.objects.count(), 2)
+
+    def test_bulk_answers_400_to_other_conflicts_of_a_concurrent_write(self):
+        with patch(
+            'recipes.views.api.write_recipe_batch', side_effect=IntegrityError
+        ):
+            response = self.post_bulk([self.make_item('Bulk soup')])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('non_field_errors', response.data)
+
+    def test_bulk_rejects_too_many_items(self):
+        response = self.post_bulk([{}] * 101)
+
+        self.assertEqual(response.status_code, 400)
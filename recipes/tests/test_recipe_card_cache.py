@@ -0,0 +1,78 @@
+from django.urls import reverse
+
+from recipes.models import Recipe
+from tag.models import Tag
+
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipeCardCacheTest(RecipeTestBase):
+    def get_home_content(self):
+        return self.client.get(reverse('recipes:home')).content.decode()
+
+    def test_recipe_card_is_served_from_cache(self):
+        recipe = self.make_recipe(title='Cached title')
+        self.get_home_content()
+
+        # update() keeps updated_at, so the cached card is still valid
+        Recipe.objects.filter(pk=recipe.pk).update(title='Changed title')
+
+        self.assertIn('Cached title', self.get_home_content())
+
+    def test_saving_the_recipe_invalidates_its_card(self):
+        recipe = self.make_recipe(title='Cached title')
+        self.get_home_content()
+
+        recipe.title = 'Changed title'
+        recipe.save()
+
+        self.assertIn('Changed title', self.get_home_content())
+
+    def test_list_and_detail_cards_are_cached_separately(self):
+        recipe = self.make_recipe(preparation_step='Only on detail page')
+        self.get_home_content()
+
+        response = self.client.get(
+            reverse('recipes:recipe', kwargs={'pk': recipe.pk})
+        )
+
+        self.assertIn('Only on detail page', response.content.decode())
+
+    def test_author_name_change_invalidates_card(self):
+        recipe = self.make_recipe(author_data={'first_name': 'Jon'})
+        self.get_home_content()
+
+        recipe.author.first_name = 'Renamed'
+        recipe.author.save()
+
+        self.assertIn('Renamed', self.get_home_content())
+
+    def test_author_last_login_update_does_not_touch_recipes(self):
+        recipe = self.make_recipe()
+        updated_at = recipe.updated_at
+
+        self.client.login(username='johndoe', password='johndoe#123')
+        recipe.refresh_from_db()
+
+        self.assertEqual(updated_at, recipe.updated_at)
+
+    def test_category_rename_invalidates_card(self):
+        recipe = self.make_recipe(category_data={'name': 'Soups'})
+        self.get_home_content()
+
+        recipe.category.name = 'Stews'
+        recipe.category.save()
+
+        self.assertIn('Stews', self.get_home_content())
+
+    def test_tag_rename_invalidates_detail_card(self):
+        recipe = self.make_recipe()
+        recipe.tags.add(Tag.objects.create(name='Spicy'))
+        detail_url = reverse('recipes:recipe', kwargs={'pk': recipe.pk})
+        self.client.get(detail_url)
+
+        tag = recipe.tags.first()
+        tag.name = 'Mild'
+        tag.save()
+
+        self.assertIn('Mild', self.client.get(detail_url).content.decode())
@@ -0,0 +1,173 @@
+from base64 import urlsafe_b64encode
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connections
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import test
+
+from recipes.changes import decode_change_token, encode_change_token
+from recipes.models import Recipe, RecipeTombstone
+from recipes.tests.test_recipe_base import RecipeMixin
+
+
+@override_settings(RECIPE_CHANGES_SETTLE_SECONDS=0)
+class RecipeChangesAPITest(test.APITestCase, RecipeMixin):
+    def setUp(self):
+        cache.clear()
+        self.recipes = self.make_recipe_in_batch(qty=3)
+        return super().setUp()
+
+    def get_changes(self, since=None, **params):
+        if since is not None:
+            params['since'] = since
+
+        return self.client.get(
+            reverse('recipes:recipe-api-changes'), data=params
+        )
+
+    def sync(self):
+        return self.get_changes().data['next']
+
+    def summarize(self, response):
+        return [
+            (change['id'], change['change'])
+            for change in response.data['results']
+        ]
+
+    def test_first_sync_sends_every_published_recipe(self):
+        draft = self.make_recipe(
+            slug='draft', is_published=False, author_data={'username': 'd'}
+        )
+
+        response = self.get_changes()
+
+        self.assertEqual(
+            self.summarize(response),
+            [(recipe.pk, 'upsert') for recipe in self.recipes],
+        )
+        self.assertNotIn(
+            draft.pk, [change['id'] for change in response.data['results']]
+        )
+        self.assertEqual(
+            response.data['results'][0]['recipe']['title'], 'Recipe Title 0'
+        )
+        self.assertFalse(response.data['has_more'])
+
+    def test_changes_are_paged_by_token(self):
+        response = self.get_changes(page_size=2)
+
+        self.assertTrue(response.data['has_more'])
+        self.assertEqual(len(response.data['results']), 2)
+
+        response = self.get_changes(response.data['next'], page_size=2)
+
+        self.assertEqual(
+            self.summarize(response), [(self.recipes[2].pk, 'upsert')]
+        )
+        self.assertFalse(response.data['has_more'])
+
+    def test_sync_only_sends_what_changed_since_the_token(self):
+        token = self.sync()
+        recipe = self.recipes[1]
+        recipe.title = 'Changed title'
+        recipe.save()
+
+        response = self.get_changes(token)
+
+        self.assertEqual(self.summarize(response), [(recipe.pk, 'upsert')])
+        self.assertEqual(
+            self.summarize(self.get_changes(response.data['next'])), []
+        )
+
+    def test_unpublished_and_deleted_recipes_are_sent_as_deletes(self):
+        token = self.sync()
+        unpublished, deleted = self.recipes[0], self.recipes[1]
+        deleted_pk = deleted.pk
+        unpublished.is_published = False
+        unpublished.save()
+        deleted.delete()
+
+        response = self.get_changes(token)
+
+        self.assertEqual(
+            [(c['id'], c['change'], c.get('reason'))
+             for c in response.data['results']],
+            [
+                (unpublished.pk, 'delete', RecipeTombstone.UNPUBLISHED),
+                (deleted_pk, 'delete', RecipeTombstone.DELETED),
+            ],
+        )
+
+    def test_queryset_deletes_write_tombstones(self):
+        token = self.sync()
+        pks = [recipe.pk for recipe in self.recipes[:2]]
+
+        Recipe.objects.filter(pk__in=pks).delete()
+
+        response = self.get_changes(token)
+
+        self.assertEqual(
+            sorted(self.summarize(response)), [(pk, 'delete') for pk in pks]
+        )
+
+    def test_republished_recipes_lose_their_tombstone(self):
+        recipe = self.recipes[0]
+        recipe.is_published = False
+        recipe.save()
+        token = self.sync()
+
+        recipe.is_published = True
+        recipe.save()
+
+        self.assertFalse(
+            RecipeTombstone.objects.filter(recipe_id=recipe.pk).exists()
+        )
+        self.assertEqual(
+            self.summarize(self.get_changes(token)), [(recipe.pk, 'upsert')]
+        )
+
+    def test_drafts_do_not_write_tombstones(self):
+        draft = self.make_recipe(
+            slug='draft', is_published=False, author_data={'username': 'd'}
+        )
+        draft.title = 'Still a draft'
+        draft.save()
+        draft.delete()
+
+        self.assertFalse(RecipeTombstone.objects.exists())
+
+    def test_sync_reads_recipes_tags_and_tombstones_once(self):
+        token = encode_change_token(self.recipes[0].updated_at, 0)
+
+        with self.assertNumQueries(3):
+            self.get_changes(token)
+
+    def test_invalid_token_is_rejected(self):
+        self.assertEqual(self.get_changes('not-a-token').status_code, 400)
+        self.assertEqual(self.get_changes(page_size=0).status_code, 400)
+        self.assertEqual(self.get_changes(page_size='²').status_code, 400)
+
+    def test_out_of_range_token_is_rejected(self):
+        huge = urlsafe_b64encode(b'99999999999999999999:1').decode()
+        negative = urlsafe_b64encode(b'0:-1').decode()
+
+        self.assertEqual(self.get_changes(huge).status_code, 400)
+        self.assertEqual(self.get_changes(negative).status_code, 400)
+
+    @override_settings(RECIPE_CHANGES_SETTLE_SECONDS=60)
+    def test_changes_wait_for_the_settle_window(self):
+        response = self.get_changes()
+
+        self.assertEqual(self.summarize(response), [])
+        self.assertIsNotNone(decode_change_token(response.data['next']))
+
+    @override_settings(DATABASE_REPLICAS=['replica'])
+    def test_changes_are_read_from_the_primary(self):
+        # 'replica' is not a configured database, reading it would raise.
+        # The test transaction would keep the reads on the primary anyway
+        with patch.object(connections['default'], 'in_atomic_block', False):
+            response = self.get_changes()
+
+        self.assertEqual(len(response.data['results']), 3)
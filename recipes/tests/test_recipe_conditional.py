@@ -0,0 +1,146 @@
+from django.core.cache import cache
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import test
+
+from recipes.conditional import get_list_validators
+from recipes.models import Recipe, RecipeTombstone
+
+from .test_recipe_base import RecipeMixin, RecipeTestBase
+
+
+class RecipeConditionalViewTest(RecipeTestBase):
+    def test_recipe_detail_answers_not_modified_for_matching_etag(self):
+        recipe = self.make_recipe()
+        url = reverse('recipes:recipe', kwargs={'pk': recipe.pk})
+
+        response = self.client.get(url)
+        etag = response['ETag']
+        not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+
+    def test_recipe_detail_etag_changes_when_recipe_is_saved(self):
+        recipe = self.make_recipe()
+        url = reverse('recipes:recipe', kwargs={'pk': recipe.pk})
+        etag = self.client.get(url)['ETag']
+
+        recipe.title = 'A new title'
+        recipe.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_recipe_detail_api_answers_if_modified_since(self):
+        recipe = self.make_recipe()
+        url = reverse(
+            'recipes:recipes_api_v1_detail', kwargs={'pk': recipe.pk}
+        )
+
+        response = self.client.get(
+            url,
+            HTTP_IF_MODIFIED_SINCE=http_date(recipe.updated_at.timestamp()),
+        )
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_recipe_detail_api_reports_updated_at(self):
+        recipe = self.make_recipe()
+        url = reverse(
+            'recipes:recipes_api_v1_detail', kwargs={'pk': recipe.pk}
+        )
+
+        response = self.client.get(url)
+
+        self.assertEqual(
+            response.json()['updated_at'], str(recipe.updated_at)
+        )
+
+    def test_recipe_list_api_v1_etag_follows_new_recipes(self):
+        self.make_recipe()
+        url = reverse('recipes:home_api_v1')
+        etag = self.client.get(url)['ETag']
+
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
+
+        self.make_recipe(
+            title='Other', slug='other', author_data={'username': 'other'}
+        )
+
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200
+        )
+
+    def test_recipe_list_validators_change_when_an_older_recipe_goes(self):
+        older = self.make_recipe()
+        self.make_recipe(
+            title='Newer', slug='newer', author_data={'username': 'newer'}
+        )
+        url = reverse('recipes:home_api_v1')
+        response = self.client.get(url)
+
+        older.delete()
+
+        self.assertEqual(
+            self.client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag']
+            ).status_code,
+            200
+        )
+        _, last_modified = get_list_validators(
+            RequestFactory().get(url), Recipe.objects.all()
+        )
+        self.assertEqual(
+            last_modified, RecipeTombstone.objects.get().changed_at
+        )
+
+
+class RecipeConditionalAPIv2Test(test.APITestCase, RecipeMixin):
+    def setUp(self):
+        cache.clear()
+        return super().setUp()
+
+    def test_recipe_api_v2_retrieve_answers_not_modified(self):
+        recipe = self.make_recipe()
+        url = reverse('recipes:recipe-api-detail', args=(recipe.pk,))
+        etag = self.client.get(url)['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_recipe_api_v2_list_validators_depend_on_query(self):
+        self.make_recipe()
+        url = reverse('recipes:recipe-api-list')
+        response = self.client.get(url)
+
+        self.assertIn('Last-Modified', response)
+        self.assertEqual(
+            self.client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag']
+            ).status_code,
+            304
+        )
+        self.assertEqual(
+            self.client.get(
+                url + '?page_size=1', HTTP_IF_NONE_MATCH=response['ETag']
+            ).status_code,
+            200
+        )
+
+    def test_recipe_api_v2_list_etag_changes_on_unpublish(self):
+        recipe = self.make_recipe()
+        url = reverse('recipes:recipe-api-list')
+        etag = self.client.get(url)['ETag']
+
+        recipe.is_published = False
+        recipe.save()
+
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200
+        )
@@ -0,0 +1,235 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from recipes.covers import (VARIANT_FORMATS, drain_cover_jobs,
+                            get_variant_formats, run_cover_job)
+from recipes.models import CoverJob, Recipe
+
+from .test_recipe_base import RecipeTestBase
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_cover(width=1200, height=600, name='cover.jpg'):
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), 'orange').save(buffer, 'JPEG')
+    return SimpleUploadedFile(name, buffer.getvalue(), 'image/jpeg')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class RecipeCoverJobTest(RecipeTestBase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        return super().tearDownClass()
+
+    def make_recipe_with_cover(self, **kwargs):
+        recipe = self.make_recipe(**kwargs)
+        recipe.cover = make_cover()
+        recipe.save()
+        return recipe
+
+    def test_saving_a_cover_queues_a_job_instead_of_resizing(self):
+        recipe = self.make_recipe_with_cover()
+
+        self.assertEqual(recipe.cover_status, Recipe.COVER_PENDING)
+        self.assertEqual(
+            list(recipe.cover_jobs.values_list('status', flat=True)),
+            [CoverJob.PENDING]
+        )
+
+        with Image.open(recipe.cover.path) as image:
+            self.assertEqual(image.size, (1200, 600))
+
+    def test_drain_cover_jobs_resizes_and_marks_the_recipe_ready(self):
+        recipe = self.make_recipe_with_cover()
+
+        self.assertEqual(drain_cover_jobs(), 1)
+        recipe.refresh_from_db()
+
+        self.assertEqual(recipe.cover_status, Recipe.COVER_READY)
+        with Image.open(recipe.cover.path) as image:
+            self.assertEqual(image.size, (840, 420))
+
+    def test_saving_without_changing_the_cover_queues_nothing(self):
+        recipe = self.make_recipe_with_cover()
+        drain_cover_jobs()
+
+        recipe.refresh_from_db()
+        recipe.title = 'Another title'
+        recipe.save()
+
+        self.assertEqual(recipe.cover_status, Recipe.COVER_READY)
+        self.assertFalse(
+            recipe.cover_jobs.filter(status=CoverJob.PENDING).exists()
+        )
+
+    def test_job_for_a_replaced_cover_is_skipped(self):
+        recipe = self.make_recipe_with_cover()
+        first_job = recipe.cover_jobs.get()
+
+        recipe.cover = make_cover(name='other.jpg')
+        recipe.save()
+        drain_cover_jobs()
+
+        first_job.refresh_from_db()
+        recipe.refresh_from_db()
+        self.assertEqual(first_job.attempts, 0)
+        self.assertEqual(recipe.cover_status, Recipe.COVER_READY)
+
+    @override_settings(COVER_JOB_MAX_ATTEMPTS=2)
+    def test_failing_job_is_retried_then_marked_failed(self):
+        recipe = self.make_recipe_with_cover()
+
+        with patch.object(Recipe, 'resize_image', side_effect=OSError('bad')):
+            drain_cover_jobs()
+
+        job = recipe.cover_jobs.get()
+        recipe.refresh_from_db()
+        self.assertEqual(job.status, CoverJob.FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(job.error, 'bad')
+        self.assertEqual(recipe.cover_status, Recipe.COVER_FAILED)
+
+    @override_settings(COVER_JOB_MAX_ATTEMPTS=2, COVER_JOB_RETRY_DELAY=30)
+    def test_failed_job_is_resubmitted_to_the_workers_with_backoff(self):
+        recipe = self.make_recipe_with_cover()
+        job = recipe.cover_jobs.get()
+
+        # The second, last attempt is not retried
+        with (
+            patch.object(Recipe, 'resize_image', side_effect=OSError('bad')),
+            patch.object(connection, 'close'),
+            patch('recipes.covers.Timer') as timer,
+        ):
+            run_cover_job(job.pk)
+            run_cover_job(job.pk)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, CoverJob.FAILED)
+        self.assertEqual(
+            [call.args[0] for call in timer.call_args_list], [30]
+        )
+
+        with patch('recipes.covers.get_cover_executor') as executor:
+            timer.call_args_list[0].args[1]()
+
+        executor.return_value.submit.assert_called_once_with(
+            run_cover_job, job.pk, 'default'
+        )
+
+    def test_pending_cover_is_served_from_the_original_file(self):
+        recipe = self.make_recipe_with_cover()
+
+        response = self.client.get(recipe.get_absolute_url())
+
+        self.assertContains(response, recipe.cover.url)
+
+    def test_process_cover_jobs_command_requeues_running_jobs(self):
+        recipe = self.make_recipe_with_cover()
+        recipe.cover_jobs.update(
+            status=CoverJob.RUNNING,
+            updated_at=timezone.now() - timedelta(hours=1),
+        )
+
+        out = StringIO()
+        call_command('process_cover_jobs', '--requeue-running', stdout=out)
+
+        self.assertIn('1 running jobs requeued', out.getvalue())
+        self.assertIn('1 jobs processed', out.getvalue())
+        recipe.refresh_from_db()
+        self.assertEqual(recipe.cover_status, Recipe.COVER_READY)
+
+    def test_process_cover_jobs_command_leaves_live_jobs_running(self):
+        recipe = self.make_recipe_with_cover()
+        recipe.cover_jobs.update(
+            status=CoverJob.RUNNING, updated_at=timezone.now()
+        )
+
+        out = StringIO()
+        call_command('process_cover_jobs', '--requeue-running', stdout=out)
+
+        self.assertIn('0 running jobs requeued', out.getvalue())
+        self.assertEqual(
+            recipe.cover_jobs.get().status, CoverJob.RUNNING
+        )
+
+    @override_settings(COVER_VARIANT_WIDTHS=[320, 640])
+    def test_processed_cover_gets_variants_in_every_format(self):
+        recipe = self.make_recipe_with_cover()
+        drain_cover_jobs()
+        recipe.refresh_from_db()
+
+        variants = recipe.cover_variants
+        self.assertEqual((variants['width'], variants['height']), (840, 420))
+        self.assertEqual(len(variants['sources']), len(get_variant_formats()))
+
+        for source in variants['sources']:
+            self.assertEqual(
+                [width for width, _ in source['files']], [320, 640, 840]
+            )
+
+            for width, name in source['files']:
+                with Image.open(recipe.cover.storage.path(name)) as image:
+                    self.assertEqual(image.width, width)
+
+    def test_recipe_card_renders_srcset_and_dimensions(self):
+        recipe = self.make_recipe_with_cover()
+        drain_cover_jobs()
+        recipe.refresh_from_db()
+
+        response = self.client.get(reverse('recipes:home'))
+        content = response.content.decode('utf-8')
+
+        content_type, _, _ = VARIANT_FORMATS[get_variant_formats()[0]]
+
+        self.assertIn(f'<source type="{content_type}"', content)
+        self.assertIn('320w', content)
+        self.assertIn('width="840" height="420"', content)
+        self.assertIn('loading="lazy"', content)
+
+    def test_replacing_the_cover_deletes_its_variants(self):
+        recipe = self.make_recipe_with_cover()
+        drain_cover_jobs()
+        recipe.refresh_from_db()
+        old_files = [
+            recipe.cover.storage.path(name)
+            for source in recipe.cover_variants['sources']
+            for _, name in source['files']
+        ]
+
+        recipe.cover = make_cover(name='other.jpg')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe.save()
+            self.assertTrue(all(os.path.exists(path) for path in old_files))
+
+        self.assertEqual(recipe.cover_variants, {})
+        self.assertFalse(any(os.path.exists(path) for path in old_files))
+
+    def test_recipe_api_v2_exposes_variant_urls(self):
+        recipe = self.make_recipe_with_cover()
+        drain_cover_jobs()
+
+        response = self.client.get(
+            reverse('recipes:recipe-api-detail', args=(recipe.pk,))
+        )
+        variants = response.json()['cover_variants']
+
+        self.assertEqual(response.json()['cover_status'], Recipe.COVER_READY)
+        self.assertEqual(variants['width'], 840)
+        self.assertTrue(
+            variants['sources'][0]['files'][0]['url'].startswith('http://')
+        )
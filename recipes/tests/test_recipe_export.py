@@ -0,0 +1,129 @@
+import csv
+import gzip
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import test
+
+from tag.models import Tag
+
+from .test_recipe_api import RecipeAPIv2TestMixin
+
+
+class RecipeExportTest(test.APITestCase, RecipeAPIv2TestMixin):
+    def setUp(self):
+        cache.clear()
+        return super().setUp()
+
+    def make_catalog(self):
+        first, second, hidden = self.make_recipe_in_batch(qty=3)
+        first.tags.add(
+            Tag.objects.create(name='Sweet'), Tag.objects.create(name='Cake')
+        )
+        hidden.is_published = False
+        hidden.save()
+        return first, second
+
+    def export(self, query='', **headers):
+        auth_data = self.get_auth_data()
+        response = self.client.get(
+            reverse('recipes:recipe-api-export') + query,
+            HTTP_AUTHORIZATION=f'Bearer {auth_data["jwt_access_token"]}',
+            **headers,
+        )
+        self.assertEqual(response.status_code, 200)
+        return response, b''.join(response.streaming_content)
+
+    def test_export_needs_an_authenticated_user(self):
+        response = self.client.get(reverse('recipes:recipe-api-export'))
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_export_streams_published_recipes_as_ndjson(self):
+        first, second = self.make_catalog()
+
+        response, content = self.export()
+        rows = [json.loads(line) for line in content.decode().splitlines()]
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual([row['id'] for row in rows], [first.pk, second.pk])
+        self.assertEqual(rows[0]['tags'], ['Cake', 'Sweet'])
+        self.assertEqual(rows[0]['author'], 'u0')
+        self.assertEqual(rows[0]['author_name'], 'Jon Doe')
+        self.assertEqual(rows[0]['category'], 'Category')
+
+    def test_export_names_authors_without_name_by_username(self):
+        self.make_recipe(
+            author_data={'first_name': '', 'last_name': '', 'username': 'jr'}
+        )
+
+        _, content = self.export()
+        rows = [json.loads(line) for line in content.decode().splitlines()]
+
+        self.assertEqual(rows[0]['author_name'], 'jr')
+
+    def test_export_resumes_after_a_recipe_id(self):
+        first, second = self.make_catalog()
+
+        _, content = self.export(f'?after={first.pk}')
+        rows = [json.loads(line) for line in content.decode().splitlines()]
+
+        self.assertEqual([row['id'] for row in rows], [second.pk])
+
+    def test_export_as_csv(self):
+        first, _ = self.make_catalog()
+
+        response, content = self.export('?export_format=csv')
+        rows = list(csv.DictReader(StringIO(content.decode())))
+
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(rows[0]['id'], str(first.pk))
+        self.assertEqual(rows[0]['tags'], 'Cake|Sweet')
+
+    def test_export_is_gzipped_when_the_client_accepts_it(self):
+        self.make_catalog()
+
+        response, content = self.export(HTTP_ACCEPT_ENCODING='gzip, br')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(len(gzip.decompress(content).splitlines()), 2)
+
+    def test_export_rejects_unknown_formats(self):
+        auth_data = self.get_auth_data()
+        response = self.client.get(
+            reverse('recipes:recipe-api-export') + '?export_format=xml',
+            HTTP_AUTHORIZATION=f'Bearer {auth_data["jwt_access_token"]}',
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_rejects_invalid_after_ids(self):
+        auth_data = self.get_auth_data()
+
+        for after in ('abc', '%C2%B2', str(2 ** 63)):
+            response = self.client.get(
+                reverse('recipes:recipe-api-export') + f'?after={after}',
+                HTTP_AUTHORIZATION=f'Bearer {auth_data["jwt_access_token"]}',
+            )
+
+            self.assertEqual(response.status_code, 400)
+
+    def test_export_recipes_command_writes_gzipped_file(self):
+        self.make_catalog()
+        output = os.path.join(tempfile.mkdtemp(), 'recipes.ndjson.gz')
+
+        call_command(
+            'export_recipes', '--gzip', f'--output={output}', '--chunk-size=1'
+        )
+
+        with gzip.open(output, 'rt') as file:
+            rows = [json.loads(line) for line in file]
+
+        os.remove(output)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]['tags'], ['Cake', 'Sweet'])
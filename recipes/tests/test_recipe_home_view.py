@@ -97,3 +97,82 @@ class RecipeHomeViewTest(RecipeTestBase):
                 response.context['recipes'].number,
                 2
             )
+
+    @patch('recipes.views.site.PER_PAGE', new=3)
+    def test_recipe_home_cursor_pagination_walks_pages_by_id(self):
+        recipes = self.make_recipe_in_batch(qty=7)
+        expected_ids = [recipe.id for recipe in reversed(recipes)]
+
+        with patch('recipes.views.site.PAGINATION_MODE', new='cursor'):
+            response = self.client.get(reverse('recipes:home'))
+            first_page = response.context['recipes']
+            self.assertEqual(
+                expected_ids[:3], [recipe.id for recipe in first_page]
+            )
+            self.assertFalse(first_page.has_previous())
+
+            response = self.client.get(
+                reverse('recipes:home') + f'?cursor={first_page.next_cursor}'
+            )
+            second_page = response.context['recipes']
+            self.assertEqual(
+                expected_ids[3:6], [recipe.id for recipe in second_page]
+            )
+            self.assertIn(
+                f'?cursor={second_page.previous_cursor}',
+                response.content.decode('utf-8')
+            )
+
+            response = self.client.get(
+                reverse('recipes:home') + f'?cursor={second_page.next_cursor}'
+            )
+            last_page = response.context['recipes']
+            self.assertEqual(
+                expected_ids[6:], [recipe.id for recipe in last_page]
+            )
+            self.assertFalse(last_page.has_next())
+
+            response = self.client.get(
+                reverse('recipes:home') +
+                f'?cursor={last_page.previous_cursor}'
+            )
+            self.assertEqual(
+                expected_ids[3:6],
+                [recipe.id for recipe in response.context['recipes']]
+            )
+
+    def test_recipe_home_cursor_query_switches_to_cursor_mode(self):
+        self.make_recipe_in_batch(qty=2)
+
+        response = self.client.get(reverse('recipes:home') + '?cursor=stale')
+
+        self.assertEqual(len(response.context['recipes']), 2)
+        self.assertTrue(response.context['pagination_range']['cursor_mode'])
+
+    @patch('recipes.views.site.PER_PAGE', new=2)
+    @patch('recipes.views.site.CURSOR_PAGE_THRESHOLD', new=2)
+    def test_recipe_home_switches_to_cursors_past_the_threshold(self):
+        recipes = self.make_recipe_in_batch(qty=7)
+        expected_ids = [recipe.id for recipe in reversed(recipes)]
+
+        response = self.client.get(reverse('recipes:home') + '?page=2')
+        pagination_range = response.context['pagination_range']
+        next_cursor = pagination_range['next_cursor']()
+
+        self.assertEqual(list(pagination_range['pagination']), [1, 2])
+        self.assertFalse(pagination_range['last_page_is_out_of_range'])
+        self.assertIn(
+            f'?cursor={next_cursor}', response.content.decode('utf-8')
+        )
+
+        response = self.client.get(
+            reverse('recipes:home') + f'?cursor={next_cursor}'
+        )
+        self.assertEqual(
+            expected_ids[4:6],
+            [recipe.id for recipe in response.context['recipes']]
+        )
+
+        # Deeper numbered pages are not served with an OFFSET
+        response = self.client.get(reverse('recipes:home') + '?page=4')
+        self.assertEqual(response.context['recipes'].number, 2)
@@ -1,6 +1,10 @@
+from unittest.mock import patch
+
 from django.core.exceptions import ValidationError
 from parameterized import parameterized
 
+from recipes.models import allocate_slugs, make_slug_candidate
+
 from .test_recipe_base import Recipe, RecipeTestBase
 
 
@@ -63,4 +67,68 @@ class RecipeModelTest(RecipeTestBase):
             str(self.recipe), self.recipe.title,
             msg=f'Recipe string representation must be '
                 f'"{self.recipe.title}" but "{str(self.recipe)}" was received.'
-        )
\ No newline at end of file
+        )
+
+    def test_recipe_full_clean_reports_a_taken_title_once(self):
+        recipe = Recipe(
+            category=self.recipe.category,
+            author=self.recipe.author,
+            title='RECIPE TITLE',
+            description='Other description',
+            slug='other-slug',
+            preparation_time=10,
+            preparation_time_unit='Minutes',
+            servings=5,
+            servings_unit='Servings',
+            preparation_step='Other steps',
+        )
+
+        with self.assertRaises(ValidationError) as context:
+            recipe.full_clean()
+
+        self.assertEqual(
+            context.exception.message_dict,
+            {'title': ['Found recipes with this title']},
+        )
+
+    def test_recipe_save_turns_a_taken_title_into_a_validation_error(self):
+        with self.assertRaises(ValidationError) as context:
+            self.make_recipe(
+                title='recipe title',
+                slug='other-slug',
+                author_data={'username': 'other'},
+            )
+
+        self.assertIn('title', context.exception.message_dict)
+
+    def test_recipe_save_allocates_a_free_slug(self):
+        recipe = self.make_recipe(
+            title='Recipe Slug', slug='', author_data={'username': 'other'}
+        )
+
+        self.assertEqual(recipe.slug, 'recipe-slug-2')
+
+    def test_allocate_slugs_numbers_repeated_slugs(self):
+        self.make_recipe(
+            title='Soup', slug='soup', author_data={'username': 'soup'}
+        )
+
+        self.assertEqual(
+            allocate_slugs(['Soup!', 'soup?', 'Other']),
+            ['soup-2', 'soup-3', 'other'],
+        )
+
+    def test_allocate_slugs_probes_past_the_first_candidates(self):
+        for slug in ('soup', 'soup-2', 'soup-3'):
+            self.make_recipe(
+                title=slug, slug=slug, author_data={'username': slug}
+            )
+
+        with patch('recipes.models.SLUG_PROBE_SIZE', 2):
+            self.assertEqual(allocate_slugs(['Soup']), ['soup-4'])
+
+    def test_slug_candidates_fit_the_slug_field(self):
+        self.assertEqual(make_slug_candidate('a' * 60, 1, 50), 'a' * 50)
+        self.assertEqual(
+            make_slug_candidate('a' * 60, 12, 50), 'a' * 47 + '-12'
+        )
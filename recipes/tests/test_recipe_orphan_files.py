@@ -0,0 +1,62 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import override_settings
+
+from recipes.covers import drain_cover_jobs, get_variant_names
+
+from .test_recipe_base import RecipeTestBase
+from .test_recipe_cover_jobs import make_cover
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class CollectOrphanFilesTest(RecipeTestBase):
+    def tearDown(self):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        return super().tearDown()
+
+    def make_orphan(self, name):
+        name = default_storage.save(name, ContentFile(b'orphan'))
+        os.utime(default_storage.path(name), (0, 0))
+        return name
+
+    def collect(self, *args):
+        out = StringIO()
+        call_command('collect_orphan_files', *args, stdout=out)
+        return out.getvalue()
+
+    def test_orphan_covers_and_photos_are_deleted(self):
+        recipe = self.make_recipe()
+        recipe.cover = make_cover()
+        recipe.save()
+        drain_cover_jobs()
+        recipe.refresh_from_db()
+        kept = [recipe.cover.name, *get_variant_names(recipe.cover_variants)]
+        for name in kept:
+            os.utime(default_storage.path(name), (0, 0))
+
+        cover = self.make_orphan('recipes/covers/2024/01/01/old.jpg')
+        photo = self.make_orphan('authors/profile/2024/01/01/old.jpg')
+
+        output = self.collect()
+
+        self.assertIn('2 orphan files found, 2 deleted', output)
+        self.assertFalse(default_storage.exists(cover))
+        self.assertFalse(default_storage.exists(photo))
+        self.assertTrue(all(default_storage.exists(name) for name in kept))
+
+    def test_dry_run_only_lists_orphans(self):
+        cover = self.make_orphan('recipes/covers/2024/01/01/old.jpg')
+
+        output = self.collect('--dry-run')
+
+        self.assertIn(cover, output)
+        self.assertIn('1 orphan files found, 0 deleted', output)
+        self.assertTrue(default_storage.exists(cover))
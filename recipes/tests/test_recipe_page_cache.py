@@ -0,0 +1,158 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test import override_settings
+from django.urls import reverse
+from django.utils.connection import ConnectionDoesNotExist
+
+from recipes.models import Recipe
+from tag.models import Tag
+from utils.counting import count_queryset
+from utils.db_routing import (REPLICA_LAG_KEY, _read_from_replica,
+                              reset_replica_routing)
+from utils.page_cache import PAGE_CACHE_HEADER, get_page_cache_stats
+
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipePageCacheTest(RecipeTestBase):
+    def test_anonymous_page_is_served_from_cache(self):
+        self.make_recipe()
+
+        first = self.client.get(reverse('recipes:home'))
+        second = self.client.get(reverse('recipes:home'))
+
+        self.assertEqual(first[PAGE_CACHE_HEADER], 'MISS')
+        self.assertEqual(second[PAGE_CACHE_HEADER], 'HIT')
+        self.assertEqual(first.content, second.content)
+        self.assertEqual({'hits': 1, 'misses': 1}, get_page_cache_stats())
+
+    def test_page_cache_varies_on_query_and_language(self):
+        self.client.get(reverse('recipes:home'))
+
+        response = self.client.get(reverse('recipes:home') + '?page=2')
+        self.assertEqual(response[PAGE_CACHE_HEADER], 'MISS')
+
+        response = self.client.get(
+            reverse('recipes:home'), HTTP_ACCEPT_LANGUAGE='pt-br'
+        )
+        self.assertEqual(response[PAGE_CACHE_HEADER], 'MISS')
+
+        response = self.client.get(reverse('recipes:home') + '?utm=x')
+        self.assertEqual(response[PAGE_CACHE_HEADER], 'HIT')
+
+    def test_logged_in_users_bypass_the_page_cache(self):
+        self.make_author(username='reader', password='P@ssword1')
+        self.client.login(username='reader', password='P@ssword1')
+
+        response = self.client.get(reverse('recipes:home'))
+
+        self.assertNotIn(PAGE_CACHE_HEADER, response)
+
+    def test_recipe_change_purges_its_pages_only(self):
+        recipe = self.make_recipe()
+        other = self.make_recipe(
+            title='Other', slug='other', category_data={'name': 'Other'},
+            author_data={'username': 'other'},
+        )
+        detail_url = reverse('recipes:recipe', kwargs={'pk': recipe.pk})
+        other_detail_url = reverse('recipes:recipe', kwargs={'pk': other.pk})
+        category_url = reverse(
+            'recipes:category', kwargs={'category_id': recipe.category_id}
+        )
+        other_category_url = reverse(
+            'recipes:category', kwargs={'category_id': other.category_id}
+        )
+        for url in (detail_url, other_detail_url, category_url,
+                    other_category_url):
+            self.client.get(url)
+
+        recipe.title = 'Purged title'
+        recipe.save()
+
+        response = self.client.get(detail_url)
+        self.assertIn('Purged title', response.content.decode())
+        self.assertEqual(
+            self.client.get(category_url)[PAGE_CACHE_HEADER], 'MISS'
+        )
+        self.assertEqual(
+            self.client.get(other_detail_url)[PAGE_CACHE_HEADER], 'HIT'
+        )
+        self.assertEqual(
+            self.client.get(other_category_url)[PAGE_CACHE_HEADER], 'HIT'
+        )
+
+    def test_tag_changes_purge_tag_pages(self):
+        recipe = self.make_recipe()
+        tag = Tag.objects.create(name='Vegan', slug='vegan')
+        tag_url = reverse('recipes:tag', kwargs={'slug': 'vegan'})
+        self.client.get(tag_url)
+
+        recipe.tags.add(tag)
+
+        response = self.client.get(tag_url)
+        self.assertEqual(response[PAGE_CACHE_HEADER], 'MISS')
+        self.assertIn(recipe.title, response.content.decode())
+
+    def test_unpublishing_purges_the_detail_page(self):
+        recipe = self.make_recipe()
+        detail_url = reverse('recipes:recipe', kwargs={'pk': recipe.pk})
+        self.client.get(detail_url)
+
+        recipe.is_published = False
+        recipe.save()
+
+        self.assertEqual(self.client.get(detail_url).status_code, 404)
+
+    def test_page_cache_stats_command_reports_counters(self):
+        self.client.get(reverse('recipes:home'))
+        self.client.get(reverse('recipes:home'))
+        out = StringIO()
+
+        call_command('page_cache_stats', '--reset', stdout=out)
+
+        self.assertIn('hits: 1', out.getvalue())
+        self.assertIn('hit ratio: 50.00%', out.getvalue())
+        self.assertEqual({'hits': 0, 'misses': 0}, get_page_cache_stats())
+
+
+# 'replica' is not a configured database: anything read from it raises,
+# standing for a replica that has not received the latest writes yet
+@override_settings(
+    DATABASE_REPLICAS=['replica'], DATABASE_REPLICA_STICKY_SECONDS=10
+)
+class RecipePageCacheReplicaLagTest(RecipeTestBase):
+    def get_home(self):
+        # The test transaction would keep the reads on the primary anyway
+        with patch.object(connections['default'], 'in_atomic_block', False):
+            return self.client.get(reverse('recipes:home'))
+
+    def test_page_misses_after_a_change_render_from_the_primary(self):
+        recipe = self.make_recipe(title='Fresh title')
+
+        response = self.get_home()
+
+        self.assertEqual(response[PAGE_CACHE_HEADER], 'MISS')
+        self.assertIn(recipe.title, response.content.decode())
+
+    def test_page_misses_read_the_replicas_once_they_caught_up(self):
+        self.make_recipe()
+        cache.delete(REPLICA_LAG_KEY)
+
+        with self.assertRaises(ConnectionDoesNotExist):
+            self.get_home()
+
+    def test_count_misses_after_a_change_read_the_primary(self):
+        self.make_recipe()
+        # As for an anonymous GET that did not write
+        reset_replica_routing()
+        _read_from_replica.set(True)
+        self.addCleanup(reset_replica_routing)
+
+        with patch.object(connections['default'], 'in_atomic_block', False):
+            count = count_queryset(Recipe.objects.filter(is_published=True))
+
+        self.assertEqual((1, False), count)
@@ -0,0 +1,67 @@
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from recipes.covers import drain_cover_jobs
+from recipes.models import Recipe
+from recipes.serializers import RecipeReadSerializer, RecipeSerializer
+from tag.models import Tag
+
+from .test_recipe_base import RecipeTestBase
+from .test_recipe_cover_jobs import make_cover
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class RecipeReadSerializerTest(RecipeTestBase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        return super().tearDownClass()
+
+    def serialize(self, serializer_class):
+        request = Request(APIRequestFactory().get('/recipes/api/v2/'))
+        recipes = Recipe.objects.get_published()
+        return serializer_class(
+            recipes, many=True, context={'request': request}
+        ).data
+
+    def test_read_serializer_matches_recipe_serializer(self):
+        with_tags = self.make_recipe(title='Tags', slug='tags')
+        with_tags.tags.add(
+            Tag.objects.create(name='One'), Tag.objects.create(name='Two')
+        )
+        with_cover = self.make_recipe(
+            title='Cover', slug='cover', author_data={'username': 'cover'}
+        )
+        with_cover.cover = make_cover()
+        with_cover.category = None
+        with_cover.save()
+        drain_cover_jobs()
+        self.make_recipe(
+            title='Plain', slug='plain', author_data={'username': 'plain'}
+        )
+
+        self.assertEqual(
+            self.serialize(RecipeSerializer),
+            self.serialize(RecipeReadSerializer),
+        )
+
+    def test_benchmark_command_checks_output_and_reports_speedup(self):
+        out = StringIO()
+        call_command(
+            'benchmark_recipe_serializer',
+            '--recipes=3', '--repeat=1', '--host=testserver',
+            stdout=out,
+        )
+
+        self.assertIn('3 recipes', out.getvalue())
+        self.assertIn('same output', out.getvalue())
+        self.assertIn('speedup', out.getvalue())
+        self.assertFalse(Recipe.objects.exists())
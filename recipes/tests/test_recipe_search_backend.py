@@ -0,0 +1,83 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+
+from recipes.models import Recipe
+from recipes.search import get_search_backend
+from tag.models import Tag
+
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipeSearchBackendTest(RecipeTestBase):
+    def search(self, term):
+        backend = get_search_backend()
+        return list(backend.search(Recipe.objects.all(), term))
+
+    def test_search_finds_recipe_by_tag_name(self):
+        recipe = self.make_recipe(title='Chocolate cake')
+        recipe.tags.add(Tag.objects.create(name='Dessert'))
+
+        self.assertEqual([recipe], self.search('dessert'))
+
+    def test_search_ranks_title_matches_above_description_matches(self):
+        in_description = self.make_recipe(
+            slug='one',
+            title='Plain bread',
+            description='Goes well with pumpkin soup',
+            author_data={'username': 'one'},
+        )
+        in_title = self.make_recipe(
+            slug='two',
+            title='Pumpkin pie',
+            description='A classic for autumn',
+            author_data={'username': 'two'},
+        )
+
+        self.assertEqual([in_title, in_description], self.search('pumpkin'))
+
+    def test_search_matches_word_prefixes(self):
+        recipe = self.make_recipe(title='Strawberry jam')
+
+        self.assertEqual([recipe], self.search('straw'))
+
+    def test_search_without_words_returns_nothing(self):
+        self.make_recipe()
+
+        self.assertEqual([], self.search('"*-'))
+
+    def test_search_index_follows_recipe_and_tag_changes(self):
+        recipe = self.make_recipe(title='Lemon tart')
+        tag = Tag.objects.create(name='Citrus')
+        recipe.tags.add(tag)
+
+        tag.name = 'Sour'
+        tag.save()
+        self.assertEqual([], self.search('citrus'))
+        self.assertEqual([recipe], self.search('sour'))
+
+        recipe.tags.clear()
+        self.assertEqual([], self.search('sour'))
+
+        recipe.delete()
+        self.assertEqual([], self.search('lemon'))
+
+    def test_search_page_highlights_matched_words(self):
+        self.make_recipe(description='Crunchy <b>granola</b> bars')
+
+        response = self.client.get(reverse('recipes:search') + '?q=granola')
+        content = response.content.decode('utf-8')
+
+        self.assertIn('&lt;b&gt;<mark>granola</mark>&lt;/b&gt;', content)
+
+    def test_rebuild_search_index_command_reindexes_all_recipes(self):
+        recipe = self.make_recipe(title='Banana bread')
+        get_search_backend().remove([recipe.pk])
+        self.assertEqual([], self.search('banana'))
+
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+
+        self.assertIn('1 recipes indexed', out.getvalue())
+        self.assertEqual([recipe], self.search('banana'))
@@ -0,0 +1,68 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import test
+
+from utils.throttling import ConcurrencyLimiter
+
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipeSearchThrottlingTest(RecipeTestBase):
+    @override_settings(THROTTLE_RATES={'search': '2/min'})
+    def test_search_answers_429_once_the_rate_is_used_up(self):
+        url = reverse('recipes:search') + '?q=teste'
+
+        self.assertEqual(200, self.client.get(url).status_code)
+        self.assertEqual(200, self.client.get(url).status_code)
+
+        response = self.client.get(url)
+
+        self.assertEqual(429, response.status_code)
+        self.assertIn('Retry-After', response)
+
+    @override_settings(LOAD_SHED_LIMITS={'search': 1})
+    def test_search_answers_503_when_too_many_are_in_flight(self):
+        url = reverse('recipes:search') + '?q=teste'
+        ConcurrencyLimiter('search').acquire()
+
+        response = self.client.get(url)
+
+        self.assertEqual(503, response.status_code)
+
+    @override_settings(LOAD_SHED_LIMITS={'search': 1})
+    def test_search_cache_hits_are_not_shed(self):
+        url = reverse('recipes:search') + '?q=teste'
+        self.client.get(url)
+        ConcurrencyLimiter('search').acquire()
+
+        response = self.client.get(url)
+
+        self.assertEqual(200, response.status_code)
+
+
+class RecipeTokenThrottlingTest(test.APITestCase):
+    def setUp(self):
+        cache.clear()
+        return super().setUp()
+
+    @override_settings(THROTTLE_RATES={'token': '1/min'})
+    def test_token_endpoint_is_throttled(self):
+        url = reverse('recipes:token_obtain_pair')
+        data = {'username': 'nobody', 'password': 'wrong'}
+
+        self.assertEqual(401, self.client.post(url, data=data).status_code)
+
+        response = self.client.post(url, data=data)
+
+        self.assertEqual(429, response.status_code)
+        self.assertIn('Retry-After', response)
+
+    @override_settings(LOAD_SHED_LIMITS={'token': 1})
+    def test_token_endpoint_sheds_load(self):
+        url = reverse('recipes:token_obtain_pair')
+        ConcurrencyLimiter('token').acquire()
+
+        response = self.client.post(url, data={})
+
+        self.assertEqual(503, response.status_code)
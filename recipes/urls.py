@@ -1,12 +1,21 @@
+from django.conf import settings
 from django.urls import path
 from rest_framework.routers import SimpleRouter
-from rest_framework_simplejwt.views import (TokenObtainPairView,
-                                            TokenRefreshView, TokenVerifyView)
+from rest_framework_simplejwt.views import TokenRefreshView, TokenVerifyView
 
 from . import views
 
 app_name = 'recipes'
 
+
+def site_view(view_class):
+    """``view_class`` or, with ASYNC_VIEWS, its async twin."""
+    if settings.ASYNC_VIEWS:
+        view_class = getattr(views, f'{view_class.__name__}Async')
+
+    return view_class.as_view()
+
+
 recipe_api_v2_router = SimpleRouter()
 recipe_api_v2_router.register(
     'recipes/api/v2',
@@ -15,31 +24,31 @@ recipe_api_v2_router.register(
 )
 
 urlpatterns = [
-    path('',  views.RecipeListViewHome.as_view(), name="home"),
+    path('',  site_view(views.RecipeListViewHome), name="home"),
     path(
         'recipes/search/',
-        views.RecipeListViewSearch.as_view(),
+        site_view(views.RecipeListViewSearch),
         name="search"
     ),
     path(
         'recipes/tags/<slug:slug>/',
-        views.RecipeListViewTag.as_view(),
+        site_view(views.RecipeListViewTag),
         name="tag"
     ),
     path(
         'recipes/category/<int:category_id>/',
-        views.RecipeListViewCategory.as_view(),
+        site_view(views.RecipeListViewCategory),
         name="category"
     ),
-    path('recipes/<int:pk>/',  views.RecipeDetail.as_view(), name="recipe"),
+    path('recipes/<int:pk>/',  site_view(views.RecipeDetail), name="recipe"),
     path(
         'recipes/api/v1/',
-        views.RecipeListViewHomeApi.as_view(),
+        site_view(views.RecipeListViewHomeApi),
         name="home_api_v1"
     ),
     path(
         'recipes/api/v1/<int:pk>/',
-        views.RecipeDetailAPI.as_view(),
+        site_view(views.RecipeDetailAPI),
         name="recipes_api_v1_detail"
     ),
     path(
@@ -49,7 +58,7 @@ urlpatterns = [
     ),
     path(
         'recipes/api/token/',
-        TokenObtainPairView.as_view(),
+        views.RecipeTokenObtainPairView.as_view(),
         name='token_obtain_pair'
     ),
     path(
@@ -1,3 +1,4 @@
 # flake8: noqa
 from .api import *
 from .site import *
+from .site_async import *
@@ -1,28 +1,101 @@
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, IntegrityError
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import method_decorator
 from rest_framework import status
-from rest_framework.decorators import api_view
-from rest_framework.pagination import PageNumberPagination
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.decorators import action, api_view
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.permissions import (IsAuthenticated,
+                                        IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
+from rest_framework_simplejwt.views import TokenObtainPairView
 
 from tag.models import Tag
+from utils.counting import CachedCountPaginator, count_queryset
+from utils.environment import parse_comma_sep_str_to_list
+from utils.strings import parse_positive_int
+from utils.throttling import LoadSheddingMixin
 
+from ..bulk import check_titles, validate_recipe_batch, write_recipe_batch
+from ..changes import (decode_change_token, encode_change_token, get_changes,
+                       is_recipe)
+from ..conditional import (list_condition, make_etag, make_list_condition,
+                           recipe_condition)
+from ..export import EXPORT_FORMATS, iter_export, iter_gzip
 from ..models import Recipe
 from ..permissions import IsOwner
-from ..serializers import RecipeSerializer, TagSerializer
+from ..serializers import (RecipeReadSerializer, RecipeSerializer,
+                           TagSerializer)
 
 
 class RecipeApiV2Pagination(PageNumberPagination):
     page_size = 9
+    django_paginator_class = CachedCountPaginator
+
+
+class RecipeApiV2CursorPagination(CursorPagination):
+    page_size = 9
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = '-id'
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+
+        if request.query_params.get(self.count_query_param) in ('1', 'true'):
+            self.count, _ = count_queryset(queryset)
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+
+        if self.count is not None:
+            response.data = {'count': self.count, **response.data}
+
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count'] = {
+            'type': 'integer',
+            'example': 123,
+        }
+        return response_schema
 
 
 class RecipeApiV2ViewSet(ModelViewSet):
     queryset = Recipe.objects.get_published()
     serializer_class = RecipeSerializer
-    pagination_class = RecipeApiV2Pagination
+    pagination_class = RecipeApiV2CursorPagination
     permission_classes = [IsAuthenticatedOrReadOnly, ]
     http_method_names = ['get', 'options', 'head', 'patch', 'post', 'delete']
+    bulk_max_items = 100
+    multi_get_max_ids = 100
+    changes_page_size = 100
+    changes_max_page_size = 500
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            pagination_class = self.pagination_class
+
+            # Clients still walking numbered pages keep the old pagination
+            if pagination_class and 'page' in self.request.query_params:
+                pagination_class = RecipeApiV2Pagination
+
+            self._paginator = pagination_class() if pagination_class else None
+
+        return self._paginator
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -35,11 +108,287 @@ class RecipeApiV2ViewSet(ModelViewSet):
             headers=headers
         )
 
+    def list(self, request, *args, **kwargs):
+        if 'ids' in request.query_params:
+            return self.multi_get(request)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        conditional = list_condition(request, queryset)
+        return conditional(super().list)(request, *args, **kwargs)
+
+    def get_requested_ids(self):
+        ids = [
+            parse_positive_int(pk) for pk in
+            parse_comma_sep_str_to_list(self.request.query_params['ids'])
+        ]
+
+        if not ids or None in ids:
+            raise ValidationError({'ids': 'Expected comma separated ids.'})
+
+        ids = list(dict.fromkeys(ids))
+
+        if len(ids) > self.multi_get_max_ids:
+            raise ValidationError({
+                'ids': f'Ask for at most {self.multi_get_max_ids} recipes.'
+            })
+
+        return ids
+
+    def multi_get(self, request):
+        """
+        Published recipes of ?ids=, in the requested order, with the ids
+        that are missing or unpublished.
+        """
+        ids = self.get_requested_ids()
+        recipes = self.filter_queryset(self.get_queryset()).in_bulk(ids)
+        found = [recipes[pk] for pk in ids if pk in recipes]
+        etag = make_etag(
+            request.get_full_path(),
+            *(f'{recipe.pk}:{recipe.updated_at.isoformat()}'
+              for recipe in found),
+        )
+        last_modified = max(
+            (recipe.updated_at for recipe in found), default=None
+        )
+
+        def respond(request):
+            serializer = self.get_serializer(found, many=True)
+            return Response({
+                'results': serializer.data,
+                'missing': [pk for pk in ids if pk not in recipes],
+            })
+
+        return make_list_condition(etag, last_modified)(respond)(request)
+
+    @method_decorator(recipe_condition)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @action(
+        detail=False,
+        methods=['get'],
+        permission_classes=[IsAuthenticated],
+    )
+    def export(self, request, *args, **kwargs):
+        export_format = request.query_params.get('export_format', 'ndjson')
+        after = request.query_params.get('after')
+        after_id = parse_positive_int(after)
+
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError({
+                'export_format': f'Choose one of: {", ".join(EXPORT_FORMATS)}'
+            })
+
+        if after is not None and after_id is None:
+            raise ValidationError({'after': 'Must be a recipe id'})
+
+        content = iter_export(export_format, after_id=after_id)
+        accept_encoding = request.headers.get('Accept-Encoding', '')
+        use_gzip = re.search(r'\bgzip\b', accept_encoding) is not None
+
+        response = StreamingHttpResponse(
+            iter_gzip(content) if use_gzip else content,
+            content_type=EXPORT_FORMATS[export_format],
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="recipes.{export_format}"'
+        )
+
+        if use_gzip:
+            response['Content-Encoding'] = 'gzip'
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+
+    @action(
+        detail=False,
+        methods=['post'],
+        permission_classes=[IsAuthenticated],
+    )
+    def bulk(self, request, *args, **kwargs):
+        items = request.data
+
+        if not isinstance(items, list) or not items:
+            raise ValidationError(
+                {'non_field_errors': ['Expected a list of recipes.']}
+            )
+
+        if len(items) > self.bulk_max_items:
+            raise ValidationError({'non_field_errors': [
+                f'Send at most {self.bulk_max_items} recipes per request.'
+            ]})
+
+        serializers, errors = validate_recipe_batch(
+            items, request.user, self.get_serializer_context()
+        )
+
+        if any(errors):
+            return Response(
+                {'errors': errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        created = any(item.instance is None for item in serializers)
+
+        try:
+            recipe_ids = write_recipe_batch(serializers, request.user)
+        except IntegrityError:
+            # A concurrent write took one of the titles
+            check_titles(serializers, errors)
+
+            # Another unique value, such as a slug, was taken meanwhile
+            if not any(errors):
+                raise ValidationError({'non_field_errors': [
+                    'A concurrent change conflicts with these recipes, '
+                    'send them again.'
+                ]})
+
+            return Response(
+                {'errors': errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        recipes = Recipe.objects.filter(pk__in=recipe_ids)\
+            .select_related('category')\
+            .prefetch_related('tags')\
+            .in_bulk()
+        serializer = RecipeReadSerializer(
+            [recipes[pk] for pk in recipe_ids],
+            many=True,
+            context=self.get_serializer_context(),
+        )
+
+        return Response(
+            {'results': serializer.data},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+    def get_changes_page_size(self):
+        page_size = parse_positive_int(
+            self.request.query_params.get('page_size', self.changes_page_size)
+        )
+
+        if page_size is None:
+            raise ValidationError({'page_size': 'Must be a positive number.'})
+
+        return min(page_size, self.changes_max_page_size)
+
+    @action(detail=False, methods=['get'])
+    def changes(self, request, *args, **kwargs):
+        """
+        Recipes changed and tombstones written after ?since=, oldest
+        first. Clients keep the returned ``next`` token and ask again
+        while ``has_more`` is true; without ?since= every recipe is sent.
+        """
+        since = request.query_params.get('since')
+
+        if since is not None:
+            since = decode_change_token(since)
+
+            if since is None:
+                raise ValidationError({'since': 'Invalid change token.'})
+
+        # Rows saved by transactions still running may carry an earlier
+        # updated_at; leave the last seconds for the next sync. A replica
+        # lagging more than that would hide them for good, so read from
+        # the primary
+        until = timezone.now() - timedelta(
+            seconds=settings.RECIPE_CHANGES_SETTLE_SECONDS
+        )
+        changes, has_more = get_changes(
+            Recipe.objects.db_manager(DEFAULT_DB_ALIAS)
+            .get_published().order_by(),
+            since=since,
+            until=until,
+            limit=self.get_changes_page_size(),
+        )
+        serializer = RecipeReadSerializer(
+            [change[2] for change in changes if is_recipe(change)],
+            many=True,
+            context=self.get_serializer_context(),
+        )
+        recipes_data = iter(serializer.data)
+        results = []
+
+        for change in changes:
+            _, pk, row = change
+
+            if is_recipe(change):
+                results.append({
+                    'id': pk, 'change': 'upsert', 'recipe': next(recipes_data)
+                })
+            else:
+                results.append({
+                    'id': pk, 'change': 'delete', 'reason': row.reason
+                })
+
+        if changes:
+            next_token = encode_change_token(*changes[-1][:2])
+        elif since is not None:
+            next_token = request.query_params['since']
+        else:
+            next_token = encode_change_token(until, 0)
+
+        return Response({
+            'results': results,
+            'next': next_token,
+            'has_more': has_more,
+        })
+
+    def get_serializer_class(self):
+        if self.action in ('list', 'retrieve'):
+            return RecipeReadSerializer
+
+        return super().get_serializer_class()
+
+    def get_sparse_fields(self):
+        """Fields picked with ?fields= / ?omit= on reads, else None."""
+        if hasattr(self, '_sparse_fields'):
+            return self._sparse_fields
+
+        params = self.request.query_params
+        self._sparse_fields = None
+
+        if self.action not in ('list', 'retrieve') or not (
+            'fields' in params or 'omit' in params
+        ):
+            return None
+
+        available = RecipeSerializer.Meta.fields
+        fields = parse_comma_sep_str_to_list(params.get('fields')) or available
+        omit = parse_comma_sep_str_to_list(params.get('omit'))
+        unknown = set(fields + omit) - set(available)
+
+        if unknown:
+            raise ValidationError({
+                'fields': f'Unknown fields: {", ".join(sorted(unknown))}'
+            })
+
+        self._sparse_fields = set(fields) - set(omit)
+        return self._sparse_fields
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.get_sparse_fields()
+        return context
+
     def get_queryset(self):
-        qs = super().get_queryset()
-        category_id = self.request.query_params.get('category_id', None)
+        fields = self.get_sparse_fields()
+
+        if fields is None:
+            qs = super().get_queryset()
+        else:
+            qs = Recipe.objects.get_published(
+                author='author_name' in fields,
+                category='category' in fields,
+                tags=bool(RecipeReadSerializer.tag_fields & fields),
+                preparation_step='preparation_step' in fields,
+            )
+        category_id = parse_positive_int(
+            self.request.query_params.get('category_id')
+        )
 
-        if category_id is not None and category_id.isnumeric():
+        if category_id is not None:
             qs = qs.filter(category_id=category_id)
 
         return qs
@@ -88,3 +437,9 @@ def tag_api_detail(request, pk):
         many=False,
     )
     return Response(serializer.data)
+
+
+class RecipeTokenObtainPairView(LoadSheddingMixin, TokenObtainPairView):
+    # Every attempt hashes a password
+    throttle_scope = 'token'
+    load_shed_scope = 'token'
@@ -1,17 +1,59 @@
 import os
 
-from django.db.models import Q
+from django.core.serializers.json import DjangoJSONEncoder
 from django.forms.models import model_to_dict
-from django.http import Http404, JsonResponse
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.utils import translation
+from django.utils.decorators import method_decorator
 from django.utils.translation import gettext as _
 from django.views.generic import DetailView, ListView
 
+from recipes.conditional import list_condition, recipe_condition
 from recipes.models import Recipe
+from recipes.page_cache import (LIST_PAGE_TAG, category_page_tag,
+                                recipe_page_tag, tag_page_tag)
+from recipes.search import get_search_backend, render_highlight
 from tag.models import Tag
-from utils.pagination import make_pagination
+from utils.page_cache import PageCacheMixin
+from utils.pagination import (CURSOR_PARAM, make_cursor_pagination,
+                              make_pagination)
+from utils.throttling import LoadSheddingMixin, ThrottleMixin
 
 PER_PAGE = os.environ.get('PER_PAGE', 9)
+PAGINATION_MODE = os.environ.get('PAGINATION_MODE', 'numbered')
+# Numbered listings past this page continue with cursors (0 disables)
+CURSOR_PAGE_THRESHOLD = int(os.environ.get('CURSOR_PAGE_THRESHOLD', 10))
+# Upper bound for ?per_page= on the v1 list, which is streamed row by row
+API_V1_MAX_PER_PAGE = int(os.environ.get('API_V1_MAX_PER_PAGE', 1000))
+# Columns of the v1 list, later columns are not part of its contract
+API_V1_FIELDS = (
+    'id', 'title', 'description', 'slug', 'preparation_time',
+    'preparation_time_unit', 'servings', 'servings_unit', 'preparation_step',
+    'preparation_step_is_html', 'created_at', 'updated_at', 'is_published',
+    'cover', 'category_id', 'author_id',
+)
+
+
+def stream_json_list(key, rows, chunk_size=500):
+    encoder = DjangoJSONEncoder()
+    yield f'{{{encoder.encode(key)}: ['
+
+    for index, row in enumerate(rows.iterator(chunk_size=chunk_size)):
+        yield f'{", " if index else ""}{encoder.encode(row)}'
+
+    yield ']}'
+
+
+async def astream_json_list(key, rows, chunk_size=500):
+    encoder = DjangoJSONEncoder()
+    yield f'{{{encoder.encode(key)}: ['
+    index = 0
+
+    async for row in rows.aiterator(chunk_size=chunk_size):
+        yield f'{", " if index else ""}{encoder.encode(row)}'
+        index += 1
+
+    yield ']}'
 
 
 class RecipeListViewBase(ListView):
@@ -19,24 +61,20 @@ class RecipeListViewBase(ListView):
     context_object_name = 'recipes'
     ordering = ['-id']
     template_name = 'recipes/pages/home.html'
+    cursor_pagination = False
 
     def get_queryset(self, *args, **kwargs):
         qs = super().get_queryset(*args, **kwargs)
         qs = qs.filter(
             is_published=True,
         )
-        qs = qs.select_related('author', 'category')
-        qs = qs.prefetch_related('tags', 'author__profile')
+        qs = qs.select_related('category')
+        qs = qs.prefetch_related('tags')
         return qs
 
     def get_context_data(self, *args, **kwargs):
         ctx = super().get_context_data(*args, **kwargs)
-
-        page_obj, pagination_range = make_pagination(
-            request=self.request,
-            queryset=ctx.get('recipes'),
-            per_page=PER_PAGE
-        )
+        page_obj, pagination_range = self.paginate_recipes(ctx.get('recipes'))
 
         html_language = translation.get_language()
 
@@ -48,26 +86,78 @@ class RecipeListViewBase(ListView):
 
         return ctx
 
+    def paginate_recipes(self, queryset):
+        if self.uses_cursor_pagination():
+            return make_cursor_pagination(
+                request=self.request,
+                queryset=queryset,
+                per_page=PER_PAGE
+            )
+
+        return make_pagination(
+            request=self.request,
+            queryset=queryset,
+            per_page=PER_PAGE,
+            max_page=self.get_max_page(),
+        )
+
+    def get_max_page(self):
+        if not self.cursor_pagination or not CURSOR_PAGE_THRESHOLD:
+            return None
+
+        return CURSOR_PAGE_THRESHOLD
 
-class RecipeListViewHome(RecipeListViewBase):
+    def uses_cursor_pagination(self):
+        if not self.cursor_pagination:
+            return False
+
+        return PAGINATION_MODE == 'cursor' or CURSOR_PARAM in self.request.GET
+
+
+class RecipeListViewHome(PageCacheMixin, RecipeListViewBase):
     template_name = 'recipes/pages/home.html'
+    cursor_pagination = True
+
+    def get_page_cache_tags(self):
+        return [LIST_PAGE_TAG]
 
 
 class RecipeListViewHomeApi(RecipeListViewBase):
     template_name = 'recipes/pages/home.html'
 
-    def render_to_response(self, context, **response_kwargs):
-        recipes = self.get_context_data()['recipes'].object_list.values()
+    def get(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        conditional = list_condition(request, queryset)
+        return conditional(self.stream_recipes)(request, queryset)
 
-        return JsonResponse(
-            {
-                "recipes": list(recipes)
-            }
+    def get_per_page(self):
+        try:
+            per_page = int(self.request.GET.get('per_page', PER_PAGE))
+        except ValueError:
+            per_page = int(PER_PAGE)
+
+        return min(max(per_page, 1), API_V1_MAX_PER_PAGE)
+
+    def stream_recipes(self, request, queryset):
+        page_obj, _ = make_pagination(
+            request=request,
+            queryset=queryset.prefetch_related(None).values(*API_V1_FIELDS),
+            per_page=self.get_per_page(),
+        )
+
+        # The page is read in chunks while the response is sent
+        return StreamingHttpResponse(
+            stream_json_list('recipes', page_obj.object_list),
+            content_type='application/json',
         )
 
 
-class RecipeListViewCategory(RecipeListViewBase):
+class RecipeListViewCategory(PageCacheMixin, RecipeListViewBase):
     template_name = 'recipes/pages/category.html'
+    cursor_pagination = True
+
+    def get_page_cache_tags(self):
+        return [category_page_tag(self.kwargs.get('category_id'))]
 
     def get_queryset(self, *args, **kwargs):
         qs = super().get_queryset(*args, **kwargs)
@@ -75,14 +165,14 @@ class RecipeListViewCategory(RecipeListViewBase):
             category__id=self.kwargs.get('category_id'),
             is_published=True,
         )
-
-        if not qs:
-            raise Http404()
-
         return qs
 
     def get_context_data(self, *args, **kwargs):
         ctx = super().get_context_data(*args, **kwargs)
+
+        if not ctx.get('recipes'):
+            raise Http404()
+
         category_translation = _('Category')
 
         ctx.update({
@@ -92,8 +182,16 @@ class RecipeListViewCategory(RecipeListViewBase):
         return ctx
 
 
-class RecipeListViewSearch(RecipeListViewBase):
+class RecipeListViewSearch(
+    ThrottleMixin, PageCacheMixin, LoadSheddingMixin, RecipeListViewBase
+):
     template_name = 'recipes/pages/search.html'
+    throttle_scope = 'search'
+    # Only cache misses run the search query
+    load_shed_scope = 'search'
+
+    def get_page_cache_tags(self):
+        return [LIST_PAGE_TAG]
 
     def get_queryset(self, *args, **kwargs):
         qs = super().get_queryset(*args, **kwargs)
@@ -102,13 +200,7 @@ class RecipeListViewSearch(RecipeListViewBase):
         if not search_term:
             raise Http404()
 
-        qs = qs.filter(
-            Q(
-                Q(title__icontains=search_term) |
-                Q(description__icontains=search_term),
-            ),
-            is_published=True,
-        )
+        qs = get_search_backend(qs.db).search(qs, search_term)
 
         return qs
 
@@ -116,6 +208,11 @@ class RecipeListViewSearch(RecipeListViewBase):
         ctx = super().get_context_data(*args, **kwargs)
         search_term = self.request.GET.get('q', '')
 
+        for recipe in ctx.get('recipes'):
+            recipe.search_highlight = render_highlight(
+                getattr(recipe, 'search_snippet', '')
+            )
+
         ctx.update({
             'page_title': f'Search for "{search_term}" ',
             'search_term': search_term,
@@ -124,20 +221,25 @@ class RecipeListViewSearch(RecipeListViewBase):
         return ctx
 
 
-class RecipeListViewTag(RecipeListViewBase):
+class RecipeListViewTag(PageCacheMixin, RecipeListViewBase):
     template_name = 'recipes/pages/tag.html'
+    cursor_pagination = True
+
+    def get_page_cache_tags(self):
+        return [tag_page_tag(self.kwargs.get('slug', ''))]
 
     def get_queryset(self, *args, **kwargs):
         qs = super().get_queryset(*args, **kwargs)
         qs = qs.filter(tags__slug=self.kwargs.get('slug', ''))
         return qs
 
+    def get_tag(self):
+        return Tag.objects.filter(slug=self.kwargs.get('slug', '')).first()
+
     def get_context_data(self, *args, **kwargs):
         ctx = super().get_context_data(*args, **kwargs)
 
-        page_title = Tag.objects.filter(
-            slug=self.kwargs.get('slug', '')
-        ).first()
+        page_title = self.get_tag()
 
         if not page_title:
             page_title = 'No recipes found'
@@ -151,11 +253,15 @@ class RecipeListViewTag(RecipeListViewBase):
         return ctx
 
 
-class RecipeDetail(DetailView):
+@method_decorator(recipe_condition, name='dispatch')
+class RecipeDetail(PageCacheMixin, DetailView):
     model = Recipe
     context_object_name = 'recipe'
     template_name = 'recipes/pages/recipe-view.html'
 
+    def get_page_cache_tags(self):
+        return [recipe_page_tag(self.kwargs.get('pk'))]
+
     def get_queryset(self, *args, **kwargs):
         qs = super().get_queryset(*args, **kwargs)
         qs = qs.filter(is_published=True)
@@ -177,7 +283,7 @@ class RecipeDetailAPI(RecipeDetail):
         recipe_dict = model_to_dict(recipe)
 
         recipe_dict['created_at'] = str(recipe.created_at)
-        recipe_dict['updated_at'] = str(recipe.created_at)
+        recipe_dict['updated_at'] = str(recipe.updated_at)
 
         if recipe_dict.get('cover'):
             recipe_dict['cover'] = self.request.build_absolute_uri(
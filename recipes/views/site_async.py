@@ -0,0 +1,129 @@
+from django.http import Http404, StreamingHttpResponse
+
+from recipes.conditional import (aload_recipe_condition, alist_condition,
+                                 recipe_condition)
+from tag.models import Tag
+from utils.pagination import amake_cursor_pagination, amake_pagination
+
+from .site import (PER_PAGE, RecipeDetail, RecipeDetailAPI,
+                   RecipeListViewCategory, RecipeListViewHome,
+                   RecipeListViewHomeApi, RecipeListViewSearch,
+                   RecipeListViewTag, astream_json_list)
+
+
+class AsyncRecipeListMixin:
+    """
+    Serves a recipe list view from an async handler. The page is loaded
+    with the async ORM beforehand, so the sync context code only reads it
+    and the template renders without queries.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset()
+        context = await self.aget_context_data()
+        return self.render_to_response(context)
+
+    async def aget_context_data(self, **kwargs):
+        if self.uses_cursor_pagination():
+            self.page = await amake_cursor_pagination(
+                self.request, self.object_list, PER_PAGE
+            )
+        else:
+            page_obj, pagination_range = await amake_pagination(
+                self.request, self.object_list, PER_PAGE,
+                max_page=self.get_max_page(),
+            )
+            page_obj.object_list = [
+                recipe async for recipe in page_obj.object_list
+            ]
+            self.page = page_obj, pagination_range
+
+        return self.get_context_data(**kwargs)
+
+    def paginate_recipes(self, queryset):
+        return self.page
+
+
+class RecipeListViewHomeAsync(AsyncRecipeListMixin, RecipeListViewHome):
+    pass
+
+
+class RecipeListViewCategoryAsync(
+    AsyncRecipeListMixin, RecipeListViewCategory
+):
+    pass
+
+
+class RecipeListViewSearchAsync(AsyncRecipeListMixin, RecipeListViewSearch):
+    pass
+
+
+class RecipeListViewTagAsync(AsyncRecipeListMixin, RecipeListViewTag):
+    async def aget_context_data(self, **kwargs):
+        self.tag = await Tag.objects.filter(
+            slug=self.kwargs.get('slug', '')
+        ).afirst()
+        return await super().aget_context_data(**kwargs)
+
+    def get_tag(self):
+        return self.tag
+
+
+class RecipeListViewHomeApiAsync(RecipeListViewHomeApi):
+    async def get(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        conditional = await alist_condition(request, queryset)
+        return await conditional(self.astream_recipes)(request, queryset)
+
+    async def astream_recipes(self, request, queryset):
+        page_obj, _ = await amake_pagination(
+            request=request,
+            queryset=queryset.prefetch_related(None).values(),
+            per_page=self.get_per_page(),
+        )
+
+        return StreamingHttpResponse(
+            astream_json_list('recipes', page_obj.object_list),
+            content_type='application/json',
+        )
+
+
+class AsyncRecipeDetailMixin:
+    """Async handler for the recipe detail views."""
+
+    def dispatch(self, request, *args, **kwargs):
+        # RecipeDetail decorates dispatch with the sync recipe_condition,
+        # rewrap the page cached dispatch instead
+        async def handler(request, *args, **kwargs):
+            return await super(RecipeDetail, self).dispatch(
+                request, *args, **kwargs
+            )
+
+        async def conditional_dispatch():
+            await aload_recipe_condition(request, kwargs.get('pk'))
+            return await recipe_condition(handler)(request, *args, **kwargs)
+
+        return conditional_dispatch()
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        context = self.get_context_data(object=self.object)
+        return self.render_to_response(context)
+
+    async def aget_object(self):
+        queryset = self.get_queryset()\
+            .select_related('category')\
+            .prefetch_related('tags')
+
+        try:
+            return await queryset.aget(pk=self.kwargs.get('pk'))
+        except queryset.model.DoesNotExist:
+            raise Http404()
+
+
+class RecipeDetailAsync(AsyncRecipeDetailMixin, RecipeDetail):
+    pass
+
+
+class RecipeDetailAPIAsync(AsyncRecipeDetailMixin, RecipeDetailAPI):
+    pass
@@ -0,0 +1,21 @@
+import statistics
+
+
+def format_latencies(latencies):
+    """
+    Summary line of the p50, p95, p99 and max of ``latencies``, sorted
+    and in seconds.
+    """
+    quantiles = latencies * 99
+
+    if len(latencies) > 1:
+        quantiles = statistics.quantiles(
+            latencies, n=100, method='inclusive'
+        )
+
+    return (
+        f'latency p50 {quantiles[49] * 1000:.2f}ms, '
+        f'p95 {quantiles[94] * 1000:.2f}ms, '
+        f'p99 {quantiles[98] * 1000:.2f}ms, '
+        f'max {latencies[-1] * 1000:.2f}ms'
+    )
@@ -0,0 +1,143 @@
+import json
+import time
+from hashlib import md5
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils.functional import cached_property
+
+from utils.db_routing import mark_replicas_lagging, replicas_may_lag
+
+COUNT_VERSION_KEY = 'counting:version'
+
+
+def get_count_version():
+    version = cache.get(COUNT_VERSION_KEY)
+
+    if version is None:
+        # A fresh value keeps entries cached before an eviction unreachable
+        cache.add(COUNT_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(COUNT_VERSION_KEY)
+
+    return version
+
+
+def bump_count_version():
+    try:
+        cache.incr(COUNT_VERSION_KEY)
+    except ValueError:
+        cache.set(COUNT_VERSION_KEY, time.time_ns(), None)
+
+    mark_replicas_lagging()
+
+
+def invalidate_counts(using=None):
+    """
+    Expires every cached count, right away and again once the transaction
+    commits, so a count read before the commit is not kept.
+    """
+    bump_count_version()
+    transaction.on_commit(bump_count_version, using=using)
+
+
+def make_count_key(queryset):
+    sql, params = queryset.order_by().query.sql_with_params()
+    digest = md5(
+        f'{queryset.db}:{sql}:{params}'.encode('utf-8'),
+        usedforsecurity=False
+    ).hexdigest()
+    return f'counting:{get_count_version()}:{digest}'
+
+
+def estimate_count(queryset):
+    connection = connections[queryset.db]
+
+    if connection.vendor != 'postgresql':
+        return None
+
+    queryset = queryset.order_by()
+
+    if not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class '
+                'WHERE oid = %s::regclass',
+                (queryset.model._meta.db_table,)
+            )
+            row = cursor.fetchone()
+
+        # reltuples is -1 for tables that were never analyzed
+        if row and row[0] >= 0:
+            return row[0]
+
+    plan = json.loads(queryset.explain(format='json'))
+    return plan[0]['Plan']['Plan Rows']
+
+
+def count_queryset(queryset):
+    """Returns ``(count, is_approximate)``, served from the cache."""
+    try:
+        key = make_count_key(queryset)
+    except EmptyResultSet:
+        return 0, False
+
+    cached = cache.get(key)
+
+    if cached is not None:
+        return cached
+
+    # A lagging replica would cache the count from before the change
+    if replicas_may_lag():
+        queryset = queryset.using(DEFAULT_DB_ALIAS)
+
+    estimate = estimate_count(queryset)
+
+    if estimate is not None and estimate >= settings.COUNT_ESTIMATE_THRESHOLD:
+        result = (int(estimate), True)
+    else:
+        result = (queryset.count(), False)
+
+    cache.set(key, result, settings.COUNT_CACHE_TIMEOUT)
+    return result
+
+
+async def acount_queryset(queryset):
+    """Async ``count_queryset``, the exact count uses the async ORM."""
+    try:
+        key = await sync_to_async(make_count_key)(queryset)
+    except EmptyResultSet:
+        return 0, False
+
+    cached = await cache.aget(key)
+
+    if cached is not None:
+        return cached
+
+    if await sync_to_async(replicas_may_lag)():
+        queryset = queryset.using(DEFAULT_DB_ALIAS)
+
+    estimate = await sync_to_async(estimate_count)(queryset)
+
+    if estimate is not None and estimate >= settings.COUNT_ESTIMATE_THRESHOLD:
+        result = (int(estimate), True)
+    else:
+        result = (await queryset.acount(), False)
+
+    await cache.aset(key, result, settings.COUNT_CACHE_TIMEOUT)
+    return result
+
+
+class CachedCountPaginator(Paginator):
+    count_is_approximate = False
+
+    @cached_property
+    def count(self):
+        if not hasattr(self.object_list, 'query'):
+            return super().count
+
+        count, self.count_is_approximate = count_queryset(self.object_list)
+        return count
@@ -0,0 +1,127 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import request_finished
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.deprecation import MiddlewareMixin
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+REPLICA_LAG_KEY = 'db_routing:replicas_may_lag'
+
+# Bookkeeping written on almost every request (sessions are saved after
+# the view returns), it must not keep clients on the primary
+UNPINNED_APP_LABELS = ('sessions', 'admin', 'contenttypes')
+
+# Set per request by ReplicaRoutingMiddleware, outside requests (commands,
+# workers) everything goes to the primary
+_read_from_replica = ContextVar('read_from_replica', default=False)
+_wrote_to_primary = ContextVar('wrote_to_primary', default=False)
+
+
+def get_read_database():
+    # Replicas cannot see what an open transaction on the primary wrote
+    if (
+        settings.DATABASE_REPLICAS and
+        _read_from_replica.get() and
+        not _wrote_to_primary.get() and
+        not connections[DEFAULT_DB_ALIAS].in_atomic_block
+    ):
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    return DEFAULT_DB_ALIAS
+
+
+def mark_replicas_lagging():
+    """
+    Called when cached data is invalidated: for the next
+    ``DATABASE_REPLICA_STICKY_SECONDS`` the replicas may still serve the
+    old rows, which cache misses must not store under the new keys.
+    """
+    if settings.DATABASE_REPLICAS and settings.DATABASE_REPLICA_STICKY_SECONDS:
+        cache.set(
+            REPLICA_LAG_KEY, True, settings.DATABASE_REPLICA_STICKY_SECONDS
+        )
+
+
+def replicas_may_lag():
+    return bool(settings.DATABASE_REPLICAS) and cache.get(
+        REPLICA_LAG_KEY, False
+    )
+
+
+def read_from_primary():
+    """Sends the reads of the rest of the current request to the primary."""
+    _read_from_replica.set(False)
+
+
+class ReplicaRouter:
+    """
+    Sends the reads of safe requests to a random replica and everything
+    else to the primary. Once a request writes app data, or inside a
+    transaction, its reads follow the primary too.
+    """
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get('instance')
+
+        # Relations are read from the database their object came from
+        if instance is not None and instance._state.db:
+            return instance._state.db
+
+        return get_read_database()
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label not in UNPINNED_APP_LABELS:
+            _wrote_to_primary.set(True)
+
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+
+        return None
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+    """
+    Lets GET requests read from the replicas, unless the client wrote in
+    the last ``DATABASE_REPLICA_STICKY_SECONDS``: requests that write set a
+    cookie keeping the client on the primary until the replicas caught up.
+    """
+
+    def process_request(self, request):
+        _wrote_to_primary.set(False)
+        _read_from_replica.set(
+            request.method in SAFE_METHODS and
+            settings.DATABASE_REPLICA_STICKY_COOKIE not in request.COOKIES
+        )
+
+    def process_response(self, request, response):
+        if (
+            settings.DATABASE_REPLICAS and
+            settings.DATABASE_REPLICA_STICKY_SECONDS and
+            _wrote_to_primary.get()
+        ):
+            response.set_cookie(
+                settings.DATABASE_REPLICA_STICKY_COOKIE,
+                '1',
+                max_age=settings.DATABASE_REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+
+        return response
+
+
+def reset_replica_routing(**kwargs):
+    # Streaming responses still read after process_response
+    _read_from_replica.set(False)
+    _wrote_to_primary.set(False)
+
+
+request_finished.connect(reset_replica_routing)
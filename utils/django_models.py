@@ -0,0 +1,117 @@
+import copy
+
+from django.db.models.fields.files import FieldFile
+
+
+def freeze_value(value):
+    if isinstance(value, FieldFile):
+        return value.name
+
+    if isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
+
+    return value
+
+
+class DirtyFieldsMixin:
+    """
+    Remembers the field values an instance was loaded or saved with, so
+    saves can tell what changed without reading the row again.
+
+    Saving a loaded instance without ``update_fields`` only writes the
+    changed fields (plus ``auto_now`` ones).
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = instance.get_field_values()
+        return instance
+
+    def get_field_values(self, fields=None):
+        return {
+            field.attname: freeze_value(self.__dict__[field.attname])
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__ and (
+                fields is None or
+                field.name in fields or
+                field.attname in fields
+            )
+        }
+
+    def is_tracked(self, *field_names):
+        """Whether the loaded values of ``field_names`` are known."""
+        loaded = getattr(self, '_loaded_values', None)
+
+        if (
+            loaded is None or
+            self._state.adding or
+            self.pk is None or
+            loaded.get(self._meta.pk.attname) != self.pk
+        ):
+            return False
+
+        return all(
+            self._meta.get_field(name).attname in loaded
+            for name in field_names
+        )
+
+    def get_loaded_value(self, field_name):
+        attname = self._meta.get_field(field_name).attname
+        return self._loaded_values[attname]
+
+    def get_changed_fields(self):
+        """Names of the changed fields, None when nothing was loaded."""
+        if not self.is_tracked():
+            return None
+
+        current = self.get_field_values()
+        changed = set()
+
+        for field in self._meta.concrete_fields:
+            if field.attname not in current:
+                continue
+
+            if (
+                field.attname not in self._loaded_values or
+                self._loaded_values[field.attname] != current[field.attname]
+            ):
+                changed.add(field.name)
+
+        return changed
+
+    def has_changed(self, field_name):
+        changed = self.get_changed_fields()
+        return changed is None or field_name in changed
+
+    def save(self, *args, **kwargs):
+        changed = self.get_changed_fields()
+
+        if (
+            changed is not None and
+            not args and
+            kwargs.get('update_fields') is None and
+            not kwargs.get('force_insert')
+        ):
+            kwargs['update_fields'] = changed | {
+                field.name for field in self._meta.concrete_fields
+                if getattr(field, 'auto_now', False)
+            }
+
+        saved = super().save(*args, **kwargs)
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or not self.is_tracked():
+            self._loaded_values = self.get_field_values()
+        else:
+            self._loaded_values.update(self.get_field_values(update_fields))
+
+        return saved
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using, fields, from_queryset)
+
+        if fields is None or not self.is_tracked():
+            self._loaded_values = self.get_field_values()
+        else:
+            self._loaded_values.update(self.get_field_values(fields))
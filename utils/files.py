@@ -0,0 +1,105 @@
+import logging
+import os
+import time
+import weakref
+from collections import defaultdict
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+
+def delete_files(storage, names):
+    deleted = 0
+
+    for name in names:
+        try:
+            storage.delete(name)
+        except OSError as e:
+            logger.warning('Could not delete %s: %s', name, e)
+        else:
+            deleted += 1
+
+    return deleted
+
+
+class FileDeletionBatch:
+    def __init__(self):
+        self.names = defaultdict(set)
+
+    def add(self, storage, names):
+        self.names[storage].update(names)
+
+    def delete(self):
+        for storage, names in self.names.items():
+            delete_files(storage, sorted(names))
+
+
+def delete_files_on_commit(storage, names, using=DEFAULT_DB_ALIAS):
+    """
+    Deletes ``names`` from ``storage`` once the current transaction
+    commits, so a rollback keeps the files its rows still point to.
+
+    Every deletion requested in the same transaction (or savepoint) is
+    grouped in a single on_commit callback.
+    """
+    names = [name for name in names if name]
+
+    if not names:
+        return
+
+    connection = connections[using]
+
+    if not connection.in_atomic_block:
+        delete_files(storage, names)
+        return
+
+    # Batches only live as long as their callback is queued: a rollback
+    # drops the callback and the batch with it
+    batches = connection.__dict__.setdefault(
+        '_file_deletion_batches', weakref.WeakValueDictionary()
+    )
+    key = tuple(connection.savepoint_ids)
+    batch = batches.get(key)
+
+    if batch is None:
+        batch = FileDeletionBatch()
+        batches[key] = batch
+        transaction.on_commit(batch.delete, using=using)
+
+    batch.add(storage, names)
+
+
+def iter_orphan_files(storage, root, get_referenced_names, min_age=3600):
+    """
+    Walks ``root`` one directory at a time and yields the names of files
+    older than ``min_age`` seconds that no row references.
+
+    ``get_referenced_names(prefix)`` returns the set of names stored for
+    the files under ``prefix``, so each directory costs a single query.
+    """
+    root_path = storage.path(root)
+    newest = time.time() - min_age
+
+    for dirpath, _, filenames in os.walk(root_path):
+        if not filenames:
+            continue
+
+        prefix = os.path.relpath(dirpath, storage.location)
+        prefix = prefix.replace(os.sep, '/').rstrip('/') + '/'
+        referenced = get_referenced_names(prefix)
+
+        for filename in filenames:
+            name = f'{prefix}{filename}'
+
+            if name in referenced:
+                continue
+
+            try:
+                modified = os.stat(os.path.join(dirpath, filename)).st_mtime
+            except FileNotFoundError:
+                continue
+
+            # Uploads reach the disk before their row is committed
+            if modified <= newest:
+                yield name
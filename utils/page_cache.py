@@ -0,0 +1,181 @@
+from hashlib import md5
+from uuid import uuid4
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils import translation
+from django.utils.cache import patch_vary_headers
+
+from utils.db_routing import (mark_replicas_lagging, read_from_primary,
+                              replicas_may_lag)
+
+PAGE_CACHE_PREFIX = 'page_cache'
+PAGE_CACHE_HEADER = 'X-Page-Cache'
+PAGE_CACHE_STATS = ('hits', 'misses')
+
+
+def make_tag_key(tag):
+    return f'{PAGE_CACHE_PREFIX}:tag:{tag}'
+
+
+def get_tag_versions(tags):
+    keys = [make_tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    missing = {key: uuid4().hex for key in keys if key not in versions}
+
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+
+    return [versions[key] for key in keys]
+
+
+def bump_page_tags(tags):
+    cache.set_many({make_tag_key(tag): uuid4().hex for tag in tags}, None)
+    mark_replicas_lagging()
+
+
+def invalidate_page_tags(tags, using=None):
+    """
+    Expires every cached page that depends on one of ``tags``.
+
+    The versions are bumped right away and again once the transaction
+    commits, so a page rendered from uncommitted data is not kept.
+    """
+    tags = set(tags)
+
+    if not tags:
+        return
+
+    bump_page_tags(tags)
+    transaction.on_commit(lambda: bump_page_tags(tags), using=using)
+
+
+def record_page_cache_stat(stat):
+    key = f'{PAGE_CACHE_PREFIX}:stats:{stat}'
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def get_page_cache_stats():
+    keys = {f'{PAGE_CACHE_PREFIX}:stats:{stat}': stat
+            for stat in PAGE_CACHE_STATS}
+    values = cache.get_many(keys)
+    return {stat: values.get(key, 0) for key, stat in keys.items()}
+
+
+def reset_page_cache_stats():
+    cache.delete_many([
+        f'{PAGE_CACHE_PREFIX}:stats:{stat}' for stat in PAGE_CACHE_STATS
+    ])
+
+
+class PageCacheMixin:
+    """
+    Caches the rendered response of anonymous GET requests.
+
+    Subclasses list the tags their page depends on in
+    ``get_page_cache_tags``; ``invalidate_page_tags`` expires them.
+    """
+    page_cache_query_params = ('page', 'q', 'cursor')
+
+    def get_page_cache_tags(self):
+        raise NotImplementedError
+
+    def is_page_cacheable(self, request):
+        if request.method not in ('GET', 'HEAD'):
+            return False
+
+        # Visitors with a session or pending messages get personal pages
+        return not (
+            settings.SESSION_COOKIE_NAME in request.COOKIES or
+            'messages' in request.COOKIES
+        )
+
+    def get_page_cache_key(self, request):
+        tags = self.get_page_cache_tags()
+        versions = get_tag_versions(tags)
+        query = [
+            (param, request.GET.get(param))
+            for param in self.page_cache_query_params
+            if param in request.GET
+        ]
+        key = md5(
+            f'{request.path}:{query}:{translation.get_language()}:'
+            f'{versions}'.encode('utf-8'),
+            usedforsecurity=False
+        ).hexdigest()
+        return f'{PAGE_CACHE_PREFIX}:page:{key}'
+
+    def make_cached_response(self, cached):
+        content, content_type = cached
+        response = HttpResponse(content, content_type=content_type)
+        response[PAGE_CACHE_HEADER] = 'HIT'
+        patch_vary_headers(response, ('Cookie', 'Accept-Language'))
+        return response
+
+    def store_response(self, key, response):
+        if response.status_code == 200 and not response.streaming:
+            def store(rendered_response):
+                cache.set(
+                    key,
+                    (rendered_response.content,
+                     rendered_response['Content-Type']),
+                    settings.PAGE_CACHE_TIMEOUT
+                )
+
+            if getattr(response, 'is_rendered', True):
+                store(response)
+            else:
+                response.add_post_render_callback(store)
+
+        response[PAGE_CACHE_HEADER] = 'MISS'
+        patch_vary_headers(response, ('Cookie', 'Accept-Language'))
+        return response
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.is_page_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        if self.view_is_async:
+            return self.apage_cache_dispatch(request, *args, **kwargs)
+
+        key = self.get_page_cache_key(request)
+        cached = cache.get(key)
+
+        if cached is not None:
+            record_page_cache_stat('hits')
+            return self.make_cached_response(cached)
+
+        record_page_cache_stat('misses')
+
+        # The page stays cached under the new versions, a lagging replica
+        # would render it from the rows they replaced
+        if replicas_may_lag():
+            read_from_primary()
+
+        response = super().dispatch(request, *args, **kwargs)
+        return self.store_response(key, response)
+
+    async def apage_cache_dispatch(self, request, *args, **kwargs):
+        key = await sync_to_async(self.get_page_cache_key)(request)
+        cached = await cache.aget(key)
+
+        if cached is not None:
+            await sync_to_async(record_page_cache_stat)('hits')
+            return self.make_cached_response(cached)
+
+        await sync_to_async(record_page_cache_stat)('misses')
+
+        if await sync_to_async(replicas_may_lag)():
+            read_from_primary()
+
+        response = await super().dispatch(request, *args, **kwargs)
+        return await sync_to_async(self.store_response)(key, response)
@@ -1,6 +1,8 @@
 import math
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from functools import partial
 
-from django.core.paginator import Paginator
+from utils.counting import CachedCountPaginator, acount_queryset
 
 
 def make_pagination_range(
@@ -36,19 +38,222 @@ def make_pagination_range(
     }
 
 
-def make_pagination(request, queryset, per_page, qty_pages=4):
+def paginate_with(request, paginator, qty_pages, max_page=None):
+    """
+    Numbered page of ``request``. With ``max_page``, deeper pages are not
+    served: the last numbered page links to the next ones with a keyset
+    cursor, so paging never runs a deep OFFSET.
+    """
     try:
         current_page = int(request.GET.get('page', 1))
     except ValueError:
         current_page = 1
 
-    paginator = Paginator(queryset, per_page)
+    if max_page is not None:
+        current_page = min(current_page, max_page)
+
     page_obj = paginator.get_page(current_page)
+    page_range = paginator.page_range
+    capped = max_page is not None and paginator.num_pages > max_page
+
+    if capped:
+        page_range = range(1, max_page + 1)
 
+    # get_page clamps out of range pages, the links must follow it
     pagination_range = make_pagination_range(
-        paginator.page_range,
+        page_range,
         qty_pages,
-        current_page
+        page_obj.number
+    )
+    pagination_range['total_is_approximate'] = getattr(
+        paginator, 'count_is_approximate', False
     )
+    pagination_range['next_cursor'] = None
+
+    # An estimated last page may point past the real end of the rows
+    if pagination_range['total_is_approximate']:
+        pagination_range['last_page_is_out_of_range'] = False
+
+    if capped:
+        pagination_range['last_page_is_out_of_range'] = False
+
+        if page_obj.number == max_page:
+            # Called by the template, once the page rows are loaded
+            pagination_range['next_cursor'] = partial(
+                get_next_cursor, page_obj
+            )
 
     return page_obj, pagination_range
+
+
+def make_pagination(
+        request,
+        queryset,
+        per_page,
+        qty_pages=4,
+        paginator_class=CachedCountPaginator,
+        max_page=None,
+):
+    paginator = paginator_class(queryset, per_page)
+    return paginate_with(request, paginator, qty_pages, max_page)
+
+
+async def amake_pagination(
+        request,
+        queryset,
+        per_page,
+        qty_pages=4,
+        paginator_class=CachedCountPaginator,
+        max_page=None,
+):
+    """
+    Async ``make_pagination``. The count is awaited, the rows of the page
+    are still a lazy queryset.
+    """
+    paginator = paginator_class(queryset, per_page)
+    paginator.count, paginator.count_is_approximate = await acount_queryset(
+        queryset
+    )
+    return paginate_with(request, paginator, qty_pages, max_page)
+
+
+CURSOR_PARAM = 'cursor'
+
+
+def encode_cursor(direction, position):
+    cursor = f'{direction}:{position}'.encode('ascii')
+    return urlsafe_b64encode(cursor).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        decoded = urlsafe_b64decode(cursor + padding).decode('ascii')
+        direction, position = decoded.split(':')
+        position = int(position)
+    except (TypeError, ValueError, UnicodeDecodeError):
+        return None, None
+
+    if direction not in ('n', 'p'):
+        return None, None
+
+    return direction, position
+
+
+def get_next_cursor(page_obj):
+    """Cursor of the rows after a numbered page ordered by ``-id``."""
+    return encode_cursor('n', page_obj[len(page_obj) - 1].id)
+
+
+class CursorPage:
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<Cursor page of {len(self)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def get_cursor_queryset(queryset, per_page, direction=None, position=None):
+    # One extra row tells whether there is another page
+    if direction == 'p':
+        return queryset.filter(id__gt=position).order_by('id')[:per_page + 1]
+
+    if direction == 'n':
+        queryset = queryset.filter(id__lt=position)
+
+    return queryset.order_by('-id')[:per_page + 1]
+
+
+def make_cursor_page_from_rows(rows, per_page, direction=None):
+    has_more = len(rows) > per_page
+
+    if direction == 'p':
+        rows = rows[:per_page][::-1]
+        has_next, has_previous = True, has_more
+    else:
+        rows = rows[:per_page]
+        has_next, has_previous = has_more, direction == 'n'
+
+    if not rows:
+        return None
+
+    return CursorPage(
+        rows,
+        next_cursor=encode_cursor('n', rows[-1].id) if has_next else None,
+        previous_cursor=(
+            encode_cursor('p', rows[0].id) if has_previous else None
+        ),
+    )
+
+
+def make_cursor_page(queryset, per_page, direction=None, position=None):
+    rows = list(get_cursor_queryset(queryset, per_page, direction, position))
+    return make_cursor_page_from_rows(rows, per_page, direction)
+
+
+async def amake_cursor_page(queryset, per_page, direction=None, position=None):
+    rows = [
+        row async for row in
+        get_cursor_queryset(queryset, per_page, direction, position)
+    ]
+    return make_cursor_page_from_rows(rows, per_page, direction)
+
+
+def make_cursor_pagination_range(page_obj):
+    return {
+        'cursor_mode': True,
+        'next_cursor': page_obj.next_cursor,
+        'previous_cursor': page_obj.previous_cursor,
+    }
+
+
+def make_cursor_pagination(request, queryset, per_page):
+    per_page = int(per_page)
+    direction, position = decode_cursor(request.GET.get(CURSOR_PARAM, ''))
+    page_obj = None
+
+    if direction is not None:
+        page_obj = make_cursor_page(queryset, per_page, direction, position)
+
+    if page_obj is None:
+        # Stale or invalid cursors fall back to the first page
+        page_obj = make_cursor_page(queryset, per_page) or CursorPage([])
+
+    return page_obj, make_cursor_pagination_range(page_obj)
+
+
+async def amake_cursor_pagination(request, queryset, per_page):
+    per_page = int(per_page)
+    direction, position = decode_cursor(request.GET.get(CURSOR_PARAM, ''))
+    page_obj = None
+
+    if direction is not None:
+        page_obj = await amake_cursor_page(
+            queryset, per_page, direction, position
+        )
+
+    if page_obj is None:
+        page_obj = await amake_cursor_page(queryset, per_page) or \
+            CursorPage([])
+
+    return page_obj, make_cursor_pagination_range(page_obj)
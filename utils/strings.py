@@ -1,3 +1,7 @@
+# Largest value of a bigint column, larger ids overflow the database
+MAX_ID = 2 ** 63 - 1
+
+
 def is_positive_number(value):
     try:
         number_string = float(value)
@@ -5,3 +9,13 @@ def is_positive_number(value):
         return False
 
     return number_string > 0
+
+
+def parse_positive_int(value, maximum=MAX_ID):
+    """``value`` as an int in ``1..maximum``, None when it is not one."""
+    try:
+        number = int(value)
+    except (ValueError, TypeError):
+        return None
+
+    return number if 1 <= number <= maximum else None
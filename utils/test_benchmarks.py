@@ -0,0 +1,19 @@
+from django.test import SimpleTestCase
+
+from utils.benchmarks import format_latencies
+
+
+class BenchmarksTest(SimpleTestCase):
+    def test_format_latencies_reports_quantiles_in_milliseconds(self):
+        latencies = [index / 1000 for index in range(1, 101)]
+
+        self.assertEqual(
+            format_latencies(latencies),
+            'latency p50 50.50ms, p95 95.05ms, p99 99.01ms, max 100.00ms',
+        )
+
+    def test_format_latencies_of_a_single_request(self):
+        self.assertEqual(
+            format_latencies([0.002]),
+            'latency p50 2.00ms, p95 2.00ms, p99 2.00ms, max 2.00ms',
+        )
@@ -0,0 +1,104 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+
+from recipes.models import Recipe
+from recipes.tests.test_recipe_base import RecipeMixin
+from utils.counting import (CachedCountPaginator, count_queryset,
+                            make_count_key)
+from utils.pagination import make_pagination
+
+
+class CountingTest(TestCase, RecipeMixin):
+    def setUp(self):
+        cache.clear()
+        return super().setUp()
+
+    def test_count_queryset_is_served_from_cache(self):
+        self.make_recipe_in_batch(qty=3)
+        queryset = Recipe.objects.filter(is_published=True)
+
+        self.assertEqual((3, False), count_queryset(queryset))
+
+        with self.assertNumQueries(0):
+            self.assertEqual((3, False), count_queryset(queryset))
+
+    def test_recipe_changes_invalidate_cached_counts(self):
+        recipe = self.make_recipe()
+        queryset = Recipe.objects.filter(is_published=True)
+        self.assertEqual((1, False), count_queryset(queryset))
+
+        recipe.is_published = False
+        recipe.save()
+
+        self.assertEqual((0, False), count_queryset(queryset))
+
+    def test_counts_read_before_the_commit_are_not_kept(self):
+        queryset = Recipe.objects.filter(is_published=True)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.make_recipe()
+            # A concurrent request still sees the old rows
+            cache.set(make_count_key(queryset), (0, False))
+
+        self.assertEqual((1, False), count_queryset(queryset))
+
+    def test_empty_queryset_counts_zero_without_query(self):
+        with self.assertNumQueries(0):
+            self.assertEqual((0, False), count_queryset(Recipe.objects.none()))
+
+    @override_settings(COUNT_ESTIMATE_THRESHOLD=1000)
+    @patch('utils.counting.estimate_count', return_value=2500)
+    def test_estimate_above_threshold_is_used_as_approximate_count(self, _):
+        queryset = Recipe.objects.filter(is_published=True)
+
+        with self.assertNumQueries(0):
+            self.assertEqual((2500, True), count_queryset(queryset))
+
+    @override_settings(COUNT_ESTIMATE_THRESHOLD=1000)
+    @patch('utils.counting.estimate_count', return_value=10)
+    def test_estimate_below_threshold_runs_exact_count(self, _):
+        self.make_recipe()
+        queryset = Recipe.objects.filter(is_published=True)
+
+        self.assertEqual((1, False), count_queryset(queryset))
+
+    def test_paginator_counts_plain_sequences(self):
+        paginator = CachedCountPaginator([1, 2, 3], 2)
+
+        self.assertEqual(paginator.count, 3)
+        self.assertFalse(paginator.count_is_approximate)
+
+    @override_settings(COUNT_ESTIMATE_THRESHOLD=1000)
+    @patch('utils.counting.estimate_count', return_value=2000)
+    def test_pagination_range_follows_approximate_total(self, _):
+        self.make_recipe_in_batch(qty=3)
+        request = RequestFactory().get('/?page=500')
+
+        page_obj, pagination_range = make_pagination(
+            request, Recipe.objects.order_by('-id'), per_page=10
+        )
+
+        self.assertEqual(page_obj.paginator.num_pages, 200)
+        self.assertEqual(page_obj.number, 200)
+        self.assertTrue(pagination_range['total_is_approximate'])
+        self.assertEqual(pagination_range['total_pages'], 200)
+        self.assertEqual(
+            [197, 198, 199, 200], list(pagination_range['pagination'])
+        )
+        self.assertTrue(pagination_range['first_page_is_out_of_range'])
+        self.assertFalse(pagination_range['last_page_is_out_of_range'])
+
+    @override_settings(COUNT_ESTIMATE_THRESHOLD=1000)
+    @patch('utils.counting.estimate_count', return_value=2000)
+    def test_approximate_total_hides_the_last_page_link(self, _):
+        self.make_recipe_in_batch(qty=3)
+        request = RequestFactory().get('/?page=1')
+
+        _, pagination_range = make_pagination(
+            request, Recipe.objects.order_by('-id'), per_page=10
+        )
+
+        self.assertEqual([1, 2, 3, 4], list(pagination_range['pagination']))
+        self.assertFalse(pagination_range['last_page_is_out_of_range'])
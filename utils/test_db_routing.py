@@ -0,0 +1,125 @@
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.db import connections
+from django.http import HttpResponse
+from django.test import (AsyncRequestFactory, RequestFactory, SimpleTestCase,
+                         override_settings)
+
+from utils.db_routing import (ReplicaRouter, ReplicaRoutingMiddleware,
+                              reset_replica_routing)
+
+REPLICAS = ['replica_1', 'replica_2']
+
+
+@override_settings(
+    DATABASE_REPLICAS=REPLICAS,
+    DATABASE_REPLICA_STICKY_SECONDS=10,
+    DATABASE_REPLICA_STICKY_COOKIE='use_primary',
+)
+class ReplicaRoutingTest(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.databases_used = []
+        self.addCleanup(reset_replica_routing)
+        return super().setUp()
+
+    def view(self, request, write=False):
+        self.databases_used.append(self.router.db_for_read(User))
+
+        if write:
+            self.databases_used.append(self.router.db_for_write(User))
+            self.databases_used.append(self.router.db_for_read(User))
+
+        return HttpResponse()
+
+    def request(self, method='get', write=False, **kwargs):
+        request = getattr(RequestFactory(), method)('/', **kwargs)
+        middleware = ReplicaRoutingMiddleware(
+            lambda request: self.view(request, write)
+        )
+        return middleware(request)
+
+    def test_get_requests_read_from_a_replica(self):
+        response = self.request()
+
+        self.assertIn(self.databases_used[0], REPLICAS)
+        self.assertNotIn('use_primary', response.cookies)
+
+    def test_other_requests_read_from_the_primary(self):
+        self.request('post')
+
+        self.assertEqual(self.databases_used, ['default'])
+
+    def test_writes_go_to_the_primary_and_pin_the_client(self):
+        response = self.request('post', write=True)
+
+        self.assertEqual(self.databases_used, ['default'] * 3)
+        self.assertEqual(response.cookies['use_primary']['max-age'], 10)
+
+    def test_session_writes_do_not_pin_the_client(self):
+        def view(request):
+            self.databases_used.append(self.router.db_for_write(Session))
+            self.databases_used.append(self.router.db_for_read(User))
+            return HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(view)
+        response = middleware(RequestFactory().get('/'))
+
+        self.assertEqual(self.databases_used[0], 'default')
+        self.assertIn(self.databases_used[1], REPLICAS)
+        self.assertNotIn('use_primary', response.cookies)
+
+    def test_relations_are_read_where_their_object_came_from(self):
+        user = User()
+        user._state.db = 'default'
+
+        def view(request):
+            self.databases_used.append(
+                self.router.db_for_read(User, instance=user)
+            )
+            return HttpResponse()
+
+        ReplicaRoutingMiddleware(view)(RequestFactory().get('/'))
+
+        self.assertEqual(self.databases_used, ['default'])
+
+    def test_reads_after_a_write_follow_the_primary(self):
+        self.request(write=True)
+
+        self.assertIn(self.databases_used[0], REPLICAS)
+        self.assertEqual(self.databases_used[1:], ['default'] * 2)
+
+    def test_pinned_clients_read_from_the_primary(self):
+        self.request(headers={'Cookie': 'use_primary=1'})
+
+        self.assertEqual(self.databases_used, ['default'])
+
+    def test_outside_requests_reads_go_to_the_primary(self):
+        self.request()
+        reset_replica_routing()
+
+        self.assertEqual(self.router.db_for_read(User), 'default')
+
+    def test_reads_inside_a_transaction_go_to_the_primary(self):
+        with patch.object(connections['default'], 'in_atomic_block', True):
+            self.request()
+
+        self.assertEqual(self.databases_used, ['default'])
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_goes_to_the_primary(self):
+        response = self.request(write=True)
+
+        self.assertEqual(self.databases_used, ['default'] * 3)
+        self.assertNotIn('use_primary', response.cookies)
+
+    async def test_async_get_requests_read_from_a_replica(self):
+        async def get_response(request):
+            return self.view(request)
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        await middleware(AsyncRequestFactory().get('/'))
+
+        self.assertIn(self.databases_used[0], REPLICAS)
@@ -0,0 +1,70 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from recipes.models import Recipe
+from recipes.tests.test_recipe_base import RecipeMixin
+
+
+class DirtyFieldsMixinTest(TestCase, RecipeMixin):
+    def get_recipe(self):
+        return Recipe.objects.get(pk=self.make_recipe().pk)
+
+    def test_unsaved_instance_is_not_tracked(self):
+        recipe = Recipe(title='Unsaved')
+
+        self.assertIsNone(recipe.get_changed_fields())
+        self.assertTrue(recipe.has_changed('title'))
+
+    def test_loaded_instance_reports_changed_fields(self):
+        recipe = self.get_recipe()
+        self.assertEqual(recipe.get_changed_fields(), set())
+
+        recipe.title = 'New title'
+        recipe.category = None
+        recipe.cover_variants['width'] = 10
+
+        self.assertEqual(
+            recipe.get_changed_fields(),
+            {'title', 'category', 'cover_variants'}
+        )
+        self.assertEqual(recipe.get_loaded_value('title'), 'Recipe Title')
+
+    def test_save_only_writes_changed_fields(self):
+        recipe = self.get_recipe()
+        recipe.is_published = False
+
+        with CaptureQueriesContext(connection) as queries:
+            recipe.save()
+
+        sql = [query['sql'] for query in queries.captured_queries]
+        updates = [q for q in sql if q.startswith('UPDATE "recipes_recipe"')]
+
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"is_published"', updates[0])
+        self.assertIn('"updated_at"', updates[0])
+        self.assertNotIn('"title"', updates[0])
+        # The old row is not read again just to compare fields
+        self.assertFalse(
+            any('"recipes_recipe"."cover"' in query for query in sql)
+        )
+
+    def test_save_and_refresh_reset_the_loaded_values(self):
+        recipe = self.get_recipe()
+        recipe.title = 'Saved title'
+        recipe.save()
+
+        self.assertEqual(recipe.get_changed_fields(), set())
+
+        Recipe.objects.filter(pk=recipe.pk).update(title='Other title')
+        recipe.refresh_from_db(fields=['title'])
+
+        self.assertEqual(recipe.get_loaded_value('title'), 'Other title')
+        self.assertEqual(recipe.get_changed_fields(), set())
+
+    def test_deferred_fields_are_not_reported(self):
+        self.make_recipe()
+        recipe = Recipe.objects.only('id', 'title').get()
+
+        self.assertFalse(recipe.is_tracked('description'))
+        self.assertEqual(recipe.get_changed_fields(), set())
@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.test import TestCase
+
+from utils.files import delete_files_on_commit, iter_orphan_files
+
+
+class FilesTest(TestCase):
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+        self.storage = FileSystemStorage(location=self.location)
+        return super().setUp()
+
+    def tearDown(self):
+        shutil.rmtree(self.location, ignore_errors=True)
+        return super().tearDown()
+
+    def make_file(self, name, age=0):
+        name = self.storage.save(name, ContentFile(b'file'))
+        modified = os.path.getmtime(self.storage.path(name)) - age
+        os.utime(self.storage.path(name), (modified, modified))
+        return name
+
+    def test_deletion_waits_for_commit_and_is_batched(self):
+        first = self.make_file('a.txt')
+        second = self.make_file('b.txt')
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            delete_files_on_commit(self.storage, [first])
+            delete_files_on_commit(self.storage, [second, ''])
+            self.assertTrue(self.storage.exists(first))
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertFalse(self.storage.exists(first))
+        self.assertFalse(self.storage.exists(second))
+
+    def test_rolled_back_deletion_keeps_the_file(self):
+        name = self.make_file('a.txt')
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    delete_files_on_commit(self.storage, [name])
+                    raise ValueError
+            except ValueError:
+                ...
+
+        self.assertEqual(callbacks, [])
+        self.assertTrue(self.storage.exists(name))
+
+    def test_iter_orphan_files_skips_referenced_and_recent_files(self):
+        kept = self.make_file('covers/2024/01/01/kept.jpg', age=7200)
+        orphan = self.make_file('covers/2024/01/01/orphan.jpg', age=7200)
+        self.make_file('covers/2024/01/01/recent.jpg')
+        prefixes = []
+
+        def get_referenced_names(prefix):
+            prefixes.append(prefix)
+            return {kept}
+
+        orphans = list(
+            iter_orphan_files(self.storage, 'covers', get_referenced_names)
+        )
+
+        self.assertEqual(orphans, [orphan])
+        self.assertEqual(prefixes, ['covers/2024/01/01/'])
@@ -1,6 +1,7 @@
 from unittest import TestCase
 
-from utils.pagination import make_pagination_range
+from utils.pagination import (decode_cursor, encode_cursor,
+                              make_pagination_range)
 
 
 class PaginationTest(TestCase):
@@ -102,4 +103,15 @@ class PaginationTest(TestCase):
             current_page=21,
         )['pagination']
 
-        self.assertEqual([17, 18, 19, 20], pagination)
\ No newline at end of file
+        self.assertEqual([17, 18, 19, 20], pagination)
+
+    def test_cursor_is_opaque_and_round_trips(self):
+        cursor = encode_cursor('n', 5000)
+
+        self.assertNotIn('5000', cursor)
+        self.assertEqual(('n', 5000), decode_cursor(cursor))
+
+    def test_invalid_cursor_is_decoded_as_no_cursor(self):
+        self.assertEqual((None, None), decode_cursor('not a cursor'))
+        self.assertEqual((None, None), decode_cursor(encode_cursor('x', 1)))
+        self.assertEqual((None, None), decode_cursor(encode_cursor('n', 'a')))
@@ -0,0 +1,131 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import (RequestFactory, SimpleTestCase, TestCase,
+                         override_settings)
+
+from utils.throttling import (ConcurrencyLimiter, TokenBucket,
+                              check_shared_cache, limit_concurrency)
+
+
+class TokenBucketTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        return super().setUp()
+
+    def test_bucket_allows_its_capacity_then_asks_to_wait(self):
+        bucket = TokenBucket('test', capacity=3, duration=60)
+
+        for _ in range(3):
+            self.assertEqual(0, bucket.consume(now=1000))
+
+        self.assertEqual(20, bucket.consume(now=1000))
+
+    def test_bucket_refills_over_time(self):
+        bucket = TokenBucket('test', capacity=3, duration=60)
+
+        for _ in range(3):
+            bucket.consume(now=1000)
+
+        self.assertEqual(0, bucket.consume(now=1020))
+        self.assertEqual(20, bucket.consume(now=1020))
+
+    def test_buckets_are_shared_by_key(self):
+        TokenBucket('test', capacity=1, duration=60).consume(now=1000)
+
+        self.assertGreater(
+            TokenBucket('test', capacity=1, duration=60).consume(now=1000), 0
+        )
+        self.assertEqual(
+            0, TokenBucket('other', capacity=1, duration=60).consume(now=1000)
+        )
+
+
+@override_settings(LOAD_SHED_LIMITS={'test': 2})
+class ConcurrencyLimiterTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        return super().setUp()
+
+    def test_limiter_refuses_requests_over_the_limit(self):
+        limiter = ConcurrencyLimiter('test')
+
+        self.assertTrue(limiter.acquire())
+        self.assertTrue(limiter.acquire())
+        self.assertFalse(limiter.acquire())
+
+        limiter.release()
+
+        self.assertTrue(limiter.acquire())
+
+    def test_limit_concurrency_answers_503_and_frees_its_slot(self):
+        limiter = ConcurrencyLimiter('test')
+        view = limit_concurrency('test')(lambda request: HttpResponse())
+        request = RequestFactory().get('/')
+
+        self.assertEqual(200, view(request).status_code)
+
+        limiter.acquire()
+        limiter.acquire()
+        response = view(request)
+
+        self.assertEqual(503, response.status_code)
+        self.assertIn('Retry-After', response)
+
+    def test_acquire_keeps_the_counter_alive(self):
+        limiter = ConcurrencyLimiter('test')
+
+        with patch.object(cache, 'touch') as touch:
+            limiter.acquire()
+
+        touch.assert_called_once_with(limiter.key, 60)
+
+    def test_counter_never_goes_below_zero(self):
+        limiter = ConcurrencyLimiter('test')
+        limiter.acquire()
+        # Expired while the request was running
+        cache.delete(limiter.key)
+        limiter.acquire()
+
+        limiter.release()
+        limiter.release()
+
+        self.assertEqual(cache.get(limiter.key), 0)
+        self.assertTrue(limiter.acquire())
+        self.assertTrue(limiter.acquire())
+        self.assertFalse(limiter.acquire())
+
+    def test_unlimited_scopes_are_not_counted(self):
+        limiter = ConcurrencyLimiter('other')
+
+        for _ in range(10):
+            self.assertTrue(limiter.acquire())
+
+        self.assertIsNone(cache.get(limiter.key))
+
+
+class SharedCacheCheckTest(SimpleTestCase):
+    locmem = {'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }}
+    redis = {'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+    }}
+
+    def test_warns_when_limits_use_a_process_cache(self):
+        with override_settings(CACHES=self.locmem):
+            warnings = check_shared_cache(None)
+
+        self.assertEqual([warning.id for warning in warnings], ['utils.W001'])
+
+    def test_shared_caches_pass(self):
+        with override_settings(CACHES=self.redis):
+            self.assertEqual(check_shared_cache(None), [])
+
+    @override_settings(
+        THROTTLE_RATES={'anon': None}, LOAD_SHED_LIMITS={'search': 0}
+    )
+    def test_disabled_limits_pass_with_any_cache(self):
+        with override_settings(CACHES=self.locmem):
+            self.assertEqual(check_shared_cache(None), [])
@@ -0,0 +1,297 @@
+import math
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.checks import Warning
+from django.http import HttpResponse
+from rest_framework.throttling import (AnonRateThrottle, BaseThrottle,
+                                       ScopedRateThrottle, SimpleRateThrottle,
+                                       UserRateThrottle)
+
+THROTTLE_PREFIX = 'throttle'
+# Same '<requests>/<period>' rates as DRF: 30/min, 1000/day...
+THROTTLE_PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+# Backends keeping the counters in each process instead of sharing them
+PROCESS_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+class TokenBucket:
+    """
+    Token bucket kept in the shared cache, so every worker draws from the
+    same bucket. ``capacity`` tokens refill evenly over ``duration``
+    seconds.
+
+    Concurrent requests on the same key may both read the old state and
+    let a token or two through; throttling tolerates that.
+    """
+
+    def __init__(self, key, capacity, duration):
+        self.key = f'{THROTTLE_PREFIX}:bucket:{key}'
+        self.capacity = capacity
+        self.duration = duration
+        self.refill_rate = capacity / duration
+
+    def consume(self, tokens=1, now=None):
+        """Returns 0 when allowed, otherwise the seconds left to wait."""
+        now = time.time() if now is None else now
+        state = cache.get(self.key)
+
+        if state is None:
+            available = self.capacity
+        else:
+            available, updated_at = state
+            available = min(
+                self.capacity,
+                available + (now - updated_at) * self.refill_rate
+            )
+
+        if available < tokens:
+            return (tokens - available) / self.refill_rate
+
+        # An idle bucket is full again after ``duration``
+        cache.set(self.key, (available - tokens, now), self.duration)
+        return 0
+
+
+def get_throttle_rate(scope):
+    """``(capacity, duration)`` of ``scope``, None when unthrottled."""
+    rate = settings.THROTTLE_RATES.get(scope)
+
+    if not rate:
+        return None
+
+    num, period = rate.split('/')
+    return int(num), THROTTLE_PERIODS[period[0]]
+
+
+def get_client_ident(request):
+    user = getattr(request, 'user', None)
+
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+
+    return f'ip:{BaseThrottle().get_ident(request)}'
+
+
+def throttle_request(request, scope):
+    """Takes a token from the client's ``scope`` bucket, see TokenBucket."""
+    rate = get_throttle_rate(scope)
+
+    if rate is None:
+        return 0
+
+    bucket = TokenBucket(f'{scope}:{get_client_ident(request)}', *rate)
+    return bucket.consume()
+
+
+def make_retry_response(status, wait):
+    response = HttpResponse(status=status)
+    response['Retry-After'] = str(max(1, math.ceil(wait)))
+    return response
+
+
+class BucketRateThrottle(SimpleRateThrottle):
+    """
+    DRF throttle drawing from a ``TokenBucket``, with the rates of the
+    ``THROTTLE_RATES`` setting.
+    """
+
+    def get_rate(self):
+        return settings.THROTTLE_RATES.get(self.scope)
+
+    def allow_request(self, request, view):
+        if not self.rate:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+
+        if self.key is None:
+            return True
+
+        bucket = TokenBucket(self.key, self.num_requests, self.duration)
+        self.wait_time = bucket.consume()
+        return not self.wait_time
+
+    def wait(self):
+        return self.wait_time
+
+
+class AnonBucketThrottle(AnonRateThrottle, BucketRateThrottle):
+    pass
+
+
+class UserBucketThrottle(UserRateThrottle, BucketRateThrottle):
+    pass
+
+
+class ScopedBucketThrottle(ScopedRateThrottle, BucketRateThrottle):
+    pass
+
+
+class ConcurrencyLimiter:
+    """
+    Counts the requests of ``scope`` in flight across workers. Counters
+    expire after ``LOAD_SHED_TIMEOUT`` seconds without requests, so a
+    killed worker does not hold its slot forever.
+    """
+
+    def __init__(self, scope):
+        self.key = f'{THROTTLE_PREFIX}:in_flight:{scope}'
+        self.limit = settings.LOAD_SHED_LIMITS.get(scope)
+
+    def acquire(self):
+        if not self.limit:
+            return True
+
+        cache.add(self.key, 0, settings.LOAD_SHED_TIMEOUT)
+
+        try:
+            in_flight = cache.incr(self.key)
+        except ValueError:
+            # Expired between add and incr
+            cache.add(self.key, 1, settings.LOAD_SHED_TIMEOUT)
+            in_flight = 1
+
+        # Keep the counter alive while requests keep coming
+        cache.touch(self.key, settings.LOAD_SHED_TIMEOUT)
+
+        if in_flight > self.limit:
+            self.release()
+            return False
+
+        return True
+
+    def release(self):
+        if not self.limit:
+            return
+
+        try:
+            in_flight = cache.decr(self.key)
+        except ValueError:
+            return
+
+        if in_flight < 0:
+            # Released by requests admitted before the counter expired
+            try:
+                cache.incr(self.key, -in_flight)
+            except ValueError:
+                pass
+
+
+def check_shared_cache(app_configs, **kwargs):
+    """Token buckets and in-flight counters need a cache every worker sees."""
+    backend = settings.CACHES['default']['BACKEND']
+    limited = any(settings.THROTTLE_RATES.values()) or any(
+        settings.LOAD_SHED_LIMITS.values()
+    )
+
+    if backend not in PROCESS_CACHE_BACKENDS or not limited:
+        return []
+
+    return [
+        Warning(
+            f'{backend} keeps the throttling and load shedding counters per '
+            'process, each worker applies the limits on its own.',
+            hint='Set CACHE_BACKEND to a shared cache such as Redis.',
+            id='utils.W001',
+        )
+    ]
+
+
+def call_with_concurrency_limit(scope, view, request, *args, **kwargs):
+    limiter = ConcurrencyLimiter(scope)
+
+    if not limiter.acquire():
+        return make_retry_response(503, settings.LOAD_SHED_RETRY_AFTER)
+
+    try:
+        response = view(request, *args, **kwargs)
+
+        # Templates render lazily, keep the slot until the page is built
+        if not getattr(response, 'is_rendered', True):
+            response.render()
+
+        return response
+    finally:
+        limiter.release()
+
+
+async def acall_with_concurrency_limit(scope, view, request, *args, **kwargs):
+    limiter = ConcurrencyLimiter(scope)
+
+    if not await sync_to_async(limiter.acquire)():
+        return make_retry_response(503, settings.LOAD_SHED_RETRY_AFTER)
+
+    try:
+        response = await view(request, *args, **kwargs)
+
+        if not getattr(response, 'is_rendered', True):
+            await sync_to_async(response.render)()
+
+        return response
+    finally:
+        await sync_to_async(limiter.release)()
+
+
+def limit_concurrency(scope):
+    """
+    Answers 503 when ``LOAD_SHED_LIMITS[scope]`` requests of the decorated
+    view are already in flight.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            return call_with_concurrency_limit(
+                scope, view, request, *args, **kwargs
+            )
+        return wrapper
+    return decorator
+
+
+class ThrottleMixin:
+    """Answers 429 once the client used up its ``throttle_scope`` rate."""
+    throttle_scope = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.view_is_async:
+            return self.athrottle_dispatch(request, *args, **kwargs)
+
+        wait = throttle_request(request, self.throttle_scope)
+
+        if wait:
+            return make_retry_response(429, wait)
+
+        return super().dispatch(request, *args, **kwargs)
+
+    async def athrottle_dispatch(self, request, *args, **kwargs):
+        # Reading request.user may load the session
+        wait = await sync_to_async(throttle_request)(
+            request, self.throttle_scope
+        )
+
+        if wait:
+            return make_retry_response(429, wait)
+
+        return await super().dispatch(request, *args, **kwargs)
+
+
+class LoadSheddingMixin:
+    """Class based views version of ``limit_concurrency``."""
+    load_shed_scope = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.view_is_async:
+            return acall_with_concurrency_limit(
+                self.load_shed_scope, super().dispatch,
+                request, *args, **kwargs
+            )
+
+        return call_with_concurrency_limit(
+            self.load_shed_scope, super().dispatch, request, *args, **kwargs
+        )